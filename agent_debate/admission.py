@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from typing import Any, AsyncIterator
+
+from agent_debate.telemetry import (
+    ADMISSION_ACTIVE,
+    ADMISSION_QUEUED,
+    ADMISSION_REJECTED,
+    ADMISSION_WAIT_SECONDS,
+)
+
+DEFAULT_MAX_ACTIVE = 4
+DEFAULT_MAX_QUEUED = 32
+DEFAULT_MAX_QUEUED_PER_CLIENT = 8
+# Assumed debate duration until the first one finishes, for Retry-After.
+DEFAULT_DEBATE_SECONDS = 30.0
+
+
+class AdmissionRejected(Exception):
+    """The queue (global or this client's share) is full; retry after `retry_after`."""
+
+    def __init__(self, reason: str, retry_after: int) -> None:
+        super().__init__(f"Debate queue is full ({reason}); retry in {retry_after}s.")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """One debate's place in the admission queue, then its running slot."""
+
+    def __init__(self, controller: AdmissionController, client: str) -> None:
+        self.client = client
+        self.enqueued_at = time.monotonic()
+        self.admitted_at: float | None = None
+        self.released = False
+        self._controller = controller
+        self._changed = asyncio.Event()
+
+    @property
+    def admitted(self) -> bool:
+        return self.admitted_at is not None
+
+    @property
+    def waited_seconds(self) -> float:
+        end = self.admitted_at if self.admitted_at is not None else time.monotonic()
+        return end - self.enqueued_at
+
+    def position(self) -> int:
+        """1-based place in line; 0 once admitted."""
+        return 0 if self.admitted else self._controller._position(self)
+
+    async def wait(self) -> AsyncIterator[int]:
+        """Yield the queue position each time it changes, until admitted."""
+        last = None
+        while not self.admitted:
+            position = self.position()
+            if position != last:
+                last = position
+                yield position
+            self._changed.clear()
+            await self._changed.wait()
+
+    def release(self, completed: bool = False) -> None:
+        """Give back the slot, or leave the queue if never admitted. Idempotent.
+
+        Only `completed` runs feed the debate duration behind Retry-After.
+        """
+        if not self.released:
+            self.released = True
+            self._controller._release(self, completed)
+
+
+class AdmissionController:
+    """Global cap on running debates with a bounded, per-client fair queue.
+
+    Waiting debates are grouped by client and admitted round-robin across
+    clients, so one client sending a burst cannot starve the others. Both the
+    whole queue and each client's share of it are bounded; past either
+    bound `enqueue` raises `AdmissionRejected` straight away instead of
+    letting the request hang.
+    """
+
+    def __init__(
+        self,
+        max_active: int = DEFAULT_MAX_ACTIVE,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+        max_queued_per_client: int = DEFAULT_MAX_QUEUED_PER_CLIENT,
+    ) -> None:
+        self.max_active = max(1, max_active)
+        self.max_queued = max(0, max_queued)
+        self.max_queued_per_client = max(0, max_queued_per_client)
+        self.active = 0
+        # Client -> waiting tickets; dict order is the round-robin order.
+        self._queues: dict[str, deque[Ticket]] = {}
+        self._avg_debate_seconds = DEFAULT_DEBATE_SECONDS
+        self.admitted = 0
+        self.rejected = 0
+        self.abandoned = 0
+
+    @classmethod
+    def from_env(cls) -> AdmissionController:
+        def number(name: str, default: int) -> int:
+            return int(os.environ.get(name, default))
+
+        return cls(
+            max_active=number("DEBATE_MAX_ACTIVE", DEFAULT_MAX_ACTIVE),
+            max_queued=number("DEBATE_MAX_QUEUED", DEFAULT_MAX_QUEUED),
+            max_queued_per_client=number(
+                "DEBATE_MAX_QUEUED_PER_CLIENT", DEFAULT_MAX_QUEUED_PER_CLIENT
+            ),
+        )
+
+    @property
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def enqueue(self, client: str, *, bounded: bool = True) -> Ticket:
+        """Take a slot or a place in line for `client`.
+
+        `bounded=False` skips the queue limits, for debates that were admitted
+        once already and are only being resumed.
+        """
+        ticket = Ticket(self, client)
+        if self.active < self.max_active and not self._queues:
+            self._admit(ticket)
+            return ticket
+        if bounded:
+            reason = None
+            if self.queued >= self.max_queued:
+                reason = "queue_full"
+            elif len(self._queues.get(client, ())) >= self.max_queued_per_client:
+                reason = "client_queue_full"
+            if reason is not None:
+                self.rejected += 1
+                ADMISSION_REJECTED.inc(reason=reason)
+                raise AdmissionRejected(reason, self.retry_after())
+        self._queues.setdefault(client, deque()).append(ticket)
+        self._update_gauges()
+        return ticket
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue should have drained into running slots."""
+        rounds = math.ceil((self.queued + 1) / self.max_active)
+        return max(1, math.ceil(rounds * self._avg_debate_seconds))
+
+    def _admit(self, ticket: Ticket) -> None:
+        ticket.admitted_at = time.monotonic()
+        self.active += 1
+        self.admitted += 1
+        ADMISSION_WAIT_SECONDS.observe(ticket.waited_seconds)
+        ticket._changed.set()
+
+    def _dispatch(self) -> None:
+        while self.active < self.max_active and self._queues:
+            client = next(iter(self._queues))
+            queue = self._queues.pop(client)
+            ticket = queue.popleft()
+            if queue:
+                # Back of the rotation: every other waiting client goes first.
+                self._queues[client] = queue
+            self._admit(ticket)
+        for queue in self._queues.values():
+            for ticket in queue:
+                ticket._changed.set()
+        self._update_gauges()
+
+    def _release(self, ticket: Ticket, completed: bool) -> None:
+        if ticket.admitted:
+            self.active -= 1
+            if completed:
+                held = time.monotonic() - (ticket.admitted_at or 0.0)
+                self._avg_debate_seconds = 0.8 * self._avg_debate_seconds + 0.2 * held
+        else:
+            queue = self._queues.get(ticket.client)
+            if queue is not None and ticket in queue:
+                queue.remove(ticket)
+                if not queue:
+                    del self._queues[ticket.client]
+            self.abandoned += 1
+        self._dispatch()
+
+    def _position(self, ticket: Ticket) -> int:
+        """Place in line under round-robin admission across clients."""
+        index = self._queues[ticket.client].index(ticket)
+        ahead = index
+        before = True
+        for client, queue in self._queues.items():
+            if client == ticket.client:
+                before = False
+                continue
+            ahead += min(len(queue), index + 1 if before else index)
+        return ahead + 1
+
+    def _update_gauges(self) -> None:
+        ADMISSION_ACTIVE.set(self.active)
+        ADMISSION_QUEUED.set(self.queued)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "max_active": self.max_active,
+            "max_queued": self.max_queued,
+            "max_queued_per_client": self.max_queued_per_client,
+            "active": self.active,
+            "queued": self.queued,
+            "queued_clients": len(self._queues),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "abandoned": self.abandoned,
+            "avg_debate_seconds": round(self._avg_debate_seconds, 3),
+        }
@@ -1,18 +1,78 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
-from concurrent.futures import ThreadPoolExecutor
-from typing import Any, Literal
+import os
+import time
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Literal, TypeVar
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
 from sse_starlette.sse import EventSourceResponse
 
-from agent_debate.llm import GeminiLLM
-from agent_debate.prompts import CON_SYSTEM, JUDGE_SYSTEM, PRO_SYSTEM
-from agent_debate.schemas import DebatePosition, Verdict
+from agent_debate.admission import AdmissionController, AdmissionRejected, Ticket
+from agent_debate.budget import StageBudget, arguments_instruction, get_budget_planner
+from agent_debate.cache import get_cache
+from agent_debate.ensemble import (
+    MAX_JUDGES,
+    EnsembleRun,
+    JudgeOutcome,
+    aggregate_verdicts,
+    judge_specs,
+    majority,
+    run_ensemble,
+)
+from agent_debate.inflight import InFlightRun, SingleFlight
+from agent_debate.llm import (
+    CancellationToken,
+    GeminiLLM,
+    HedgePolicy,
+    cancellation_stats,
+    get_backend,
+)
+from agent_debate.resilience import resilience_snapshot
+from agent_debate.rounds import (
+    MAX_ROUNDS,
+    OPENING_MAX_TOKENS,
+    REBUTTAL_MAX_TOKENS,
+    advance_round,
+    converged,
+    rebuttal_block,
+)
+from agent_debate.prompts import (
+    CON_SYSTEM,
+    JUDGE_SYSTEM,
+    PRO_SYSTEM,
+    JudgeEncoding,
+    JudgeFields,
+    encode_arguments,
+)
+from agent_debate.schemas import Argument, DebatePosition, JudgeAssessment
+from agent_debate.scoring import build_verdict
+from agent_debate.sensitivity import grid_units, run_sensitivity
+from agent_debate.similarity import (
+    SimilarDebate,
+    get_similarity_index,
+    index_debate,
+    seed_block,
+    similar_defaults,
+    similarity_stats,
+)
+from agent_debate.store import FINISHED_STATUSES, get_store, get_store_writer
+from agent_debate.telemetry import (
+    DEBATE_SECONDS,
+    STAGE_SECONDS,
+    CallTelemetry,
+    collect_calls,
+    render_metrics,
+    summarise_calls,
+)
+
+T = TypeVar("T")
 
 app = FastAPI(title="Decision Debate API")
 
@@ -23,7 +83,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-_executor = ThreadPoolExecutor(max_workers=4)
+_inflight = SingleFlight()
+
+def _hedge_policies() -> dict[str, HedgePolicy | None]:
+    """Hedging per stage from DEBATE_HEDGE (off | judge | all)."""
+    mode = os.environ.get("DEBATE_HEDGE", "off").strip().lower()
+    after = float(os.environ.get("DEBATE_HEDGE_AFTER_SECONDS", 10))
+    return {
+        "advocate": HedgePolicy(after_seconds=after) if mode == "all" else None,
+        "judge": HedgePolicy(after_seconds=after) if mode in ("judge", "all") else None,
+    }
+
+
+_hedge = _hedge_policies()
+# Caps concurrently running debates; the rest wait in a per-client fair queue.
+_admission = AdmissionController.from_env()
+# Runs in this process by debate id, so a reconnect can follow a live run.
+_runs_by_id: dict[str, InFlightRun] = {}
+# Work saved by client disconnects: debates stopped and agent stages never finished.
+_cancel_stats = {"debates_cancelled": 0, "stages_skipped": 0}
 
 
 class DebateRequest(BaseModel):
@@ -31,6 +109,30 @@ class DebateRequest(BaseModel):
     context: str = ""
     model: str = "gemini-3-flash-preview"
     language: Literal["en", "ru"] = "en"
+    parallel: bool = True
+    # "bypass" skips cached LLM results for this request (fresh results are still stored).
+    cache: Literal["default", "bypass"] = "default"
+    # Emit an `argument` event as soon as each PRO/CON argument is generated.
+    stream_arguments: bool = True
+    # How PRO/CON arguments are serialised into the judge prompt.
+    judge_encoding: JudgeEncoding = "indented"
+    judge_fields: JudgeFields = "full"
+    # LLM backend; None uses DEBATE_LLM_BACKEND. "fake" needs no Gemini quota.
+    backend: Literal["gemini", "fake"] | None = None
+    # Emit a `timings` event (per-stage durations and per-call telemetry) before `done`.
+    timings: bool = False
+    # Rebuttal rounds after the opening one; each side answers the other's summaries.
+    rounds: int = Field(default=1, ge=1, le=MAX_ROUNDS)
+    rebuttal_max_tokens: int = Field(default=REBUTTAL_MAX_TOKENS, ge=256, le=OPENING_MAX_TOKENS)
+    # Ensemble judging: this many judges run concurrently (cycling through
+    # `judge_models`, default `model`) and are aggregated into one verdict.
+    judges: int = Field(default=1, ge=1, le=MAX_JUDGES)
+    judge_models: list[str] = Field(default_factory=list, max_length=MAX_JUDGES)
+    # Judges agreeing on a decision before the rest are cancelled; default majority.
+    judge_quorum: int | None = Field(default=None, ge=1, le=MAX_JUDGES)
+    # Past debates on similar decisions: "offer" sends them in a `similar` event
+    # before any LLM call, "seed" also gives the advocates the best match's arguments.
+    similar: Literal["off", "offer", "seed"] = "off"
 
 
 def _language_suffix(language: Literal["en", "ru"], *, judge: bool = False) -> str:
@@ -39,7 +141,6 @@ def _language_suffix(language: Literal["en", "ru"], *, judge: bool = False) -> s
             return (
                 "\n\nLanguage requirements:\n"
                 "- Return all natural-language fields in Russian.\n"
-                "- Keep enum values exactly as required by schema (go/no_go/conditional_go, pro/con/tie).\n"
                 "- Keep rubric criterion names exactly as listed in the rubric.\n"
             )
         return (
@@ -51,7 +152,6 @@ def _language_suffix(language: Literal["en", "ru"], *, judge: bool = False) -> s
         return (
             "\n\nLanguage requirements:\n"
             "- Return all natural-language fields in English.\n"
-            "- Keep enum values exactly as required by schema (go/no_go/conditional_go, pro/con/tie).\n"
             "- Keep rubric criterion names exactly as listed in the rubric.\n"
         )
     return (
@@ -79,91 +179,833 @@ def _judge_prompt(
     pro: list,
     con: list,
     language: Literal["en", "ru"],
+    encoding: JudgeEncoding = "indented",
+    fields: JudgeFields = "full",
 ) -> str:
+    pro_text = encode_arguments(pro, "P", encoding, fields)
+    con_text = encode_arguments(con, "C", encoding, fields)
     if language == "ru":
         return (
             f"Решение: {decision}\nКонтекст: {context}\n\n"
-            f"Аргументы ЗА:\n{json.dumps(pro, ensure_ascii=False, indent=2)}\n\n"
-            f"Аргументы ПРОТИВ:\n{json.dumps(con, ensure_ascii=False, indent=2)}"
+            f"Аргументы ЗА:\n{pro_text}\n\n"
+            f"Аргументы ПРОТИВ:\n{con_text}"
         )
 
     return (
         f"Decision: {decision}\nContext: {context}\n\n"
-        f"PRO arguments:\n{json.dumps(pro, ensure_ascii=False, indent=2)}\n\n"
-        f"CON arguments:\n{json.dumps(con, ensure_ascii=False, indent=2)}"
+        f"PRO arguments:\n{pro_text}\n\n"
+        f"CON arguments:\n{con_text}"
+    )
+
+
+def _llm(
+    model: str,
+    bypass_cache: bool,
+    cancel_token: CancellationToken | None,
+    stage: Literal["advocate", "judge"] = "advocate",
+    backend: str | None = None,
+    agent: str = "unknown",
+) -> GeminiLLM:
+    return GeminiLLM(
+        model=model,
+        cache=get_cache(),
+        cache_bypass=bypass_cache,
+        cancel_token=cancel_token,
+        hedge=_hedge[stage],
+        backend=get_backend(backend),
+        stage=agent,
     )
 
 
-def _run_pro(
-    decision: str, context: str, model: str, language: Literal["en", "ru"]
+async def _run_advocate(
+    llm: GeminiLLM,
+    system: str,
+    user: str,
+    on_argument: Callable[[Argument], None] | None,
+    budget: StageBudget,
+    language: Literal["en", "ru"] = "en",
 ) -> list[dict[str, Any]]:
-    llm = GeminiLLM(model=model)
-    result: DebatePosition = llm.generate_structured(
-        system=f"{PRO_SYSTEM}{_language_suffix(language)}",
-        user=_user_prompt(decision, context, language),
-        schema=DebatePosition,
-        max_output_tokens=2200,
+    user += arguments_instruction(budget.arguments, language)
+    max_output_tokens = budget.max_output_tokens
+    if on_argument is None:
+        result: DebatePosition = await llm.agenerate_structured(
+            system=system,
+            user=user,
+            schema=DebatePosition,
+            max_output_tokens=max_output_tokens,
+        )
+    else:
+        result = await llm.agenerate_streaming(
+            system=system,
+            user=user,
+            schema=DebatePosition,
+            item_schema=Argument,
+            on_item=on_argument,
+            max_output_tokens=max_output_tokens,
+        )
+    get_budget_planner().observe(
+        "argument", language, llm.last_call, len(result.arguments)
     )
     return [a.model_dump() for a in result.arguments]
 
 
-def _run_con(
-    decision: str, context: str, model: str, language: Literal["en", "ru"]
+async def _run_pro(
+    decision: str,
+    context: str,
+    model: str,
+    language: Literal["en", "ru"],
+    bypass_cache: bool = False,
+    on_argument: Callable[[Argument], None] | None = None,
+    cancel_token: CancellationToken | None = None,
+    backend: str | None = None,
+    summaries: dict[str, list[str]] | None = None,
+    round_number: int = 1,
+    budget: StageBudget | None = None,
+    seed: str = "",
+) -> list[dict[str, Any]]:
+    user = _user_prompt(decision, context, language) + seed
+    if summaries:
+        user += rebuttal_block("pro", summaries, round_number, language)
+    return await _run_advocate(
+        _llm(model, bypass_cache, cancel_token, backend=backend, agent="pro"),
+        system=f"{PRO_SYSTEM}{_language_suffix(language)}",
+        user=user,
+        on_argument=on_argument,
+        budget=budget or get_budget_planner().advocate(decision, context, language),
+        language=language,
+    )
+
+
+async def _run_con(
+    decision: str,
+    context: str,
+    model: str,
+    language: Literal["en", "ru"],
+    bypass_cache: bool = False,
+    on_argument: Callable[[Argument], None] | None = None,
+    cancel_token: CancellationToken | None = None,
+    backend: str | None = None,
+    summaries: dict[str, list[str]] | None = None,
+    round_number: int = 1,
+    budget: StageBudget | None = None,
+    seed: str = "",
 ) -> list[dict[str, Any]]:
-    llm = GeminiLLM(model=model)
-    result: DebatePosition = llm.generate_structured(
+    user = _user_prompt(decision, context, language) + seed
+    if summaries:
+        user += rebuttal_block("con", summaries, round_number, language)
+    return await _run_advocate(
+        _llm(model, bypass_cache, cancel_token, backend=backend, agent="con"),
         system=f"{CON_SYSTEM}{_language_suffix(language)}",
-        user=_user_prompt(decision, context, language),
-        schema=DebatePosition,
-        max_output_tokens=2200,
+        user=user,
+        on_argument=on_argument,
+        budget=budget or get_budget_planner().advocate(decision, context, language),
+        language=language,
     )
-    return [a.model_dump() for a in result.arguments]
 
 
-def _run_judge(
+async def _run_judge(
     decision: str,
     context: str,
     model: str,
     pro: list,
     con: list,
     language: Literal["en", "ru"],
+    bypass_cache: bool = False,
+    cancel_token: CancellationToken | None = None,
+    encoding: JudgeEncoding = "indented",
+    fields: JudgeFields = "full",
+    backend: str | None = None,
+    budget: StageBudget | None = None,
+    temperature: float = 0.2,
 ) -> dict[str, Any]:
-    llm = GeminiLLM(model=model)
-    result: Verdict = llm.generate_structured(
+    llm = _llm(
+        model, bypass_cache, cancel_token, stage="judge", backend=backend, agent="judge"
+    )
+    planner = get_budget_planner()
+    result: JudgeAssessment = await llm.agenerate_structured(
         system=f"{JUDGE_SYSTEM}{_language_suffix(language, judge=True)}",
-        user=_judge_prompt(decision, context, pro, con, language),
-        schema=Verdict,
-        max_output_tokens=2800,
+        user=_judge_prompt(decision, context, pro, con, language, encoding, fields),
+        schema=JudgeAssessment,
+        temperature=temperature,
+        max_output_tokens=(budget or planner.judge(language)).max_output_tokens,
     )
-    return result.model_dump()
+    planner.observe("judge", language, llm.last_call)
+    return build_verdict(result).model_dump()
 
 
-@app.post("/debate/stream")
-async def stream_debate(req: DebateRequest) -> EventSourceResponse:
-    async def generate():
-        loop = asyncio.get_event_loop()
-        d, c, m, lang = req.decision, req.context, req.model, req.language
+async def _run_judges(
+    req: DebateRequest,
+    pro: list,
+    con: list,
+    cancel_token: CancellationToken | None,
+    budget: StageBudget,
+    on_judge: Callable[[JudgeOutcome, EnsembleRun], None] | None = None,
+) -> dict[str, Any]:
+    """Ensemble verdict: `req.judges` concurrent judges, stopped early at quorum."""
+    specs = judge_specs(req.judges, req.model, req.judge_models)
+    run = await run_ensemble(
+        specs,
+        lambda spec: _run_judge(
+            req.decision,
+            req.context,
+            spec.model,
+            pro,
+            con,
+            req.language,
+            req.cache == "bypass",
+            cancel_token,
+            encoding=req.judge_encoding,
+            fields=req.judge_fields,
+            backend=req.backend,
+            budget=budget,
+            temperature=spec.temperature,
+        ),
+        req.judge_quorum or majority(req.judges),
+        on_judge,
+    )
+    return aggregate_verdicts(run).model_dump()
 
+
+async def _timed(
+    stage: str,
+    work: Awaitable[T],
+    stages: dict[str, float],
+    calls: dict[str, list[CallTelemetry]],
+) -> T:
+    """Await one stage, recording its duration and the LLM calls it made."""
+    started = time.perf_counter()
+    with collect_calls(calls.setdefault(stage, [])):
         try:
-            yield {"event": "progress", "data": json.dumps({"agent": "pro", "status": "thinking"})}
-            pro_args = await loop.run_in_executor(_executor, _run_pro, d, c, m, lang)
-            yield {"event": "result", "data": json.dumps({"agent": "pro", "data": pro_args})}
+            return await work
+        finally:
+            elapsed = time.perf_counter() - started
+            stages[stage] = round(elapsed, 4)
+            STAGE_SECONDS.observe(elapsed, stage=stage)
+
+
+def _budget_report(
+    budgets: dict[str, StageBudget],
+    calls: dict[str, list[CallTelemetry]],
+    results: dict[str, Any],
+) -> dict[str, dict[str, Any]]:
+    """Planned budget against actual output per stage, for the `timings` event."""
+    report: dict[str, dict[str, Any]] = {}
+    for stage, budget in budgets.items():
+        stage_calls = calls.get(stage, [])
+        output_tokens = sum(call.output_tokens for call in stage_calls)
+        # Ensemble judges share one budget each: report the mean per finished call.
+        finished = max(1, sum(1 for call in stage_calls if call.output_tokens))
+        entry: dict[str, Any] = {
+            **budget.as_dict(),
+            "output_tokens": output_tokens,
+            "used": round(output_tokens / (budget.max_output_tokens * finished), 3),
+            "truncations": sum(call.truncations for call in stage_calls),
+        }
+        result = results.get(stage.partition(".")[0])
+        if budget.arguments is not None and isinstance(result, list):
+            entry["arguments_returned"] = len(result)
+        report[stage] = entry
+    return report
+
+
+def _event(event: str, payload: dict[str, Any]) -> dict[str, str]:
+    return {"event": event, "data": json.dumps(payload)}
+
+
+async def _stage_events(
+    stages: dict[str, Awaitable[Any]],
+    events: asyncio.Queue[dict[str, str]],
+    results: dict[str, Any],
+) -> AsyncIterator[dict[str, str]]:
+    """Run stages concurrently, yielding queued events and each `result` as it lands."""
+    tasks = {asyncio.ensure_future(coro): agent for agent, coro in stages.items()}
+    pending = set(tasks)
+    getter = asyncio.ensure_future(events.get())
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending | {getter}, return_when=asyncio.FIRST_COMPLETED
+            )
+            pending.discard(getter)
+            if getter in done:
+                done.discard(getter)
+                yield getter.result()
+                getter = asyncio.ensure_future(events.get())
+            # Flush intermediate events emitted before a stage finished.
+            while done and not events.empty():
+                yield events.get_nowait()
+            for task in done:
+                agent = tasks[task]
+                results[agent] = task.result()
+                yield _event("result", {"agent": agent, "data": results[agent]})
+    finally:
+        getter.cancel()
+        for task in pending:
+            task.cancel()
+        for task in tasks:
+            # Mark sibling failures as retrieved; the first error is already raised.
+            if task.done() and not task.cancelled():
+                task.exception()
+
+
+async def _debate_events(
+    req: DebateRequest,
+    cancel_token: CancellationToken | None = None,
+    debate_id: str | None = None,
+    prior: dict[str, Any] | None = None,
+) -> AsyncIterator[dict[str, str]]:
+    """Run a debate as SSE events; stages already in `prior` are not re-run."""
+    d, c, m, lang = req.decision, req.context, req.model, req.language
+    bypass, b = req.cache == "bypass", req.backend
+    events: asyncio.Queue[dict[str, str]] = asyncio.Queue()
+    results: dict[str, Any] = dict(prior or {})
+    started = time.perf_counter()
+    stage_seconds: dict[str, float] = {}
+    calls: dict[str, list[CallTelemetry]] = {}
+    planner = get_budget_planner()
+    budgets: dict[str, StageBudget] = {}
+    # Stage names this run still means to finish, for the cancellation stats;
+    # ensemble judges count one each, as `judge.<index>`.
+    planned: set[str] = set()
+    finished: set[str] = set()
+
+    async def timed(stage: str, work: Awaitable[T]) -> T:
+        result = await _timed(stage, work, stage_seconds, calls)
+        finished.add(stage)
+        return result
+
+    def on_argument(agent: str, number: int) -> Callable[[Argument], None] | None:
+        if not req.stream_arguments:
+            return None
+        extra = {"round": number} if number > 1 else {}
+        return lambda arg: events.put_nowait(
+            _event("argument", {"agent": agent, "data": arg.model_dump(), **extra})
+        )
+
+    seed: tuple[SimilarDebate, dict[str, Any]] | None = None
+
+    def advocate(
+        agent: str, number: int = 1, summaries: dict[str, list[str]] | None = None
+    ) -> Awaitable[list[dict[str, Any]]]:
+        run = _run_pro if agent == "pro" else _run_con
+        stage = agent if number == 1 else f"{agent}.round{number}"
+        cap = None if number == 1 else req.rebuttal_max_tokens
+        budgets[stage] = planner.advocate(d, c, lang, cap=cap)
+        return timed(
+            stage,
+            run(
+                d,
+                c,
+                m,
+                lang,
+                bypass,
+                on_argument(agent, number),
+                cancel_token,
+                b,
+                summaries=summaries,
+                round_number=number,
+                budget=budgets[stage],
+                seed=seed_block(agent, *seed, lang) if seed and number == 1 else "",
+            ),
+        )
+
+    async def argue(
+        agents: list[str], number: int = 1, summaries: dict[str, list[str]] | None = None
+    ) -> AsyncIterator[dict[str, str]]:
+        extra = {"round": number} if number > 1 else {}
+        if req.parallel:
+            # PRO and CON are independent: fan out, emit each side as it lands.
+            for agent in agents:
+                yield _event("progress", {"agent": agent, "status": "thinking", **extra})
+            if agents:
+                stages = {agent: advocate(agent, number, summaries) for agent in agents}
+                async for event in _stage_events(stages, events, results):
+                    yield event
+        else:
+            for agent in agents:
+                yield _event("progress", {"agent": agent, "status": "thinking", **extra})
+                async for event in _stage_events(
+                    {agent: advocate(agent, number, summaries)}, events, results
+                ):
+                    yield event
+
+    missing = [agent for agent in ("pro", "con") if agent not in results]
+    rebuttals = req.rounds > 1 and bool(missing) and "judge" not in results
+    planned.update(missing)
+    if rebuttals:
+        planned.update(
+            f"{agent}.round{number}"
+            for number in range(2, req.rounds + 1)
+            for agent in ("pro", "con")
+        )
+    if "judge" not in results:
+        planned.update([f"judge.{i}" for i in range(req.judges)] if req.judges > 1 else ["judge"])
+    try:
+        if req.similar != "off" and missing:
+            matches = await _similar_matches(req, debate_id)
+            if matches:
+                yield _event("similar", {"matches": [match.as_dict() for match in matches]})
+                if req.similar == "seed":
+                    record = await _stored(matches[0].debate_id)
+                    if record is not None:
+                        seed = (matches[0], record["stages"])
 
-            yield {"event": "progress", "data": json.dumps({"agent": "con", "status": "thinking"})}
-            con_args = await loop.run_in_executor(_executor, _run_con, d, c, m, lang)
-            yield {"event": "result", "data": json.dumps({"agent": "con", "data": con_args})}
+        async for event in argue(missing):
+            yield event
 
-            yield {"event": "progress", "data": json.dumps({"agent": "judge", "status": "thinking"})}
-            verdict = await loop.run_in_executor(
-                _executor, _run_judge, d, c, m, pro_args, con_args, lang
+        # Rebuttal rounds follow a fresh opening round; a resumed debate is
+        # judged on its latest saved arguments.
+        if rebuttals:
+            entry = advance_round(results["pro"], results["con"], None, 1)
+            for number in range(2, req.rounds + 1):
+                summaries = entry["summaries"]
+                async for event in argue(["pro", "con"], number, summaries):
+                    yield event
+                entry = advance_round(results["pro"], results["con"], summaries, number)
+                stop = converged(entry)
+                yield _event("round", {**entry, "converged": stop})
+                if stop:
+                    planned.difference_update(
+                        f"{agent}.round{later}"
+                        for later in range(number + 1, req.rounds + 1)
+                        for agent in ("pro", "con")
+                    )
+                    break
+
+        if "judge" not in results:
+            yield _event("progress", {"agent": "judge", "status": "thinking"})
+            budgets["judge"] = planner.judge(lang)
+            if req.judges > 1:
+                # Each judge is reported as it finishes; `result` carries the aggregate.
+                def on_judge(outcome: JudgeOutcome, run: EnsembleRun) -> None:
+                    finished.add(f"judge.{outcome.index}")
+                    verdict = outcome.verdict
+                    events.put_nowait(
+                        _event(
+                            "judge",
+                            {
+                                "index": outcome.index,
+                                **outcome.spec.as_dict(),
+                                "decision": verdict["decision"],
+                                "winner": verdict["winner"],
+                                "confidence": verdict["confidence"],
+                                "pro_total": verdict["pro_total"],
+                                "con_total": verdict["con_total"],
+                                "completed": len(run.outcomes),
+                                "judges": run.judges,
+                                "quorum_decision": run.quorum_decision,
+                            },
+                        )
+                    )
+
+                judging = _run_judges(
+                    req, results["pro"], results["con"], cancel_token, budgets["judge"], on_judge
+                )
+            else:
+                judging = _run_judge(
+                    d,
+                    c,
+                    m,
+                    results["pro"],
+                    results["con"],
+                    lang,
+                    bypass,
+                    cancel_token,
+                    encoding=req.judge_encoding,
+                    fields=req.judge_fields,
+                    backend=b,
+                    budget=budgets["judge"],
+                )
+            async for event in _stage_events(
+                {"judge": timed("judge", judging)}, events, results
+            ):
+                yield event
+            # Judges cancelled on quorum were not skipped: the verdict is in.
+            planned.clear()
+        total = time.perf_counter() - started
+        DEBATE_SECONDS.observe(total, outcome="ok")
+        if req.timings:
+            all_calls = [call for stage_calls in calls.values() for call in stage_calls]
+            yield _event(
+                "timings",
+                {
+                    "total_seconds": round(total, 4),
+                    "stages": stage_seconds,
+                    "totals": summarise_calls(all_calls),
+                    "budgets": _budget_report(budgets, calls, results),
+                    "calls": [call.as_dict() for call in all_calls],
+                },
+            )
+        yield _event("done", {"debate_id": debate_id})
+    except asyncio.CancelledError:
+        _cancel_stats["debates_cancelled"] += 1
+        _cancel_stats["stages_skipped"] += len(planned - finished)
+        DEBATE_SECONDS.observe(time.perf_counter() - started, outcome="cancelled")
+        raise
+    except Exception as exc:
+        DEBATE_SECONDS.observe(time.perf_counter() - started, outcome="error")
+        yield _event("error", {"message": str(exc)})
+
+
+async def _similar_matches(
+    req: DebateRequest, debate_id: str | None, k: int = 3
+) -> list[SimilarDebate]:
+    """Recent finished debates close enough to `req` to offer or seed from."""
+    # The first call loads the index from the store; keep that off the event loop.
+    index = await asyncio.to_thread(get_similarity_index)
+    min_score, max_age_days = similar_defaults()
+    return index.search(
+        req.decision,
+        req.context,
+        k=k,
+        language=req.language,
+        min_score=min_score,
+        max_age_days=max_age_days,
+        exclude=debate_id,
+    )
+
+
+async def _recorded_events(
+    req: DebateRequest,
+    debate_id: str,
+    cancel_token: CancellationToken,
+    prior: dict[str, Any] | None = None,
+    last_seq: int = 0,
+) -> AsyncIterator[dict[str, str]]:
+    """`_debate_events` with SSE ids, persisted event by event.
+
+    Writes go through the store writer thread; the terminal event waits for
+    them to commit, so a client that sees `done` can read the full record.
+    """
+    writer = get_store_writer()
+    if prior is None:
+        writer.submit("create", debate_id, req.model_dump())
+    else:
+        writer.submit("set_status", debate_id, "running")
+    seq = last_seq
+    status = "interrupted"
+    verdict = (prior or {}).get("judge")
+    try:
+        async for event in _debate_events(req, cancel_token, debate_id, prior):
+            seq += 1
+            event = {"id": f"{debate_id}:{seq}", **event}
+            writer.submit("append_event", debate_id, seq, event["event"], event["data"])
+            if event["event"] == "result":
+                payload = json.loads(event["data"])
+                writer.submit("save_stage", debate_id, payload["agent"], payload["data"])
+                if payload["agent"] == "judge":
+                    verdict = payload["data"]
+            elif event["event"] in ("done", "error"):
+                status = event["event"]
+                writer.submit("set_status", debate_id, status)
+                if status == "done":
+                    writer.call(
+                        index_debate,
+                        debate_id,
+                        req.decision,
+                        req.context,
+                        req.language,
+                        verdict.get("decision") if verdict else None,
+                    )
+                await writer.flush()
+            yield event
+    finally:
+        if status == "interrupted":
+            writer.submit("set_status", debate_id, status)
+
+
+async def _admitted_events(
+    ticket: Ticket, source: AsyncIterator[dict[str, str]]
+) -> AsyncIterator[dict[str, str]]:
+    """Hold `source` until `ticket` gets a slot, reporting the queue position meanwhile.
+
+    Queue events carry no SSE id: they are not stored and not replayed.
+    """
+    completed = False
+    try:
+        if not ticket.admitted:
+            async for position in ticket.wait():
+                yield _event(
+                    "progress",
+                    {"agent": "queue", "status": "queued", "position": position},
+                )
+            yield _event(
+                "progress",
+                {
+                    "agent": "queue",
+                    "status": "admitted",
+                    "waited_seconds": round(ticket.waited_seconds, 3),
+                },
+            )
+        async for event in source:
+            completed = completed or event["event"] == "done"
+            yield event
+    finally:
+        ticket.release(completed=completed)
+
+
+def _client_id(request: Request, api_key: str | None) -> str:
+    """Fair-queueing identity: the API key if sent (hashed), else the client address."""
+    if api_key:
+        return "key:" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+    return "ip:" + (request.client.host if request.client else "unknown")
+
+
+def _admit(client: str, *, bounded: bool = True) -> Ticket:
+    try:
+        return _admission.enqueue(client, bounded=bounded)
+    except AdmissionRejected as exc:
+        raise HTTPException(
+            status_code=429,
+            detail=str(exc),
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
+
+
+def _request_key(req: DebateRequest) -> str:
+    raw = req.model_dump_json()
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _parse_event_id(value: str | None) -> tuple[str, int] | None:
+    if not value or ":" not in value:
+        return None
+    debate_id, _, seq = value.rpartition(":")
+    return (debate_id, int(seq)) if seq.isdigit() else None
+
+
+def _join(
+    key: str,
+    debate_id: str,
+    source: Callable[[CancellationToken], AsyncIterator[dict[str, str]]],
+    admit: Callable[[], Ticket],
+) -> InFlightRun:
+    """Join or start the single-flight run for `key`, indexed by its debate id.
+
+    A new run holds the ticket from `admit()` until its task ends, even if it
+    is cancelled before the event generator ever starts.
+    """
+    cancel_token = CancellationToken()
+    tickets: list[Ticket] = []
+
+    def start() -> AsyncIterator[dict[str, str]]:
+        tickets.append(admit())
+        return _admitted_events(tickets[0], source(cancel_token))
+
+    run = _inflight.join(key, start, on_cancel=cancel_token.cancel)
+    if tickets:
+        run.task.add_done_callback(lambda _: tickets[0].release())
+    if run not in _runs_by_id.values():
+        _runs_by_id[debate_id] = run
+        run.task.add_done_callback(lambda _: _runs_by_id.pop(debate_id, None))
+    return run
+
+
+async def _stored(debate_id: str) -> dict[str, Any] | None:
+    """`DebateStore.get` on a worker thread: SQLite reads block too."""
+    return await asyncio.to_thread(lambda: get_store().get(debate_id))
+
+
+async def _resumed_events(
+    debate_id: str, after_seq: int, record: dict[str, Any], client: str
+) -> AsyncIterator[dict[str, str]]:
+    """Replay stored events after `after_seq`, then follow or restart the run."""
+    seen = after_seq
+    run = _runs_by_id.get(debate_id)
+    if run is None or run.done or run.cancelled:
+        if run is not None:
+            # Let a cancelled run queue its last writes before reading them back.
+            await asyncio.wait({run.task})
+            await get_store_writer().flush()
+            record = await _stored(debate_id) or record
+        stored = await asyncio.to_thread(lambda: get_store().events(debate_id, after_seq))
+        for event in stored:
+            seen = int(event["id"].rpartition(":")[2])
+            yield event
+        if record["status"] in FINISHED_STATUSES:
+            return
+        # Interrupted before `done`: run only the stages without a saved result.
+        # It was admitted once already, so it waits for a slot but is never rejected.
+        req = DebateRequest.model_validate(record["request"])
+        run = _join(
+            f"debate:{debate_id}",
+            debate_id,
+            lambda token: _recorded_events(
+                req, debate_id, token, prior=record["stages"], last_seq=seen
+            ),
+            lambda: _admit(client, bounded=False),
+        )
+    async for event in run.subscribe():
+        if "id" not in event:
+            yield event
+            continue
+        seq = int(event["id"].rpartition(":")[2])
+        if seq > seen:
+            seen = seq
+            yield event
+
+
+@app.post("/debate/stream")
+async def stream_debate(
+    req: DebateRequest,
+    request: Request,
+    last_event_id: str | None = Header(default=None, alias="Last-Event-ID"),
+    api_key: str | None = Header(default=None, alias="X-API-Key"),
+) -> EventSourceResponse:
+    client = _client_id(request, api_key)
+    # A reconnect with Last-Event-ID picks up the same debate where it left off.
+    resume = _parse_event_id(last_event_id)
+    if resume is not None:
+        await get_store_writer().flush()
+        record = await _stored(resume[0])
+        if record is not None:
+            return EventSourceResponse(
+                _resumed_events(resume[0], resume[1], record, client)
             )
-            yield {"event": "result", "data": json.dumps({"agent": "judge", "data": verdict})}
 
-            yield {"event": "done", "data": "{}"}
-        except Exception as exc:
-            yield {"event": "error", "data": json.dumps({"message": str(exc)})}
+    # Identical requests arriving while a debate is running share its events
+    # and take no extra slot. EventSourceResponse closes the subscription when
+    # the client disconnects; once the last subscriber is gone the run and its
+    # LLM calls are cancelled (or it leaves the queue).
+    key = _request_key(req)
+    ticket = _admit(client) if _inflight.get(key) is None else None
+    debate_id = uuid.uuid4().hex
+    run = _join(
+        key,
+        debate_id,
+        lambda token: _recorded_events(req, debate_id, token),
+        lambda: ticket or _admit(client, bounded=False),
+    )
+    return EventSourceResponse(run.subscribe())
+
+
+@app.get("/debate/{debate_id}/stream")
+async def resume_debate_stream(
+    debate_id: str,
+    request: Request,
+    last_event_id: str | None = Header(default=None, alias="Last-Event-ID"),
+    api_key: str | None = Header(default=None, alias="X-API-Key"),
+) -> EventSourceResponse:
+    """Reconnect to a debate by id (native EventSource sends Last-Event-ID itself)."""
+    await get_store_writer().flush()
+    record = await _stored(debate_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Unknown debate id.")
+    resume = _parse_event_id(last_event_id)
+    after = resume[1] if resume is not None and resume[0] == debate_id else 0
+    return EventSourceResponse(
+        _resumed_events(debate_id, after, record, _client_id(request, api_key))
+    )
+
+
+@app.get("/debate/{debate_id}/sensitivity")
+async def debate_sensitivity(
+    debate_id: str,
+    samples: int = Query(5000, ge=1, le=200_000),
+    concentration: float = Query(50.0, gt=0),
+    grid_step: float = Query(0.1, ge=0.05, le=0.5),
+    seed: int | None = 0,
+) -> dict[str, Any]:
+    """Sweep rubric weights over a finished debate's scorecard (no LLM calls)."""
+    try:
+        grid_units(grid_step)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    record = await _stored(debate_id)
+    verdict = record["stages"].get("judge") if record is not None else None
+    if verdict is None:
+        raise HTTPException(status_code=404, detail="Unknown debate id.")
+    # The grid sweep is NumPy work of up to a few hundred ms: keep it off the loop.
+    return await asyncio.to_thread(
+        run_sensitivity,
+        verdict,
+        samples=samples,
+        concentration=concentration,
+        grid_step=grid_step,
+        seed=seed,
+    )
+
+
+@app.get("/debate/stats")
+async def debate_stats() -> dict[str, Any]:
+    store = await asyncio.to_thread(lambda: get_store().stats())
+    return {
+        "in_flight": _inflight.stats(),
+        "admission": _admission.snapshot(),
+        "store": {**store, "writer": get_store_writer().snapshot()},
+        "similarity": similarity_stats(),
+        "cancellation": {**_cancel_stats, **cancellation_stats},
+        "hedging": {
+            stage: policy.snapshot() if policy is not None else None
+            for stage, policy in _hedge.items()
+        },
+    }
+
+
+@app.get("/debate/similar")
+async def similar_debates(
+    q: str = Query(..., min_length=1, description="Decision text to match."),
+    context: str = "",
+    k: int = Query(5, ge=1, le=50),
+    language: Literal["en", "ru"] | None = None,
+    min_score: float = Query(0.0, ge=0.0, le=1.0),
+    max_age_days: float | None = Query(None, gt=0),
+) -> dict[str, Any]:
+    """Top-k finished debates by TF-IDF similarity of decision and context; no LLM work."""
+    index = await asyncio.to_thread(get_similarity_index)
+    started = time.perf_counter()
+    matches = index.search(
+        q,
+        context,
+        k=k,
+        language=language,
+        min_score=min_score,
+        max_age_days=max_age_days,
+    )
+    return {
+        "matches": [match.as_dict() for match in matches],
+        "indexed": len(index),
+        "elapsed_ms": round(1000 * (time.perf_counter() - started), 3),
+    }
+
+
+@app.get("/debate/{debate_id}")
+async def get_debate(debate_id: str) -> dict[str, Any]:
+    """A stored debate with whatever stages it finished; no LLM work."""
+    record = await _stored(debate_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Unknown debate id.")
+    stages = record["stages"]
+    return {
+        "debate_id": record["id"],
+        "status": record["status"],
+        "request": record["request"],
+        "pro_arguments": stages.get("pro"),
+        "con_arguments": stages.get("con"),
+        "verdict": stages.get("judge"),
+        "created_at": record["created_at"],
+        "updated_at": record["updated_at"],
+    }
+
+
+@app.get("/llm/stats")
+async def llm_stats() -> dict[str, Any]:
+    """Per-model rate limiter and circuit breaker state."""
+    return resilience_snapshot()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Prometheus text exposition of LLM call and debate stage metrics."""
+    return PlainTextResponse(
+        render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
 
-    return EventSourceResponse(generate())
+@app.get("/cache/stats")
+async def cache_stats() -> dict[str, Any]:
+    cache = get_cache()
+    return cache.stats() if cache is not None else {"backend": "off"}
 
 
 def start() -> None:
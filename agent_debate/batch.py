@@ -0,0 +1,451 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Type
+
+from pydantic import BaseModel
+
+from agent_debate.batch_jobs import (
+    BatchBackend,
+    BatchRequest,
+    BatchResult,
+    get_batch_backend,
+    wait_for_jobs,
+)
+from agent_debate.budget import arguments_instruction, get_budget_planner
+from agent_debate.graph import build_graph, debate_payload, initial_state
+from agent_debate.prompts import CON_SYSTEM, JUDGE_SYSTEM, PRO_SYSTEM, judge_prompt, user_prompt
+from agent_debate.schemas import DebatePosition, JudgeAssessment
+from agent_debate.scoring import build_verdict
+
+
+@dataclass
+class BatchItem:
+    id: str
+    decision: str
+    context: str = ""
+    model: str | None = None
+
+
+@dataclass
+class BatchSummary:
+    total: int = 0
+    skipped: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        ran = self.succeeded + self.failed
+        latencies = sorted(self.latencies)
+        return {
+            "total": self.total,
+            "skipped": self.skipped,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "debates_per_minute": (
+                round(ran / self.elapsed_seconds * 60, 2) if self.elapsed_seconds else 0.0
+            ),
+            "latency_p50": round(statistics.median(latencies), 3) if latencies else None,
+            "latency_p95": (
+                round(latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))], 3)
+                if latencies
+                else None
+            ),
+            "latency_max": round(latencies[-1], 3) if latencies else None,
+        }
+
+
+def _item_id(decision: str, context: str) -> str:
+    digest = hashlib.sha256(f"{decision}\x00{context}".encode()).hexdigest()
+    return digest[:12]
+
+
+def _to_item(record: dict[str, Any], line: int) -> BatchItem:
+    decision = str(record.get("decision") or "").strip()
+    if not decision:
+        raise ValueError(f"record {line}: missing 'decision'")
+    context = str(record.get("context") or "")
+    return BatchItem(
+        id=str(record.get("id") or _item_id(decision, context)),
+        decision=decision,
+        context=context,
+        model=record.get("model") or None,
+    )
+
+
+def read_items(path: Path) -> list[BatchItem]:
+    """Decisions from a JSONL or CSV file (columns: id?, decision, context?, model?).
+
+    Records without an id get a stable one derived from decision + context, so
+    a restart matches them against the same output lines.
+    """
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="", encoding="utf-8") as handle:
+            records = list(csv.DictReader(handle))
+    else:
+        records = [
+            json.loads(line)
+            for line in path.read_text(encoding="utf-8").splitlines()
+            if line.strip()
+        ]
+    items = [_to_item(record, i) for i, record in enumerate(records, 1)]
+    seen: set[str] = set()
+    for item in items:
+        if item.id in seen:
+            raise ValueError(f"duplicate id {item.id!r} in {path}")
+        seen.add(item.id)
+    return items
+
+
+def completed_ids(path: Path) -> set[str]:
+    """Ids that already have a successful result in `path`; failures are retried."""
+    if not path.exists():
+        return set()
+    done: set[str] = set()
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            # A partially written last line from an interrupted run.
+            continue
+        if record.get("id") and not record.get("error"):
+            done.add(str(record["id"]))
+    return done
+
+
+def run_batch(
+    items: list[BatchItem],
+    output: Path,
+    *,
+    model: str,
+    concurrency: int = 4,
+    parallel: bool = True,
+    cache: str = "default",
+    judge_encoding: str = "indented",
+    judge_fields: str = "full",
+    on_result: Callable[[dict[str, Any]], None] | None = None,
+) -> BatchSummary:
+    """Run debates for `items` with at most `concurrency` in flight.
+
+    Each result is appended to `output` as one JSON line (the `--save-json`
+    payload plus `id` and `elapsed_seconds`) as soon as it completes; ids
+    already completed in `output` are skipped.
+    """
+    summary = BatchSummary(total=len(items))
+    done = completed_ids(output)
+    pending = [item for item in items if item.id not in done]
+    summary.skipped = len(items) - len(pending)
+
+    graph = build_graph(parallel=parallel)
+
+    def run_one(item: BatchItem) -> dict[str, Any]:
+        started = time.perf_counter()
+        item_model = item.model or model
+        try:
+            result = graph.invoke(
+                initial_state(
+                    item.decision,
+                    item.context,
+                    item_model,
+                    cache=cache,
+                    judge_encoding=judge_encoding,
+                    judge_fields=judge_fields,
+                )
+            )
+            record = {"id": item.id, **debate_payload(result)}
+        except Exception as exc:
+            record = {
+                "id": item.id,
+                "decision": item.decision,
+                "context": item.context,
+                "model": item_model,
+                "error": f"{type(exc).__name__}: {exc}",
+            }
+        record["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+        return record
+
+    started = time.perf_counter()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("a", encoding="utf-8") as sink, ThreadPoolExecutor(
+        max_workers=max(1, concurrency)
+    ) as pool:
+        if sink.tell() and not output.read_bytes().endswith(b"\n"):
+            # Terminate a line cut off by an interrupted run before appending.
+            sink.write("\n")
+        futures = [pool.submit(run_one, item) for item in pending]
+        for future in as_completed(futures):
+            record = future.result()
+            sink.write(json.dumps(record, ensure_ascii=False) + "\n")
+            sink.flush()
+            if record.get("error"):
+                summary.failed += 1
+            else:
+                summary.succeeded += 1
+                summary.latencies.append(record["elapsed_seconds"])
+            if on_result is not None:
+                on_result(record)
+    summary.elapsed_seconds = time.perf_counter() - started
+    return summary
+
+
+class _Checkpoint:
+    """Job names and fetched results of an offline run, kept next to its output.
+
+    Saved after every submit and every finished stage, so a rerun of an
+    interrupted `run_offline_batch` waits on the jobs it already submitted
+    and keeps stage-1 positions instead of paying for them again. Removed
+    once every item has a successful record; after failures it keeps only
+    the failed items' results.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        data = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+        # Unfinished job name -> request keys it answers.
+        self.jobs: dict[str, list[str]] = data.get("jobs", {})
+        # Request key -> response text, for successful results only.
+        self.results: dict[str, str] = data.get("results", {})
+
+    @classmethod
+    def beside(cls, output: Path) -> "_Checkpoint":
+        return cls(output.with_name(output.name + ".batch.json"))
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.path.with_name(self.path.name + ".tmp")
+        partial.write_text(
+            json.dumps({"jobs": self.jobs, "results": self.results}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        partial.replace(self.path)
+
+    def discard(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+def _parsed(
+    results: dict[str, BatchResult], key: str, schema: Type[BaseModel], checkpoint: _Checkpoint
+) -> Any:
+    """`key`'s validated response; an invalid one is dropped from `checkpoint` for the rerun."""
+    try:
+        return results[key].parse(schema)
+    except Exception:
+        checkpoint.results.pop(key, None)
+        raise
+
+
+def _run_stage(
+    backend: BatchBackend,
+    requests: list[BatchRequest],
+    poll_interval: float,
+    timeout: float | None,
+    checkpoint: _Checkpoint,
+) -> dict[str, BatchResult]:
+    """Submit one job per model, wait for all of them and index results by key.
+
+    Keys answered in `checkpoint` are not requested again, and keys of a job
+    it still lists are waited on rather than resubmitted.
+    """
+    results: dict[str, BatchResult] = {}
+    todo: dict[str, BatchRequest] = {}
+    for request in requests:
+        text = checkpoint.results.get(request.key)
+        if text is not None:
+            results[request.key] = BatchResult(key=request.key, text=text)
+        else:
+            todo[request.key] = request
+
+    jobs: dict[str, list[BatchRequest]] = {}
+    for job, keys in list(checkpoint.jobs.items()):
+        group = [todo.pop(key) for key in keys if key in todo]
+        if not group:
+            continue
+        try:
+            backend.poll(job)
+        except Exception:
+            # Unknown to the provider (expired, or another backend): resubmit.
+            del checkpoint.jobs[job]
+            todo.update((request.key, request) for request in group)
+            continue
+        jobs[job] = group
+
+    by_model: dict[str, list[BatchRequest]] = {}
+    for request in todo.values():
+        by_model.setdefault(request.model, []).append(request)
+    for model, group in by_model.items():
+        job = backend.submit(model, group)
+        jobs[job] = group
+        checkpoint.jobs[job] = [request.key for request in group]
+        checkpoint.save()
+    states = wait_for_jobs(backend, list(jobs), poll_interval, timeout)
+
+    for job, group in jobs.items():
+        if states[job] == "succeeded":
+            for result in backend.results(job):
+                results[result.key] = result
+                if result.error is None and result.text:
+                    checkpoint.results[result.key] = result.text
+        # Finished either way; failed keys are resubmitted by the next run.
+        checkpoint.jobs.pop(job, None)
+        for request in group:
+            results.setdefault(
+                request.key,
+                BatchResult(key=request.key, error=f"batch job {job} {states[job]}"),
+            )
+    checkpoint.save()
+    return results
+
+
+def run_offline_batch(
+    items: list[BatchItem],
+    output: Path,
+    *,
+    model: str,
+    backend: BatchBackend | None = None,
+    poll_interval: float = 30.0,
+    timeout: float | None = None,
+    judge_encoding: str = "indented",
+    judge_fields: str = "full",
+    on_result: Callable[[dict[str, Any]], None] | None = None,
+) -> BatchSummary:
+    """Run debates through the provider's batch API instead of live calls.
+
+    Stage 1 submits every PRO and CON request as one batch job per model;
+    positions that validate go on to a second batch of judge requests. The
+    output file format and restart behaviour match `run_batch`; on top of
+    that, a rerun after an interruption resumes from `<output>.batch.json`.
+    """
+    backend = backend or get_batch_backend()
+    checkpoint = _Checkpoint.beside(output)
+    summary = BatchSummary(total=len(items))
+    done = completed_ids(output)
+    pending = [item for item in items if item.id not in done]
+    summary.skipped = len(items) - len(pending)
+    started = time.perf_counter()
+
+    def failure(item: BatchItem, error: str) -> dict[str, Any]:
+        return {
+            "id": item.id,
+            "decision": item.decision,
+            "context": item.context,
+            "model": item.model or model,
+            "error": error,
+        }
+
+    # Same budgets as live debates; batch results carry no usage to learn from.
+    planner = get_budget_planner()
+    budgets = {item.id: planner.advocate(item.decision, item.context) for item in pending}
+    positions = _run_stage(
+        backend,
+        [
+            BatchRequest(
+                key=f"{item.id}:{side}",
+                model=item.model or model,
+                system=system,
+                user=user_prompt(item.decision, item.context)
+                + arguments_instruction(budgets[item.id].arguments),
+                schema=DebatePosition,
+                max_output_tokens=budgets[item.id].max_output_tokens,
+            )
+            for item in pending
+            for side, system in (("pro", PRO_SYSTEM), ("con", CON_SYSTEM))
+        ],
+        poll_interval,
+        timeout,
+        checkpoint,
+    )
+
+    records: list[dict[str, Any]] = []
+    debated: dict[str, dict[str, Any]] = {}
+    for item in pending:
+        try:
+            pro = _parsed(positions, f"{item.id}:pro", DebatePosition, checkpoint)
+            con = _parsed(positions, f"{item.id}:con", DebatePosition, checkpoint)
+        except Exception as exc:
+            records.append(failure(item, f"{type(exc).__name__}: {exc}"))
+            continue
+        state = initial_state(
+            item.decision,
+            item.context,
+            item.model or model,
+            judge_encoding=judge_encoding,
+            judge_fields=judge_fields,
+        )
+        state["pro_arguments"] = [a.model_dump() for a in pro.arguments]
+        state["con_arguments"] = [a.model_dump() for a in con.arguments]
+        debated[item.id] = state
+
+    by_id = {item.id: item for item in pending}
+    judge_tokens = planner.judge().max_output_tokens
+    verdicts = _run_stage(
+        backend,
+        [
+            BatchRequest(
+                key=f"{item_id}:judge",
+                model=state["model"],
+                system=JUDGE_SYSTEM,
+                user=judge_prompt(
+                    state["decision"],
+                    state["context"],
+                    state["pro_arguments"],
+                    state["con_arguments"],
+                    judge_encoding,
+                    judge_fields,
+                ),
+                schema=JudgeAssessment,
+                max_output_tokens=judge_tokens,
+            )
+            for item_id, state in debated.items()
+        ],
+        poll_interval,
+        timeout,
+        checkpoint,
+    )
+    for item_id, state in debated.items():
+        try:
+            assessment = _parsed(verdicts, f"{item_id}:judge", JudgeAssessment, checkpoint)
+        except Exception as exc:
+            records.append(failure(by_id[item_id], f"{type(exc).__name__}: {exc}"))
+            continue
+        state["verdict"] = build_verdict(assessment).model_dump()
+        records.append({"id": item_id, **debate_payload(state)})
+
+    elapsed = round(time.perf_counter() - started, 3)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("a", encoding="utf-8") as sink:
+        if sink.tell() and not output.read_bytes().endswith(b"\n"):
+            sink.write("\n")
+        for record in records:
+            # Batch results arrive together, so every record shares the run's latency.
+            record["elapsed_seconds"] = elapsed
+            sink.write(json.dumps(record, ensure_ascii=False) + "\n")
+            if record.get("error"):
+                summary.failed += 1
+            else:
+                summary.succeeded += 1
+                summary.latencies.append(elapsed)
+            if on_result is not None:
+                on_result(record)
+    failed = {record["id"] for record in records if record.get("error")}
+    if failed:
+        # A rerun retries the failed items: keep what they already have.
+        checkpoint.results = {
+            key: text
+            for key, text in checkpoint.results.items()
+            if key.rpartition(":")[0] in failed
+        }
+        checkpoint.save()
+    else:
+        checkpoint.discard()
+    summary.elapsed_seconds = time.perf_counter() - started
+    return summary
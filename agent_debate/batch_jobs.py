@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any, Protocol, Type
+
+from google import genai
+from google.genai import types
+from pydantic import BaseModel
+
+from agent_debate.llm import _gemini_response_schema, _parse_jsonish, get_client
+
+# Terminal Gemini job states, mapped onto what `BatchBackend.poll` reports.
+_GEMINI_STATES = {
+    "JOB_STATE_SUCCEEDED": "succeeded",
+    "JOB_STATE_PARTIALLY_SUCCEEDED": "succeeded",
+    "JOB_STATE_FAILED": "failed",
+    "JOB_STATE_CANCELLED": "failed",
+    "JOB_STATE_EXPIRED": "failed",
+}
+
+
+@dataclass(frozen=True)
+class BatchRequest:
+    key: str
+    model: str
+    system: str
+    user: str
+    schema: Type[BaseModel]
+    temperature: float = 0.2
+    max_output_tokens: int = 1400
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    key: str
+    text: str | None = None
+    error: str | None = None
+
+    def parse(self, schema: Type[BaseModel]) -> BaseModel:
+        """Validate the response text against the strict schema."""
+        if self.error is not None:
+            raise RuntimeError(self.error)
+        if not self.text:
+            raise ValueError("Batch response contained no text.")
+        return schema.model_validate(_parse_jsonish(self.text))
+
+
+class BatchBackend(Protocol):
+    """Submit many structured-output requests as one asynchronous job.
+
+    `poll` returns "running", "succeeded" or "failed"; `results` is only
+    called after "succeeded" and returns one entry per submitted key.
+    """
+
+    def submit(self, model: str, requests: list[BatchRequest]) -> str: ...
+
+    def poll(self, job: str) -> str: ...
+
+    def results(self, job: str) -> list[BatchResult]: ...
+
+
+def _request_line(request: BatchRequest) -> dict[str, Any]:
+    return {
+        "key": request.key,
+        "request": {
+            "system_instruction": {"parts": [{"text": request.system}]},
+            "contents": [{"role": "user", "parts": [{"text": request.user}]}],
+            "generation_config": {
+                "temperature": request.temperature,
+                "max_output_tokens": request.max_output_tokens,
+                "response_mime_type": "application/json",
+                "response_json_schema": _gemini_response_schema(request.schema),
+            },
+        },
+    }
+
+
+def _response_text(response: dict[str, Any]) -> str | None:
+    candidates = response.get("candidates") or []
+    if not candidates:
+        return None
+    parts = (candidates[0].get("content") or {}).get("parts") or []
+    text = "".join(part.get("text", "") for part in parts if not part.get("thought"))
+    return text or None
+
+
+class GeminiBatchBackend:
+    """Gemini batch mode: requests go up as a JSONL file, results come back as one."""
+
+    def __init__(self, client: genai.Client | None = None) -> None:
+        self.client = client or get_client()
+
+    def submit(self, model: str, requests: list[BatchRequest]) -> str:
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".jsonl", encoding="utf-8", delete=False
+        ) as handle:
+            for request in requests:
+                handle.write(json.dumps(_request_line(request), ensure_ascii=False) + "\n")
+            path = handle.name
+        try:
+            uploaded = self.client.files.upload(
+                file=path,
+                config=types.UploadFileConfig(
+                    display_name=f"agent-debate-{int(time.time())}",
+                    mime_type="jsonl",
+                ),
+            )
+        finally:
+            os.unlink(path)
+        job = self.client.batches.create(
+            model=model,
+            src=uploaded.name,
+            config=types.CreateBatchJobConfig(display_name=uploaded.display_name),
+        )
+        return job.name
+
+    def poll(self, job: str) -> str:
+        state = self.client.batches.get(name=job).state
+        name = getattr(state, "name", str(state))
+        return _GEMINI_STATES.get(name, "running")
+
+    def results(self, job: str) -> list[BatchResult]:
+        batch = self.client.batches.get(name=job)
+        content = self.client.files.download(file=batch.dest.file_name)
+        results: list[BatchResult] = []
+        for line in content.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            key = str(record.get("key", ""))
+            if record.get("error"):
+                results.append(BatchResult(key=key, error=json.dumps(record["error"])))
+                continue
+            text = _response_text(record.get("response") or {})
+            if text is None:
+                results.append(BatchResult(key=key, error="Batch response has no candidates."))
+            else:
+                results.append(BatchResult(key=key, text=text))
+        return results
+
+
+def get_batch_backend() -> BatchBackend:
+    """Backend selected by DEBATE_BATCH_BACKEND (gemini | fake)."""
+    name = os.environ.get("DEBATE_BATCH_BACKEND", "gemini").strip().lower()
+    if name == "fake":
+        from agent_debate.fake import FakeBatchBackend
+
+        return FakeBatchBackend()
+    if name != "gemini":
+        raise ValueError(f"Unknown DEBATE_BATCH_BACKEND: {name!r}")
+    return GeminiBatchBackend()
+
+
+def wait_for_jobs(
+    backend: BatchBackend,
+    jobs: list[str],
+    poll_interval: float = 30.0,
+    timeout: float | None = None,
+) -> dict[str, str]:
+    """Poll until every job is finished; returns the final state per job."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    states = {job: "running" for job in jobs}
+    while True:
+        for job, state in states.items():
+            if state == "running":
+                states[job] = backend.poll(job)
+        if all(state != "running" for state in states.values()):
+            return states
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError(f"Batch jobs still running after {timeout:.0f}s: {jobs}")
+        time.sleep(poll_interval)
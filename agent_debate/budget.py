@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import collections
+import math
+import os
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Literal
+
+from agent_debate.telemetry import CallTelemetry
+
+# Budgets used when DEBATE_BUDGET=fixed, and the historical defaults.
+FIXED_ADVOCATE_TOKENS = 2200
+FIXED_JUDGE_TOKENS = 2800
+
+# Priors until enough calls have been observed; Russian text costs ~1.5x tokens.
+# The judge prior keeps at least the old fixed limit (with headroom): a cold
+# judge answer is long, and truncating it would make continuations the norm.
+PRIOR_TOKENS_PER_ARGUMENT = {"en": 170.0, "ru": 260.0}
+PRIOR_JUDGE_TOKENS = {"en": 2160.0, "ru": 3100.0}
+ARGUMENT_OVERHEAD_TOKENS = 40
+HEADROOM = 1.3
+MIN_SAMPLES = 5
+MIN_TOKENS = 600
+MAX_TOKENS = 4096
+# Words in decision + context at which one more argument is asked for.
+ARGUMENT_STEPS = (40, 150, 400)
+MIN_ARGUMENTS = 3
+# Below the schema's limit of 8 on purpose: a model that overshoots "exactly N"
+# by a point or two still validates instead of costing a repair.
+MAX_ARGUMENTS = 6
+
+
+@dataclass(frozen=True)
+class StageBudget:
+    """Output limits for one stage: token cap and, for advocates, argument count."""
+
+    max_output_tokens: int
+    arguments: int | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _p90(samples: collections.deque[float]) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, math.ceil(0.9 * len(ordered)) - 1)]
+
+
+def argument_count(decision: str, context: str) -> int:
+    """More arguments for richer requests: 3 for a one-liner, up to 6."""
+    words = len(decision.split()) + len(context.split())
+    return min(MAX_ARGUMENTS, MIN_ARGUMENTS + sum(words >= step for step in ARGUMENT_STEPS))
+
+
+class BudgetPlanner:
+    """Token budgets from request size, language and observed usage.
+
+    Advocates are budgeted per argument and the judge per response, each from
+    the 90th percentile of recent clean calls (one attempt, no repairs), with
+    headroom. Until `MIN_SAMPLES` calls are seen, language priors are used.
+    """
+
+    def __init__(self, window: int = 200, headroom: float = HEADROOM) -> None:
+        self.headroom = headroom
+        self._samples: dict[tuple[str, str], collections.deque[float]] = (
+            collections.defaultdict(lambda: collections.deque(maxlen=window))
+        )
+        self._lock = threading.Lock()
+
+    def _estimate(self, kind: str, language: str, prior: float) -> float:
+        with self._lock:
+            samples = self._samples.get((kind, language))
+            if samples is None or len(samples) < MIN_SAMPLES:
+                return prior
+            return _p90(samples)
+
+    def _clamp(self, tokens: float, cap: int | None = None) -> int:
+        tokens = min(MAX_TOKENS, max(MIN_TOKENS, math.ceil(tokens * self.headroom)))
+        return min(tokens, cap) if cap is not None else tokens
+
+    def advocate(
+        self,
+        decision: str,
+        context: str,
+        language: Literal["en", "ru"] = "en",
+        cap: int | None = None,
+    ) -> StageBudget:
+        arguments = argument_count(decision, context)
+        per_argument = self._estimate(
+            "argument", language, PRIOR_TOKENS_PER_ARGUMENT[language]
+        )
+        tokens = per_argument * arguments + ARGUMENT_OVERHEAD_TOKENS
+        return StageBudget(self._clamp(tokens, cap), arguments)
+
+    def judge(self, language: Literal["en", "ru"] = "en") -> StageBudget:
+        return StageBudget(
+            self._clamp(self._estimate("judge", language, PRIOR_JUDGE_TOKENS[language]))
+        )
+
+    def observe(
+        self,
+        kind: Literal["argument", "judge"],
+        language: str,
+        call: CallTelemetry | None,
+        items: int = 1,
+    ) -> None:
+        """Learn from a finished call; retried, repaired or cached calls are skipped."""
+        if (
+            call is None
+            or call.cache_hit
+            or call.outcome != "ok"
+            or call.attempts != 1
+            or call.validation_failures
+            or not call.output_tokens
+            or items < 1
+        ):
+            return
+        with self._lock:
+            self._samples[(kind, language)].append(call.output_tokens / items)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                f"{kind}:{language}": {
+                    "samples": len(samples),
+                    "p90_tokens": round(_p90(samples), 1) if samples else None,
+                }
+                for (kind, language), samples in self._samples.items()
+            }
+
+
+class FixedBudgetPlanner(BudgetPlanner):
+    """The historical fixed limits, with no argument count requested."""
+
+    def advocate(
+        self,
+        decision: str,
+        context: str,
+        language: Literal["en", "ru"] = "en",
+        cap: int | None = None,
+    ) -> StageBudget:
+        return StageBudget(min(FIXED_ADVOCATE_TOKENS, cap or FIXED_ADVOCATE_TOKENS))
+
+    def judge(self, language: Literal["en", "ru"] = "en") -> StageBudget:
+        return StageBudget(FIXED_JUDGE_TOKENS)
+
+
+def arguments_instruction(arguments: int | None, language: Literal["en", "ru"] = "en") -> str:
+    """User-prompt line asking for the budgeted number of arguments."""
+    if arguments is None:
+        return ""
+    if language == "ru":
+        return f"\nПриведите ровно {arguments} аргументов."
+    return f"\nGive exactly {arguments} arguments."
+
+
+_planner: BudgetPlanner | None = None
+_planner_lock = threading.Lock()
+
+
+def get_budget_planner() -> BudgetPlanner:
+    """Process-wide planner; DEBATE_BUDGET=fixed restores the old constant limits."""
+    global _planner
+    if _planner is None:
+        with _planner_lock:
+            if _planner is None:
+                mode = os.environ.get("DEBATE_BUDGET", "adaptive").strip().lower()
+                _planner = FixedBudgetPlanner() if mode == "fixed" else BudgetPlanner()
+    return _planner
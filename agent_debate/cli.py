@@ -10,7 +10,9 @@ from rich.panel import Panel
 from rich.table import Table
 from rich import box
 
-from agent_debate.graph import build_graph
+from agent_debate.graph import build_graph, debate_payload, initial_state
+from agent_debate.rounds import MAX_ROUNDS
+from agent_debate.prompts import ARGUMENT_FIELDS
 
 app = typer.Typer(help="Decision Support Debate — three-agent decision analysis.")
 console = Console()
@@ -49,24 +51,57 @@ def debate(
     save_json: Optional[Path] = typer.Option(
         None, "--save-json", help="Save full result to JSON file."
     ),
+    parallel: bool = typer.Option(
+        True,
+        "--parallel/--sequential",
+        help="Run PRO and CON concurrently (default) or one after another.",
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Ignore cached LLM results for this run."
+    ),
+    judge_encoding: str = typer.Option(
+        "indented",
+        "--judge-encoding",
+        help="Judge input encoding: indented, minified or table.",
+    ),
+    judge_fields: str = typer.Option(
+        "full",
+        "--judge-fields",
+        help="Argument fields sent to the judge: full or compact (no reasoning).",
+    ),
+    rounds: int = typer.Option(
+        1,
+        "--rounds",
+        min=1,
+        max=MAX_ROUNDS,
+        help="Debate rounds; later rounds rebut the opponent's strongest points.",
+    ),
 ) -> None:
     """Run a three-agent debate (PRO / CON / JUDGE) on a decision."""
+    if judge_encoding not in ("indented", "minified", "table"):
+        raise typer.BadParameter(
+            "must be indented, minified or table", param_hint="--judge-encoding"
+        )
+    if judge_fields not in ARGUMENT_FIELDS:
+        raise typer.BadParameter("must be full or compact", param_hint="--judge-fields")
+
     console.print(
         Panel(f"[bold]{decision}[/bold]", title="Decision under debate", expand=False)
     )
 
     with console.status("[bold cyan]Running debate…[/bold cyan]", spinner="dots"):
         try:
-            graph = build_graph()
+            graph = build_graph(parallel=parallel)
             result = graph.invoke(
-                {
-                    "decision": decision,
-                    "context": context,
-                    "model": model,
-                    "pro_arguments": [],
-                    "con_arguments": [],
-                    "verdict": {},
-                }
+                initial_state(
+                    decision,
+                    context,
+                    model,
+                    cache="bypass" if no_cache else "default",
+                    judge_encoding=judge_encoding,
+                    judge_fields=judge_fields,
+                    rounds=rounds,
+                )
             )
         except Exception as exc:
             console.print(
@@ -115,6 +150,11 @@ def debate(
             )
         )
 
+    history = result.get("rounds_history") or []
+    if rounds > 1:
+        note = " (stopped early: arguments converged)" if len(history) < rounds else ""
+        console.print(f"\n[dim]Rounds argued: {len(history)} of {rounds}{note}[/dim]")
+
     # --- Scorecard ---
     console.print("\n[bold cyan]Scorecard[/bold cyan]")
     table = Table(box=box.SIMPLE_HEAVY, show_header=True, header_style="bold")
@@ -184,14 +224,7 @@ def debate(
         )
 
     if save_json:
-        payload = {
-            "decision": decision,
-            "context": context,
-            "model": model,
-            "pro_arguments": pro_args,
-            "con_arguments": con_args,
-            "verdict": verdict,
-        }
+        payload = debate_payload(result)
         try:
             save_json.write_text(json.dumps(payload, ensure_ascii=False, indent=2))
         except OSError as exc:
@@ -205,3 +238,246 @@ def debate(
             )
             raise typer.Exit(code=1) from exc
         console.print(f"\n[dim]Full result saved to {save_json}[/dim]")
+
+
+@app.command("batch")
+def batch(
+    ctx: typer.Context,
+    input_file: Path = typer.Argument(
+        ..., help="JSONL or CSV with decision, and optional id, context, model."
+    ),
+    output: Path = typer.Option(
+        ..., "--output", "-o", help="JSONL file that receives one result per line."
+    ),
+    concurrency: int = typer.Option(
+        4, "--concurrency", "-j", help="Debates run at the same time."
+    ),
+    model: str = typer.Option(
+        DEFAULT_MODEL, "--model", "-m", help="Default Gemini model ID."
+    ),
+    parallel: bool = typer.Option(
+        True,
+        "--parallel/--sequential",
+        help="Run PRO and CON concurrently (default) or one after another.",
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Ignore cached LLM results for this run."
+    ),
+    judge_encoding: str = typer.Option(
+        "indented",
+        "--judge-encoding",
+        help="Judge input encoding: indented, minified or table.",
+    ),
+    judge_fields: str = typer.Option(
+        "full",
+        "--judge-fields",
+        help="Argument fields sent to the judge: full or compact (no reasoning).",
+    ),
+    offline: bool = typer.Option(
+        False,
+        "--offline",
+        help="Submit through the Gemini batch API (slower, cheaper, higher throughput).",
+    ),
+    poll_interval: float = typer.Option(
+        30.0, "--poll-interval", help="Seconds between batch job status checks (--offline)."
+    ),
+) -> None:
+    """Run debates for every decision in a file; completed ids are skipped on restart."""
+    from agent_debate.batch import read_items, run_batch, run_offline_batch
+
+    if judge_encoding not in ("indented", "minified", "table"):
+        raise typer.BadParameter(
+            "must be indented, minified or table", param_hint="--judge-encoding"
+        )
+    if judge_fields not in ARGUMENT_FIELDS:
+        raise typer.BadParameter("must be full or compact", param_hint="--judge-fields")
+    if concurrency < 1:
+        raise typer.BadParameter("must be at least 1", param_hint="--concurrency")
+    if offline:
+        # Batch jobs have no concurrency, cache or PRO/CON ordering to tune.
+        live_only = [
+            hint
+            for name, hint in (
+                ("concurrency", "--concurrency"),
+                ("no_cache", "--no-cache"),
+                ("parallel", "--parallel/--sequential"),
+            )
+            # By name: newer Typer releases ship their own copy of Click's enum.
+            if getattr(ctx.get_parameter_source(name), "name", None) == "COMMANDLINE"
+        ]
+        if live_only:
+            raise typer.BadParameter(
+                "has no effect with --offline", param_hint=", ".join(live_only)
+            )
+
+    try:
+        items = read_items(input_file)
+    except (OSError, ValueError) as exc:
+        console.print(
+            Panel(str(exc), title="Could not read input", border_style="red", expand=False)
+        )
+        raise typer.Exit(code=1) from exc
+
+    def _report(record: dict) -> None:
+        if record.get("error"):
+            console.print(f"[red]✗[/red] {record['id']}  {record['error']}")
+        else:
+            verdict = record["verdict"]
+            label = DECISION_ICONS.get(verdict["decision"], verdict["decision"])
+            console.print(
+                f"[green]✓[/green] {record['id']}  {label}  "
+                f"[dim]{record['elapsed_seconds']:.1f}s[/dim]"
+            )
+
+    if offline:
+        with console.status(
+            "[bold cyan]Waiting for batch jobs…[/bold cyan]", spinner="dots"
+        ):
+            try:
+                summary = run_offline_batch(
+                    items,
+                    output,
+                    model=model,
+                    poll_interval=poll_interval,
+                    judge_encoding=judge_encoding,
+                    judge_fields=judge_fields,
+                    on_result=_report,
+                ).as_dict()
+            except Exception as exc:
+                console.print(
+                    Panel(str(exc), title="Batch job failed", border_style="red", expand=False)
+                )
+                raise typer.Exit(code=1) from exc
+    else:
+        summary = run_batch(
+            items,
+            output,
+            model=model,
+            concurrency=concurrency,
+            parallel=parallel,
+            cache="bypass" if no_cache else "default",
+            judge_encoding=judge_encoding,
+            judge_fields=judge_fields,
+            on_result=_report,
+        ).as_dict()
+
+    table = Table(box=box.SIMPLE_HEAVY, show_header=False)
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right")
+    for key in (
+        "total",
+        "skipped",
+        "succeeded",
+        "failed",
+        "elapsed_seconds",
+        "debates_per_minute",
+        "latency_p50",
+        "latency_p95",
+        "latency_max",
+    ):
+        value = summary[key]
+        table.add_row(key, "—" if value is None else str(value))
+    console.print(Panel(table, title="[bold]Batch summary[/bold]", expand=False))
+    console.print(f"[dim]Results appended to {output}[/dim]")
+    if summary["failed"]:
+        raise typer.Exit(code=1)
+
+
+@app.command("sensitivity")
+def sensitivity(
+    debate_json: Path = typer.Argument(
+        ..., help="Debate result saved with `debate --save-json`."
+    ),
+    samples: int = typer.Option(
+        5000, "--samples", "-n", help="Dirichlet weight samples."
+    ),
+    concentration: float = typer.Option(
+        50.0, "--concentration", help="Dirichlet concentration (higher = closer to stored weights)."
+    ),
+    grid_step: float = typer.Option(
+        0.1, "--grid-step", help="Step of the exhaustive weight grid."
+    ),
+    seed: int = typer.Option(0, "--seed", help="Random seed."),
+    as_json: bool = typer.Option(False, "--json", help="Print the raw JSON report."),
+) -> None:
+    """What-if analysis: how rubric weight changes would move the verdict (no LLM calls)."""
+    from agent_debate.sensitivity import run_sensitivity
+
+    try:
+        payload = json.loads(debate_json.read_text())
+        report = run_sensitivity(
+            payload["verdict"],
+            samples=samples,
+            concentration=concentration,
+            grid_step=grid_step,
+            seed=seed,
+        )
+    except (OSError, KeyError, ValueError) as exc:
+        console.print(
+            Panel(
+                str(exc),
+                title="Sensitivity analysis failed",
+                border_style="red",
+                expand=False,
+            )
+        )
+        raise typer.Exit(code=1) from exc
+
+    if as_json:
+        typer.echo(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+
+    base = report["base"]
+    decision_label = DECISION_ICONS.get(base["decision"], base["decision"])
+    winner_label = WINNER_LABELS.get(base["winner"], base["winner"])
+    console.print(
+        Panel(
+            f"Decision: {decision_label}   Winner: {winner_label}   "
+            f"PRO {base['pro_total']:.2f} vs CON {base['con_total']:.2f}",
+            title="[bold]Stored verdict[/bold]",
+            border_style="cyan",
+            expand=False,
+        )
+    )
+
+    table = Table(box=box.SIMPLE_HEAVY, show_header=True, header_style="bold")
+    table.add_column("Sweep", style="cyan")
+    table.add_column("Samples", justify="right")
+    table.add_column("Winner flips", justify="right")
+    table.add_column("Decision flips", justify="right")
+    table.add_column("Nearest decision flip")
+    for name in ("grid", "dirichlet"):
+        sweep = report[name]
+        nearest = sweep["nearest_decision_flip"]
+        table.add_row(
+            name,
+            str(sweep["samples"]),
+            f"{sweep['winner_flip_rate']:.1%}",
+            f"{sweep['decision_flip_rate']:.1%}",
+            (
+                f"{nearest['decision']} at L1 {nearest['l1_distance']:.2f}"
+                if nearest
+                else "—"
+            ),
+        )
+    console.print(table)
+
+    oat = Table(
+        title="One-at-a-time boundaries",
+        box=box.SIMPLE_HEAVY,
+        show_header=True,
+        header_style="bold",
+    )
+    oat.add_column("Criterion", style="cyan")
+    oat.add_column("Weight", justify="right")
+    oat.add_column("Winner flips at", justify="right")
+    oat.add_column("Decision flips at", justify="right")
+    for row in report["one_at_a_time"]:
+        oat.add_row(
+            row["criterion"],
+            f"{row['weight']:.0%}",
+            ", ".join(f"{w:.0%}" for w in row["winner_boundaries"]) or "—",
+            ", ".join(f"{w:.0%}" for w in row["decision_boundaries"]) or "—",
+        )
+    console.print(oat)
+    console.print(f"[dim]Computed in {report['elapsed_ms']:.1f} ms[/dim]")
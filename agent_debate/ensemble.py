@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable
+
+import numpy as np
+
+from agent_debate.schemas import (
+    DEFAULT_RUBRIC,
+    CriterionAgreement,
+    EnsembleAgreement,
+    JudgeVote,
+    Rubric,
+    ScorecardCriterion,
+    Verdict,
+)
+from agent_debate.scoring import DECISIONS, WINNERS, outcome_codes, score_matrix, weighted_totals
+from agent_debate.telemetry import ENSEMBLE_AGREEMENT, ENSEMBLE_JUDGES
+
+MAX_JUDGES = 7
+# Ensemble judges spread their sampling temperature over this range; a
+# single judge keeps the usual structured-call temperature.
+MIN_TEMPERATURE = 0.2
+MAX_TEMPERATURE = 1.0
+
+
+@dataclass(frozen=True)
+class JudgeSpec:
+    model: str
+    temperature: float = MIN_TEMPERATURE
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class JudgeOutcome:
+    index: int
+    spec: JudgeSpec
+    verdict: dict[str, Any]
+
+
+@dataclass
+class EnsembleRun:
+    judges: int
+    quorum: int
+    outcomes: list[JudgeOutcome] = field(default_factory=list)
+    failed: int = 0
+    cancelled: int = 0
+    quorum_decision: str | None = None
+
+
+def judge_specs(judges: int, model: str, models: list[str] | None = None) -> list[JudgeSpec]:
+    """`judges` specs cycling through `models` (default: just `model`), temperatures spread evenly."""
+    pool = models or [model]
+    if judges == 1:
+        return [JudgeSpec(pool[0])]
+    step = (MAX_TEMPERATURE - MIN_TEMPERATURE) / (judges - 1)
+    return [
+        JudgeSpec(pool[i % len(pool)], round(MIN_TEMPERATURE + i * step, 3))
+        for i in range(judges)
+    ]
+
+
+def majority(judges: int) -> int:
+    return judges // 2 + 1
+
+
+def _score_arrays(verdicts: list[Verdict], rubric: Rubric) -> tuple[np.ndarray, np.ndarray]:
+    """Judges x criteria PRO and CON scores, in rubric order."""
+    matrices = [score_matrix(verdict.scorecard, rubric) for verdict in verdicts]
+    pro = np.array([scores[0] for scores in matrices])
+    con = np.array([scores[1] for scores in matrices])
+    return pro, con
+
+
+def _median_outcome(
+    pro: np.ndarray, con: np.ndarray, rubric: Rubric
+) -> tuple[np.ndarray, np.ndarray, float, float, str, str]:
+    """Median scorecard, its weighted totals, winner and decision."""
+    pro_median, con_median = np.median(pro, axis=0), np.median(con, axis=0)
+    pro_total, con_total = weighted_totals(np.array(rubric.weights), pro_median, con_median)
+    winner, decision = outcome_codes(pro_total, con_total, rubric.tie_margin, rubric.go_margin)
+    return (
+        pro_median,
+        con_median,
+        float(pro_total),
+        float(con_total),
+        str(WINNERS[int(winner) + 1]),
+        str(DECISIONS[int(decision) + 1]),
+    )
+
+
+def median_decision(verdicts: list[Verdict], rubric: Rubric = DEFAULT_RUBRIC) -> str:
+    """Decision of the median scorecard of `verdicts`, as `aggregate_verdicts` computes it."""
+    return _median_outcome(*_score_arrays(verdicts, rubric), rubric)[5]
+
+
+async def run_ensemble(
+    specs: list[JudgeSpec],
+    judge: Callable[[JudgeSpec], Awaitable[dict[str, Any]]],
+    quorum: int,
+    on_judge: Callable[[JudgeOutcome, EnsembleRun], None] | None = None,
+    rubric: Rubric = DEFAULT_RUBRIC,
+) -> EnsembleRun:
+    """Run all judges concurrently; cancel the rest once `quorum` agree on a decision.
+
+    Votes alone do not stop the ensemble: the median scorecard of the judges
+    finished so far must yield the same decision, so the aggregated verdict
+    always matches `quorum_decision`. Failed judges are counted and skipped;
+    only if every judge fails is the first error raised.
+    """
+    run = EnsembleRun(judges=len(specs), quorum=min(quorum, len(specs)))
+    tasks = {
+        asyncio.ensure_future(judge(spec)): (index, spec) for index, spec in enumerate(specs)
+    }
+    pending = set(tasks)
+    votes: collections.Counter[str] = collections.Counter()
+    verdicts: list[Verdict] = []
+    error: BaseException | None = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index, spec = tasks[task]
+                failure = asyncio.CancelledError() if task.cancelled() else task.exception()
+                if failure is not None:
+                    run.failed += 1
+                    ENSEMBLE_JUDGES.inc(outcome="failed")
+                    error = error or failure
+                    continue
+                outcome = JudgeOutcome(index, spec, task.result())
+                run.outcomes.append(outcome)
+                ENSEMBLE_JUDGES.inc(outcome="completed")
+                verdicts.append(Verdict.model_validate(outcome.verdict))
+                decision = outcome.verdict["decision"]
+                votes[decision] += 1
+                if (
+                    run.quorum_decision is None
+                    and votes[decision] >= run.quorum
+                    and median_decision(verdicts, rubric) == decision
+                ):
+                    run.quorum_decision = decision
+                if on_judge is not None:
+                    on_judge(outcome, run)
+            if run.quorum_decision is not None and pending:
+                run.cancelled = len(pending)
+                ENSEMBLE_JUDGES.inc(run.cancelled, outcome="cancelled")
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+    if not run.outcomes:
+        assert error is not None
+        raise error
+    run.outcomes.sort(key=lambda outcome: outcome.index)
+    return run
+
+
+def aggregate_verdicts(run: EnsembleRun, rubric: Rubric = DEFAULT_RUBRIC) -> Verdict:
+    """One Verdict from the completed judges of `run`.
+
+    Each criterion takes the median of the judges' scores, and totals, winner
+    and decision are recomputed from that scorecard exactly as for a single
+    judge, so the verdict stays reproducible from its own scores. Prose
+    fields come from the judge closest to the aggregated totals, and the
+    mean judge confidence is scaled by the share of judges that agree.
+    """
+    verdicts = [Verdict.model_validate(outcome.verdict) for outcome in run.outcomes]
+    pro, con = _score_arrays(verdicts, rubric)
+    weights = np.array(rubric.weights)
+    pro_median, con_median, pro_total, con_total, winner, decision_name = _median_outcome(
+        pro, con, rubric
+    )
+
+    judge_pro, judge_con = pro @ weights, con @ weights
+    agreeing = [v.decision == decision_name for v in verdicts]
+    distance = np.hypot(judge_pro - pro_total, judge_con - con_total)
+    # Closest judge among those that agree with the aggregate, if any do.
+    candidates = [i for i, ok in enumerate(agreeing) if ok] or range(len(verdicts))
+    representative = verdicts[min(candidates, key=lambda i: distance[i])]
+    share = sum(agreeing) / len(verdicts)
+    ENSEMBLE_AGREEMENT.observe(share)
+
+    rationale = {row.criterion.casefold(): row.rationale for row in representative.scorecard}
+    scorecard = [
+        ScorecardCriterion(
+            criterion=criterion.name,
+            weight=criterion.weight,
+            pro_score=float(pro_median[i]),
+            con_score=float(con_median[i]),
+            rationale=rationale[criterion.name.casefold()],
+        )
+        for i, criterion in enumerate(rubric.criteria)
+    ]
+    agreement = EnsembleAgreement(
+        judges=run.judges,
+        completed=len(verdicts),
+        failed=run.failed,
+        cancelled=run.cancelled,
+        quorum=run.quorum,
+        quorum_decision=run.quorum_decision,
+        agreement=round(share, 4),
+        votes=dict(collections.Counter(v.decision for v in verdicts)),
+        pro_total_std=round(float(judge_pro.std()), 4),
+        con_total_std=round(float(judge_con.std()), 4),
+        criteria=[
+            CriterionAgreement(
+                criterion=criterion.name,
+                pro_mean=round(float(pro[:, i].mean()), 4),
+                pro_median=round(float(pro_median[i]), 4),
+                pro_std=round(float(pro[:, i].std()), 4),
+                con_mean=round(float(con[:, i].mean()), 4),
+                con_median=round(float(con_median[i]), 4),
+                con_std=round(float(con[:, i].std()), 4),
+            )
+            for i, criterion in enumerate(rubric.criteria)
+        ],
+        members=[
+            JudgeVote(
+                model=outcome.spec.model,
+                temperature=outcome.spec.temperature,
+                decision=verdict.decision,
+                winner=verdict.winner,
+                confidence=verdict.confidence,
+                pro_total=verdict.pro_total,
+                con_total=verdict.con_total,
+            )
+            for outcome, verdict in zip(run.outcomes, verdicts)
+        ],
+    )
+    return representative.model_copy(
+        update={
+            "decision": decision_name,
+            "winner": winner,
+            "confidence": round(float(np.mean([v.confidence for v in verdicts])) * share, 4),
+            "scorecard": scorecard,
+            "pro_total": round(pro_total, 4),
+            "con_total": round(con_total, 4),
+            "agreement": agreement,
+        }
+    )
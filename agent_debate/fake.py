@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import itertools
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, NamedTuple, Type
+
+from google.genai import errors, types
+from pydantic import BaseModel
+
+from agent_debate.batch_jobs import BatchRequest, BatchResult
+from agent_debate.schemas import DEFAULT_RUBRIC, DebatePosition, JudgeAssessment
+
+
+_SCHEMAS: dict[str, Type[BaseModel]] = {
+    schema.__name__: schema for schema in (DebatePosition, JudgeAssessment)
+}
+# The argument count asked for by the budget planner, in either language.
+_REQUESTED_ARGUMENTS = re.compile(r"(?:exactly|ровно) (\d+)")
+
+
+class _Plan(NamedTuple):
+    latency: float
+    failure: str | None
+    text: str
+    prompt_tokens: int
+    truncated: bool
+
+
+def sample_output(
+    schema: Type[BaseModel], rng: random.Random, arguments: int | None = None
+) -> dict[str, Any]:
+    """A schema-valid payload for `schema`, with randomised scores and confidences."""
+    if schema is DebatePosition:
+        return {
+            "arguments": [
+                {
+                    "claim": f"Claim {i}",
+                    "reasoning": f"Reasoning behind claim {i}.",
+                    "evidence": "assumption: no data was provided",
+                    "risk": f"Risk {i} if the claim is wrong.",
+                    "confidence": round(rng.uniform(0.3, 0.9), 2),
+                }
+                for i in range(1, (min(8, max(3, arguments)) if arguments else rng.randint(3, 5)) + 1)
+            ]
+        }
+    if schema is JudgeAssessment:
+        return {
+            "confidence": round(rng.uniform(0.4, 0.9), 2),
+            "summary": "Both sides raise valid points; see the scorecard.",
+            "scorecard": [
+                {
+                    "criterion": name,
+                    "pro_score": round(rng.uniform(3, 9), 1),
+                    "con_score": round(rng.uniform(3, 9), 1),
+                    "rationale": f"Comparison on {name.lower()}.",
+                }
+                for name in DEFAULT_RUBRIC.names
+            ],
+            "key_risks": ["Execution risk", "Budget overrun"],
+            "assumptions_to_verify": ["Demand holds for the next quarter"],
+            "next_48h_actions": ["Collect missing numbers", "Review with the team"],
+            "needs_more_info": False,
+            "clarifying_questions": [],
+        }
+    raise ValueError(f"No fake output for schema {schema.__name__}")
+
+
+def invalidate_output(payload: dict[str, Any], rng: random.Random) -> dict[str, Any]:
+    """Break one schema constraint the way models typically do, keeping valid JSON."""
+    if "arguments" in payload:
+        arguments = payload["arguments"]
+        payload["arguments"] = (arguments * 3)[:10] if rng.random() < 0.5 else arguments[:2]
+        return payload
+    mistake = rng.choice(("missing_row", "renamed", "questions", "long_list"))
+    if mistake == "missing_row":
+        payload["scorecard"].pop(rng.randrange(len(payload["scorecard"])))
+    elif mistake == "renamed":
+        row = rng.choice(payload["scorecard"])
+        row["criterion"] = row["criterion"].lower().replace("/", " / ")
+    elif mistake == "questions":
+        payload["clarifying_questions"] = ["What is the budget?"]
+    else:
+        payload["key_risks"] = [f"Risk {i}" for i in range(1, 11)]
+    return payload
+
+
+class FakeBatchBackend:
+    """In-memory stand-in for the Gemini batch API.
+
+    Jobs finish after `polls_until_done` polls. Each request is answered with
+    `sample_output` for its schema, or an error with probability `error_rate`.
+    """
+
+    def __init__(
+        self,
+        polls_until_done: int = 1,
+        error_rate: float = 0.0,
+        seed: int | None = 0,
+    ) -> None:
+        self.polls_until_done = polls_until_done
+        self.error_rate = error_rate
+        self.submitted: list[tuple[str, list[BatchRequest]]] = []
+        self._rng = random.Random(seed)
+        self._jobs: dict[str, dict[str, Any]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, model: str, requests: list[BatchRequest]) -> str:
+        with self._lock:
+            job = f"batches/fake-{next(self._ids)}"
+            self._jobs[job] = {"requests": list(requests), "polls": 0}
+            self.submitted.append((model, list(requests)))
+        return job
+
+    def poll(self, job: str) -> str:
+        with self._lock:
+            state = self._jobs[job]
+            state["polls"] += 1
+            return "succeeded" if state["polls"] >= self.polls_until_done else "running"
+
+    def results(self, job: str) -> list[BatchResult]:
+        with self._lock:
+            requests = self._jobs[job]["requests"]
+            results: list[BatchResult] = []
+            for request in requests:
+                if self._rng.random() < self.error_rate:
+                    results.append(BatchResult(key=request.key, error="fake batch error"))
+                    continue
+                payload = sample_output(request.schema, self._rng)
+                results.append(BatchResult(key=request.key, text=json.dumps(payload)))
+            return results
+
+
+@dataclass(frozen=True)
+class FakeProfile:
+    """Latency and failure behaviour of `FakeLLMBackend`.
+
+    Latency is log-normal with the given median and sigma; `*_rate` are
+    per-call probabilities of a 429, a 503, a truncated JSON body or well-formed
+    JSON that breaks a schema constraint.
+    """
+
+    latency_ms: float = 800.0
+    latency_sigma: float = 0.5
+    rate_limit_rate: float = 0.0
+    unavailable_rate: float = 0.0
+    malformed_rate: float = 0.0
+    invalid_rate: float = 0.0
+    stream_chunk_chars: int = 48
+    seed: int | None = 0
+
+    @classmethod
+    def from_env(cls) -> "FakeProfile":
+        def number(name: str, default: float) -> float:
+            return float(os.environ.get(name, default))
+
+        seed = os.environ.get("DEBATE_FAKE_SEED", "0")
+        return cls(
+            latency_ms=number("DEBATE_FAKE_LATENCY_MS", cls.latency_ms),
+            latency_sigma=number("DEBATE_FAKE_LATENCY_SIGMA", cls.latency_sigma),
+            rate_limit_rate=number("DEBATE_FAKE_429_RATE", cls.rate_limit_rate),
+            unavailable_rate=number("DEBATE_FAKE_503_RATE", cls.unavailable_rate),
+            malformed_rate=number("DEBATE_FAKE_MALFORMED_RATE", cls.malformed_rate),
+            invalid_rate=number("DEBATE_FAKE_INVALID_RATE", cls.invalid_rate),
+            seed=int(seed) if seed.strip().lower() != "none" else None,
+        )
+
+
+class FakeLLMBackend:
+    """Offline `LLMBackend` returning schema-valid DebatePosition / JudgeAssessment.
+
+    Injected 429 / 503 errors are the SDK's own error types and malformed
+    bodies are cut-off JSON, so `GeminiLLM` retries, falls back and re-streams
+    exactly as it would against the real API.
+    """
+
+    name = "fake"
+
+    def __init__(self, profile: FakeProfile | None = None) -> None:
+        self.profile = profile or FakeProfile()
+        self._rng = random.Random(self.profile.seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = {"429": 0, "503": 0, "malformed": 0, "invalid": 0, "truncated": 0}
+        # Truncated answers by the partial text returned, for continuations.
+        self._truncated: collections.OrderedDict[str, str] = collections.OrderedDict()
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+
+    @classmethod
+    def from_env(cls) -> "FakeLLMBackend":
+        return cls(FakeProfile.from_env())
+
+    def _continuation(self, contents: str) -> tuple[str, str]:
+        """(partial, full) of the truncated answer quoted in a continuation prompt."""
+        for partial, full in reversed(self._truncated.items()):
+            if partial in contents:
+                return partial, full
+        raise ValueError("FakeLLMBackend got a continuation for no truncated answer")
+
+    def _plan(self, contents: str, config: types.GenerateContentConfig) -> _Plan:
+        """Draw latency, injected failure, response text and prompt token counts."""
+        profile = self.profile
+        system = str(config.system_instruction or "")
+        schema = None
+        if config.response_schema is not None:
+            schema_title = config.response_schema.get("title", "")
+            schema = _SCHEMAS.get(schema_title)
+            if schema is None:
+                raise ValueError(f"FakeLLMBackend cannot answer schema {schema_title!r}")
+        with self._lock:
+            self.calls += 1
+            latency = (
+                profile.latency_ms
+                * math.exp(self._rng.gauss(0.0, profile.latency_sigma))
+                / 1000
+            )
+            roll = self._rng.random()
+            failure = None
+            threshold = 0.0
+            for name, rate in (
+                ("429", profile.rate_limit_rate),
+                ("503", profile.unavailable_rate),
+                ("malformed", profile.malformed_rate),
+                ("invalid", profile.invalid_rate),
+            ):
+                threshold += rate
+                if roll < threshold:
+                    failure = name
+                    break
+            partial = ""
+            if schema is None:
+                # Plain-text continuation of an answer cut off at the token limit.
+                failure = failure if failure in ("429", "503") else None
+                partial, full = self._continuation(contents)
+                text = full[len(partial) :]
+            else:
+                requested = _REQUESTED_ARGUMENTS.search(contents)
+                payload = sample_output(
+                    schema, self._rng, int(requested.group(1)) if requested else None
+                )
+                if failure == "invalid":
+                    payload = invalidate_output(payload, self._rng)
+                text = json.dumps(payload, ensure_ascii=False)
+                if failure == "malformed":
+                    text = text[: len(text) // 2]
+            if failure is not None:
+                self.errors[failure] += 1
+            # Like the real API, stop at max_output_tokens (~4 characters each).
+            limit = (config.max_output_tokens or 0) * 4
+            truncated = failure is None and bool(limit) and len(text) > limit
+            if truncated:
+                # Remember the whole answer so a continuation can return the rest.
+                if schema is not None:
+                    full = text
+                self._truncated[partial + text[:limit]] = full
+                while len(self._truncated) > 256:
+                    self._truncated.popitem(last=False)
+                text = text[:limit]
+                self.errors["truncated"] += 1
+            prompt_tokens = (len(contents) + len(system)) // 4
+            self.prompt_tokens += prompt_tokens
+            if failure in (None, "malformed", "invalid"):
+                self.output_tokens += len(text) // 4
+        return _Plan(latency, failure, text, prompt_tokens, truncated)
+
+    @staticmethod
+    def _raise(failure: str | None) -> None:
+        if failure == "429":
+            raise errors.ClientError(
+                429,
+                {"error": {"message": "Fake quota exceeded", "status": "RESOURCE_EXHAUSTED"}},
+            )
+        if failure == "503":
+            raise errors.ServerError(
+                503, {"error": {"message": "Fake overload", "status": "UNAVAILABLE"}}
+            )
+
+    @staticmethod
+    def _response(
+        plan: _Plan,
+        chunk: str | None = None,
+        generated: str | None = None,
+        last: bool = True,
+    ) -> types.GenerateContentResponse:
+        # Like Gemini, stream chunks report usage for everything generated so far
+        # and only the final chunk carries the finish reason.
+        output_tokens = len(plan.text if generated is None else generated) // 4
+        finish_reason = None
+        if last:
+            finish_reason = (
+                types.FinishReason.MAX_TOKENS if plan.truncated else types.FinishReason.STOP
+            )
+        return types.GenerateContentResponse(
+            candidates=[
+                types.Candidate(
+                    content=types.Content(
+                        role="model",
+                        parts=[types.Part(text=plan.text if chunk is None else chunk)],
+                    ),
+                    finish_reason=finish_reason,
+                )
+            ],
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=plan.prompt_tokens,
+                candidates_token_count=output_tokens,
+                total_token_count=plan.prompt_tokens + output_tokens,
+            ),
+        )
+
+    def generate(
+        self, model: str, contents: str, config: types.GenerateContentConfig
+    ) -> types.GenerateContentResponse:
+        plan = self._plan(contents, config)
+        time.sleep(plan.latency)
+        self._raise(plan.failure)
+        return self._response(plan)
+
+    async def agenerate(
+        self, model: str, contents: str, config: types.GenerateContentConfig
+    ) -> types.GenerateContentResponse:
+        plan = self._plan(contents, config)
+        await asyncio.sleep(plan.latency)
+        self._raise(plan.failure)
+        return self._response(plan)
+
+    async def astream(
+        self, model: str, contents: str, config: types.GenerateContentConfig
+    ) -> AsyncIterator[types.GenerateContentResponse]:
+        plan = self._plan(contents, config)
+        text = plan.text
+        size = max(1, self.profile.stream_chunk_chars)
+        chunks = [text[i : i + size] for i in range(0, len(text), size)] or [""]
+
+        async def _stream() -> AsyncIterator[types.GenerateContentResponse]:
+            # A third of the latency before the first token, the rest spread out.
+            await asyncio.sleep(plan.latency / 3)
+            self._raise(plan.failure)
+            step = (plan.latency * 2 / 3) / len(chunks)
+            for index, chunk in enumerate(chunks, 1):
+                yield self._response(
+                    plan, chunk, text[: index * size], last=index == len(chunks)
+                )
+                await asyncio.sleep(step)
+
+        return _stream()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "errors": dict(self.errors),
+                "prompt_tokens": self.prompt_tokens,
+                "output_tokens": self.output_tokens,
+            }
@@ -1,13 +1,29 @@
 from __future__ import annotations
 
-import json
-from typing import Any, TypedDict
+from typing import Any, Literal, NotRequired, TypedDict
 
 from langgraph.graph import END, START, StateGraph
 
-from agent_debate.llm import GeminiLLM
-from agent_debate.prompts import CON_SYSTEM, JUDGE_SYSTEM, PRO_SYSTEM
-from agent_debate.schemas import DebatePosition, Verdict
+from agent_debate.budget import arguments_instruction, get_budget_planner
+from agent_debate.cache import get_cache
+from agent_debate.llm import GeminiLLM, get_backend
+from agent_debate.prompts import (
+    CON_SYSTEM,
+    JUDGE_SYSTEM,
+    PRO_SYSTEM,
+    JudgeEncoding,
+    JudgeFields,
+    judge_prompt,
+    user_prompt,
+)
+from agent_debate.rounds import (
+    REBUTTAL_MAX_TOKENS,
+    advance_round,
+    converged,
+    rebuttal_block,
+)
+from agent_debate.schemas import DebatePosition, JudgeAssessment
+from agent_debate.scoring import build_verdict
 
 
 class DebateState(TypedDict):
@@ -17,71 +33,165 @@ class DebateState(TypedDict):
     pro_arguments: list[dict[str, Any]]
     con_arguments: list[dict[str, Any]]
     verdict: dict[str, Any]
-
-
-def _user_prompt(decision: str, context: str) -> str:
-    parts = [f"Decision under consideration: {decision}"]
-    if context:
-        parts.append(f"Additional context: {context}")
-    return "\n".join(parts)
-
-
-def _judge_prompt(decision: str, context: str, pro: list[dict], con: list[dict]) -> str:
-    return (
-        f"Decision: {decision}\n"
-        f"Context: {context}\n\n"
-        f"PRO arguments:\n{json.dumps(pro, ensure_ascii=False, indent=2)}\n\n"
-        f"CON arguments:\n{json.dumps(con, ensure_ascii=False, indent=2)}"
+    cache: NotRequired[Literal["default", "bypass"]]
+    judge_encoding: NotRequired[JudgeEncoding]
+    judge_fields: NotRequired[JudgeFields]
+    # LLM backend name; None uses DEBATE_LLM_BACKEND.
+    backend: NotRequired[str | None]
+    # Rebuttal rounds: `round` is the one being argued, `rounds_history` holds
+    # the compact summaries each later round is prompted with.
+    rounds: NotRequired[int]
+    rebuttal_max_tokens: NotRequired[int]
+    round: NotRequired[int]
+    rounds_history: NotRequired[list[dict[str, Any]]]
+
+
+def initial_state(
+    decision: str,
+    context: str,
+    model: str,
+    cache: Literal["default", "bypass"] = "default",
+    judge_encoding: JudgeEncoding = "indented",
+    judge_fields: JudgeFields = "full",
+    backend: str | None = None,
+    rounds: int = 1,
+    rebuttal_max_tokens: int = REBUTTAL_MAX_TOKENS,
+) -> DebateState:
+    return {
+        "decision": decision,
+        "context": context,
+        "model": model,
+        "pro_arguments": [],
+        "con_arguments": [],
+        "verdict": {},
+        "cache": cache,
+        "judge_encoding": judge_encoding,
+        "judge_fields": judge_fields,
+        "backend": backend,
+        "rounds": rounds,
+        "rebuttal_max_tokens": rebuttal_max_tokens,
+        "round": 1,
+        "rounds_history": [],
+    }
+
+
+def debate_payload(state: DebateState) -> dict[str, Any]:
+    """The saved-result shape shared by `--save-json` and batch output."""
+    payload = {
+        "decision": state["decision"],
+        "context": state["context"],
+        "model": state["model"],
+        "pro_arguments": state["pro_arguments"],
+        "con_arguments": state["con_arguments"],
+        "verdict": state["verdict"],
+    }
+    if state.get("rounds", 1) > 1:
+        payload["rounds"] = state.get("rounds_history", [])
+    return payload
+
+
+def _llm(state: DebateState, stage: str) -> GeminiLLM:
+    return GeminiLLM(
+        model=state["model"],
+        cache=get_cache(),
+        cache_bypass=state.get("cache") == "bypass",
+        backend=get_backend(state.get("backend")),
+        stage=stage,
     )
 
 
-def pro_node(state: DebateState) -> dict[str, Any]:
-    llm = GeminiLLM(model=state["model"])
+def _advocate(state: DebateState, side: Literal["pro", "con"]) -> list[dict[str, Any]]:
+    user = user_prompt(state["decision"], state["context"])
+    cap = None
+    history = state.get("rounds_history") or []
+    if history:
+        # Later rounds see only last round's summaries, never the full history.
+        user += rebuttal_block(side, history[-1]["summaries"], state.get("round", 1))
+        cap = state.get("rebuttal_max_tokens", REBUTTAL_MAX_TOKENS)
+    planner = get_budget_planner()
+    budget = planner.advocate(state["decision"], state["context"], cap=cap)
+    llm = _llm(state, side)
     result: DebatePosition = llm.generate_structured(
-        system=PRO_SYSTEM,
-        user=_user_prompt(state["decision"], state["context"]),
+        system=PRO_SYSTEM if side == "pro" else CON_SYSTEM,
+        user=user + arguments_instruction(budget.arguments),
         schema=DebatePosition,
-        max_output_tokens=2200,
+        max_output_tokens=budget.max_output_tokens,
     )
-    return {"pro_arguments": [a.model_dump() for a in result.arguments]}
+    planner.observe("argument", "en", llm.last_call, len(result.arguments))
+    return [a.model_dump() for a in result.arguments]
+
+
+def pro_node(state: DebateState) -> dict[str, Any]:
+    return {"pro_arguments": _advocate(state, "pro")}
 
 
 def con_node(state: DebateState) -> dict[str, Any]:
-    llm = GeminiLLM(model=state["model"])
-    result: DebatePosition = llm.generate_structured(
-        system=CON_SYSTEM,
-        user=_user_prompt(state["decision"], state["context"]),
-        schema=DebatePosition,
-        max_output_tokens=2200,
+    return {"con_arguments": _advocate(state, "con")}
+
+
+def round_node(state: DebateState) -> dict[str, Any]:
+    history = list(state.get("rounds_history") or [])
+    number = state.get("round", 1)
+    entry = advance_round(
+        state["pro_arguments"],
+        state["con_arguments"],
+        history[-1]["summaries"] if history else None,
+        number,
     )
-    return {"con_arguments": [a.model_dump() for a in result.arguments]}
+    return {"rounds_history": [*history, entry], "round": number + 1}
 
 
 def judge_node(state: DebateState) -> dict[str, Any]:
-    llm = GeminiLLM(model=state["model"])
-    result: Verdict = llm.generate_structured(
+    llm = _llm(state, "judge")
+    planner = get_budget_planner()
+    result: JudgeAssessment = llm.generate_structured(
         system=JUDGE_SYSTEM,
-        user=_judge_prompt(
+        user=judge_prompt(
             state["decision"],
             state["context"],
             state["pro_arguments"],
             state["con_arguments"],
+            state.get("judge_encoding", "indented"),
+            state.get("judge_fields", "full"),
         ),
-        schema=Verdict,
-        max_output_tokens=2800,
+        schema=JudgeAssessment,
+        max_output_tokens=planner.judge().max_output_tokens,
     )
-    return {"verdict": result.model_dump()}
+    planner.observe("judge", "en", llm.last_call)
+    return {"verdict": build_verdict(result).model_dump()}
 
 
-def build_graph() -> StateGraph:
+def build_graph(parallel: bool = True) -> StateGraph:
     graph = StateGraph(DebateState)
     graph.add_node("pro", pro_node)
     graph.add_node("con", con_node)
+    graph.add_node("round", round_node)
     graph.add_node("judge", judge_node)
 
-    graph.add_edge(START, "pro")
-    graph.add_edge("pro", "con")
-    graph.add_edge("con", "judge")
+    def after_advocates(state: DebateState) -> str:
+        # A single-round debate has nothing to summarise: judge right away.
+        return "round" if state.get("rounds", 1) > 1 else "judge"
+
+    def next_step(state: DebateState) -> str | list[str]:
+        # Judge after the last round, or earlier once both sides stop moving.
+        if state["round"] > state.get("rounds", 1) or converged(
+            state["rounds_history"][-1]
+        ):
+            return "judge"
+        return ["pro", "con"] if parallel else "pro"
+
+    if parallel:
+        # Fan out: PRO and CON run in the same superstep and both route to the
+        # same next node, which therefore runs once, after both are done.
+        graph.add_edge(START, "pro")
+        graph.add_edge(START, "con")
+        graph.add_conditional_edges("pro", after_advocates, ["round", "judge"])
+        graph.add_conditional_edges("con", after_advocates, ["round", "judge"])
+    else:
+        graph.add_edge(START, "pro")
+        graph.add_edge("pro", "con")
+        graph.add_conditional_edges("con", after_advocates, ["round", "judge"])
+    graph.add_conditional_edges("round", next_step, ["pro", "con", "judge"])
     graph.add_edge("judge", END)
 
     return graph.compile()
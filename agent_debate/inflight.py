@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, AsyncIterator, Callable
+
+
+class InFlightRun:
+    """One running event pipeline that any number of subscribers can follow.
+
+    Events are kept for the lifetime of the run, so a late subscriber first
+    replays everything emitted so far and then continues live.
+    """
+
+    def __init__(
+        self,
+        source: AsyncIterator[dict[str, Any]],
+        on_cancel: Callable[[], None] | None = None,
+    ) -> None:
+        self.events: list[dict[str, Any]] = []
+        self.done = False
+        self.cancelled = False
+        self.subscribers = 0
+        self._on_cancel = on_cancel
+        self._changed = asyncio.Condition()
+        self.task = asyncio.create_task(self._pump(source))
+
+    async def _pump(self, source: AsyncIterator[dict[str, Any]]) -> None:
+        try:
+            async for event in source:
+                async with self._changed:
+                    self.events.append(event)
+                    self._changed.notify_all()
+        finally:
+            async with self._changed:
+                self.done = True
+                self._changed.notify_all()
+
+    async def subscribe(self) -> AsyncIterator[dict[str, Any]]:
+        self.subscribers += 1
+        try:
+            position = 0
+            while True:
+                async with self._changed:
+                    await self._changed.wait_for(
+                        lambda: position < len(self.events) or self.done
+                    )
+                    batch = self.events[position:]
+                    finished = self.done
+                for event in batch:
+                    yield event
+                position += len(batch)
+                if finished and position >= len(self.events):
+                    return
+        finally:
+            self.subscribers -= 1
+            if self.subscribers == 0 and not self.done:
+                # Every client went away: stop the remaining stages.
+                self.cancel()
+
+    def cancel(self) -> None:
+        if self.cancelled or self.done:
+            return
+        self.cancelled = True
+        if self._on_cancel is not None:
+            self._on_cancel()
+        self.task.cancel()
+
+
+class SingleFlight:
+    """Coalesce identical concurrent pipelines into one shared run."""
+
+    def __init__(self) -> None:
+        self._runs: dict[str, InFlightRun] = {}
+        self.started = 0
+        self.coalesced = 0
+        self.cancelled = 0
+
+    def get(self, key: str) -> InFlightRun | None:
+        """The live run for `key`, if one would be joined."""
+        run = self._runs.get(key)
+        return run if run is not None and not run.done and not run.cancelled else None
+
+    def join(
+        self,
+        key: str,
+        source: Callable[[], AsyncIterator[dict[str, Any]]],
+        on_cancel: Callable[[], None] | None = None,
+    ) -> InFlightRun:
+        """Return the in-flight run for `key`, starting it from `source()` if needed."""
+        run = self.get(key)
+        if run is not None:
+            self.coalesced += 1
+            return run
+
+        run = InFlightRun(source(), on_cancel=on_cancel)
+        self._runs[key] = run
+        self.started += 1
+
+        def _forget(_: asyncio.Task) -> None:
+            if run.cancelled:
+                self.cancelled += 1
+            if self._runs.get(key) is run:
+                del self._runs[key]
+
+        run.task.add_done_callback(_forget)
+        return run
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "in_flight": len(self._runs),
+            "started": self.started,
+            "coalesced": self.coalesced,
+            "cancelled": self.cancelled,
+        }
@@ -1,14 +1,29 @@
 from __future__ import annotations
 
+import asyncio
+import collections
+import contextlib
+import functools
 import json
+import os
 import random
+import threading
 import time
-from typing import Any, Type
+from typing import Any, AsyncIterator, Callable, Iterator, Protocol, Type
 
 from google import genai
 from google.genai import types
 from pydantic import BaseModel, ValidationError
 
+from agent_debate.cache import ResultCache, cache_key
+from agent_debate.repair import REPAIR_SYSTEM, repair_locally, repair_mode, repair_prompt
+from agent_debate.resilience import (
+    CircuitBreaker,
+    get_circuit_breaker,
+    get_rate_limiter,
+)
+from agent_debate.telemetry import CallTelemetry, record_call
+
 
 def _sanitize_response_schema(value: Any) -> Any:
     """Remove JSON Schema keys unsupported by Gemini response_schema."""
@@ -32,11 +47,126 @@ def _sanitize_response_schema(value: Any) -> Any:
     return value
 
 
+@functools.lru_cache(maxsize=None)
 def _gemini_response_schema(schema: Type[BaseModel]) -> dict[str, Any]:
-    """Build a Gemini-compatible schema from a Pydantic model."""
+    """Build a Gemini-compatible schema from a Pydantic model (cached per schema)."""
     return _sanitize_response_schema(schema.model_json_schema())
 
 
+@functools.lru_cache(maxsize=256)
+def _generate_config(
+    schema: Type[BaseModel],
+    system: str,
+    temperature: float,
+    max_output_tokens: int,
+) -> types.GenerateContentConfig:
+    """Build (once) the request config for a schema/prompt/sampling combination."""
+    return types.GenerateContentConfig(
+        system_instruction=system,
+        response_mime_type="application/json",
+        # Pydantic's extra='forbid' emits `additionalProperties`, which Gemini
+        # currently rejects in response_schema. We still validate strictly after.
+        response_schema=_gemini_response_schema(schema),
+        temperature=temperature,
+        max_output_tokens=max_output_tokens,
+    )
+
+
+_client: genai.Client | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> genai.Client:
+    """Return the process-wide Gemini client, creating it on first use.
+
+    A single client keeps one HTTP connection pool, so repeated calls reuse
+    open TLS connections instead of handshaking per agent.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = genai.Client()
+    return _client
+
+
+class LLMBackend(Protocol):
+    """A single provider call with no retries; `GeminiLLM` layers resilience on top.
+
+    Responses only need `.text` (and optionally `.parsed` / `.usage_metadata`),
+    like the SDK's `GenerateContentResponse`.
+    """
+
+    name: str
+
+    def generate(
+        self, model: str, contents: str, config: types.GenerateContentConfig
+    ) -> Any: ...
+
+    async def agenerate(
+        self, model: str, contents: str, config: types.GenerateContentConfig
+    ) -> Any: ...
+
+    async def astream(
+        self, model: str, contents: str, config: types.GenerateContentConfig
+    ) -> AsyncIterator[Any]: ...
+
+
+class GeminiBackend:
+    """`LLMBackend` over the google-genai client."""
+
+    name = "gemini"
+
+    def __init__(self, client: genai.Client | None = None) -> None:
+        self.client = client if client is not None else get_client()
+
+    def generate(
+        self, model: str, contents: str, config: types.GenerateContentConfig
+    ) -> Any:
+        return self.client.models.generate_content(
+            model=model, contents=contents, config=config
+        )
+
+    async def agenerate(
+        self, model: str, contents: str, config: types.GenerateContentConfig
+    ) -> Any:
+        return await self.client.aio.models.generate_content(
+            model=model, contents=contents, config=config
+        )
+
+    async def astream(
+        self, model: str, contents: str, config: types.GenerateContentConfig
+    ) -> AsyncIterator[Any]:
+        return await self.client.aio.models.generate_content_stream(
+            model=model, contents=contents, config=config
+        )
+
+
+LLM_BACKENDS = ("gemini", "fake")
+_fake_backend: LLMBackend | None = None
+
+
+def get_backend(name: str | None = None) -> LLMBackend:
+    """Backend by name, defaulting to DEBATE_LLM_BACKEND (gemini | fake).
+
+    The fake backend is process-wide so its seeded randomness and counters
+    span every call.
+    """
+    global _fake_backend
+    name = (name or os.environ.get("DEBATE_LLM_BACKEND", "gemini")).strip().lower()
+    if name == "gemini":
+        return GeminiBackend()
+    if name == "fake":
+        if _fake_backend is None:
+            from agent_debate.fake import FakeLLMBackend
+
+            with _client_lock:
+                if _fake_backend is None:
+                    _fake_backend = FakeLLMBackend.from_env()
+        return _fake_backend
+    raise ValueError(f"Unknown LLM backend: {name!r} (expected one of {LLM_BACKENDS})")
+
+
 def _parse_jsonish(text: str) -> dict[str, Any]:
     """Parse JSON-ish output, including double-encoded JSON strings."""
     text = text.strip()
@@ -72,6 +202,59 @@ def _parse_jsonish(text: str) -> dict[str, Any]:
     raise ValueError(f"Cannot parse JSON from model output: {text[:300]!r}")
 
 
+class _StreamingItemParser:
+    """Incrementally pull complete objects out of a streamed JSON response.
+
+    Tracks nesting over raw text chunks and returns each object that closes
+    directly inside an array of the top-level object, e.g. every element of
+    `{"arguments": [{...}, {...}]}` as soon as its closing brace arrives.
+    """
+
+    def __init__(self) -> None:
+        self.text = ""
+        self._pos = 0
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._item_start: int | None = None
+
+    def feed(self, chunk: str) -> list[dict[str, Any]]:
+        self.text += chunk
+        items: list[dict[str, Any]] = []
+        while self._pos < len(self.text):
+            ch = self.text[self._pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                if ch == "{" and self._stack == ["{", "["]:
+                    self._item_start = self._pos
+                self._stack.append(ch)
+            elif ch in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if (
+                    ch == "}"
+                    and self._stack == ["{", "["]
+                    and self._item_start is not None
+                ):
+                    try:
+                        item = json.loads(self.text[self._item_start : self._pos + 1])
+                    except json.JSONDecodeError:
+                        item = None
+                    if isinstance(item, dict):
+                        items.append(item)
+                    self._item_start = None
+            self._pos += 1
+        return items
+
+
 def _is_transient_gemini_error(exc: Exception) -> bool:
     """Heuristic check for transient Gemini/API overload or rate-limit errors."""
     text = str(exc).upper()
@@ -114,10 +297,506 @@ def _fallback_model_candidates(primary_model: str) -> list[str]:
     return deduped
 
 
+def _response_data(response: Any) -> Any:
+    """The JSON payload of a generate_content response, not yet validated."""
+    # Newer SDK versions may expose `.parsed`; validate through our strict model
+    # either way to keep behavior consistent.
+    if hasattr(response, "parsed") and response.parsed is not None:
+        parsed = response.parsed
+        if isinstance(parsed, BaseModel):
+            return parsed.model_dump()
+        if isinstance(parsed, dict):
+            return parsed
+
+    text = getattr(response, "text", None)
+    if not text:
+        raise ValueError("Model returned no text and no parsed structured output.")
+
+    return _parse_jsonish(text)
+
+
+def _is_truncated(response: Any) -> bool:
+    """Whether generation stopped at max_output_tokens rather than finishing."""
+    candidates = getattr(response, "candidates", None) or []
+    if not candidates:
+        return False
+    reason = getattr(candidates[0], "finish_reason", None)
+    return reason is not None and str(getattr(reason, "value", reason)) == "MAX_TOKENS"
+
+
+def _continuation_prompt(user: str, partial: str) -> str:
+    return (
+        f"{user}\n\n"
+        "Your previous answer was cut off at the output limit:\n"
+        f"{partial}\n\n"
+        "Continue exactly where it stops. Output only the missing remainder "
+        "of the JSON, without repeating anything."
+    )
+
+
+def _continuation_config(config: types.GenerateContentConfig) -> types.GenerateContentConfig:
+    # Plain text: a JSON-mode reply would start a new object instead of continuing.
+    return types.GenerateContentConfig(
+        system_instruction=config.system_instruction,
+        response_mime_type="text/plain",
+        temperature=config.temperature,
+        max_output_tokens=config.max_output_tokens,
+    )
+
+
+def _structured_from_response(response: Any, schema: Type[BaseModel]) -> BaseModel:
+    """Validate a generate_content response against the strict schema."""
+    return schema.model_validate(_response_data(response))
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with small jitter for overload spikes."""
+    return (0.8 * (2 ** (attempt - 1))) + random.uniform(0, 0.35)
+
+
+def _exhausted_error(
+    last_error: Exception | None, tried_models: list[str], candidates: list[str]
+) -> Exception:
+    """Error to raise once every model in the fallback chain has failed."""
+    if last_error is None:
+        # Every candidate was skipped by an open circuit breaker.
+        return RuntimeError(
+            f"Gemini models are temporarily unavailable or overloaded: "
+            f"{', '.join(candidates)}. "
+            "Please retry in 30-60 seconds."
+        )
+    if _is_transient_gemini_error(last_error):
+        error = RuntimeError(
+            f"Gemini models are temporarily unavailable or overloaded after trying: "
+            f"{', '.join(tried_models)}. "
+            "Please retry in 30-60 seconds."
+        )
+        error.__cause__ = last_error
+        return error
+    return last_error
+
+
+def _estimate_tokens(system: str, user: str, max_output_tokens: int) -> int:
+    """Rough upper bound of tokens a call consumes, for tokens/min limiting."""
+    return (len(system) + len(user)) // 4 + max_output_tokens
+
+
+def _record_outcome(breaker: CircuitBreaker, exc: Exception | None) -> None:
+    # Only overload/availability errors count against model health; a malformed
+    # answer still proves the model is up.
+    if exc is not None and _is_transient_gemini_error(exc):
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+
+@contextlib.contextmanager
+def _releasing_probe(breaker: CircuitBreaker) -> Iterator[None]:
+    """Give `breaker`'s half-open probe back if the call ends without an outcome.
+
+    Covers cancellation anywhere after `allow()`, including the rate-limit
+    wait and `asyncio.CancelledError`, which `except Exception` does not see.
+    """
+    try:
+        yield
+    except BaseException:
+        breaker.release()
+        raise
+
+
+MAX_ATTEMPTS_PER_MODEL = 3
+# Follow-up calls that extend a generation cut off at max_output_tokens.
+MAX_CONTINUATIONS = 2
+
+
+class OperationCancelled(Exception):
+    """Raised when an LLM call is abandoned through its CancellationToken."""
+
+
+class CancellationToken:
+    """Thread-safe cancel flag shared by every LLM call of one debate.
+
+    The sync path checks it before each attempt and sleeps on it during
+    backoff, so cancelling also wakes a retry that is waiting; the async path
+    checks it before each attempt on top of regular task cancellation.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise OperationCancelled("LLM call cancelled.")
+
+    def sleep(self, seconds: float) -> None:
+        if self._event.wait(seconds):
+            raise OperationCancelled("LLM call cancelled.")
+
+
+# LLM calls abandoned mid-way (pending retries and fallback models included).
+cancellation_stats = {"calls_cancelled": 0}
+
+
+@contextlib.contextmanager
+def _counting_cancellation() -> Iterator[None]:
+    try:
+        yield
+    except (asyncio.CancelledError, OperationCancelled):
+        cancellation_stats["calls_cancelled"] += 1
+        raise
+
+
+class HedgePolicy:
+    """When to duplicate a slow first attempt onto the next fallback model.
+
+    The delay is the observed `percentile` latency of successful primary calls
+    once `min_samples` have been seen, and `after_seconds` until then. One
+    policy per stage keeps judge and advocate latencies apart.
+    """
+
+    def __init__(
+        self,
+        after_seconds: float | None = None,
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        window: int = 200,
+    ) -> None:
+        self.after_seconds = after_seconds
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self._samples: collections.deque[float] = collections.deque(maxlen=window)
+        self.fired = 0
+        self.won = 0
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def delay(self) -> float | None:
+        if len(self._samples) < self.min_samples:
+            return self.after_seconds
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return ordered[index]
+
+    def snapshot(self) -> dict[str, Any]:
+        delay = self.delay()
+        return {
+            "delay_seconds": round(delay, 3) if delay is not None else None,
+            "samples": len(self._samples),
+            "fired": self.fired,
+            "won": self.won,
+        }
+
+
 class GeminiLLM:
-    def __init__(self, model: str = "gemini-3-flash-preview") -> None:
+    def __init__(
+        self,
+        model: str = "gemini-3-flash-preview",
+        client: genai.Client | None = None,
+        cache: ResultCache | None = None,
+        cache_bypass: bool = False,
+        cancel_token: CancellationToken | None = None,
+        hedge: HedgePolicy | None = None,
+        backend: LLMBackend | None = None,
+        stage: str = "unknown",
+    ) -> None:
         self.model = model
-        self.client = genai.Client()
+        # Telemetry label for this instance's calls.
+        self.stage = stage
+        if backend is None:
+            backend = GeminiBackend(client) if client is not None else get_backend()
+        self.backend = backend
+        # With `cache_bypass` we skip lookups but still store the fresh result.
+        self.cache = cache
+        self.cache_bypass = cache_bypass
+        self.cancel_token = cancel_token
+        # Async path only: threads cannot cancel the losing request.
+        self.hedge = hedge
+        # Telemetry of the most recent call, for callers that learn from usage.
+        self.last_call: CallTelemetry | None = None
+
+    def _raise_if_cancelled(self) -> None:
+        if self.cancel_token is not None:
+            self.cancel_token.raise_if_cancelled()
+
+    def _sleep(self, seconds: float) -> None:
+        if self.cancel_token is None:
+            time.sleep(seconds)
+        else:
+            self.cancel_token.sleep(seconds)
+
+    @contextlib.contextmanager
+    def _track(
+        self, max_output_tokens: int, streamed: bool = False
+    ) -> Iterator[CallTelemetry]:
+        call = CallTelemetry(
+            requested_model=self.model,
+            stage=self.stage,
+            streamed=streamed,
+            max_output_tokens=max_output_tokens,
+        )
+        self.last_call = call
+        started = time.perf_counter()
+        try:
+            yield call
+        except BaseException as exc:
+            cancelled = isinstance(exc, (asyncio.CancelledError, OperationCancelled))
+            call.outcome = "cancelled" if cancelled else "error"
+            raise
+        finally:
+            call.total_seconds = time.perf_counter() - started
+            record_call(call)
+
+    def _resource(self, model_id: str) -> str:
+        """Breaker / limiter / cache namespace, so a fake never trips real models."""
+        if self.backend.name == "gemini":
+            return model_id
+        return f"{self.backend.name}:{model_id}"
+
+    def _cache_key(
+        self,
+        system: str,
+        user: str,
+        schema: Type[BaseModel],
+        temperature: float,
+    ) -> str | None:
+        if self.cache is None:
+            return None
+        return cache_key(
+            model=self._resource(self.model),
+            system=system,
+            user=user,
+            schema=schema,
+            temperature=temperature,
+        )
+
+    def _cache_get(self, key: str | None, schema: Type[BaseModel]) -> BaseModel | None:
+        if key is None or self.cache_bypass:
+            return None
+        cached = self.cache.get(key)
+        if cached is None:
+            return None
+        try:
+            return schema.model_validate(cached)
+        except ValidationError:
+            return None
+
+    def _cache_set(self, key: str | None, result: BaseModel) -> BaseModel:
+        if key is not None:
+            self.cache.set(key, result.model_dump())
+        return result
+
+    def _continue(
+        self,
+        call: CallTelemetry,
+        model_id: str,
+        user: str,
+        config: types.GenerateContentConfig,
+        text: str,
+    ) -> str:
+        """Extend a truncated generation instead of regenerating it from scratch."""
+        continuation = _continuation_config(config)
+        limiter = get_rate_limiter(self._resource(model_id))
+        for _ in range(MAX_CONTINUATIONS):
+            prompt = _continuation_prompt(user, text)
+            wait = limiter.reserve(len(prompt) // 4 + (config.max_output_tokens or 0))
+            call.queue_seconds += wait
+            self._sleep(wait)
+            call.continuations += 1
+            with call.provider_time():
+                response = self.backend.generate(model_id, prompt, continuation)
+            call.add_usage(response)
+            text += getattr(response, "text", None) or ""
+            if not _is_truncated(response):
+                break
+            call.truncations += 1
+        return text
+
+    async def _acontinue(
+        self,
+        call: CallTelemetry,
+        model_id: str,
+        user: str,
+        config: types.GenerateContentConfig,
+        text: str,
+    ) -> str:
+        """Async twin of `_continue`."""
+        continuation = _continuation_config(config)
+        limiter = get_rate_limiter(self._resource(model_id))
+        for _ in range(MAX_CONTINUATIONS):
+            prompt = _continuation_prompt(user, text)
+            wait = limiter.reserve(len(prompt) // 4 + (config.max_output_tokens or 0))
+            call.queue_seconds += wait
+            if wait > 0:
+                await asyncio.sleep(wait)
+            call.continuations += 1
+            with call.provider_time():
+                response = await self.backend.agenerate(model_id, prompt, continuation)
+            call.add_usage(response)
+            text += getattr(response, "text", None) or ""
+            if not _is_truncated(response):
+                break
+            call.truncations += 1
+        return text
+
+    def _payload(
+        self,
+        call: CallTelemetry,
+        response: Any,
+        model_id: str,
+        user: str,
+        config: types.GenerateContentConfig,
+    ) -> Any:
+        if not _is_truncated(response):
+            return _response_data(response)
+        call.truncations += 1
+        text = getattr(response, "text", None) or ""
+        return _parse_jsonish(self._continue(call, model_id, user, config, text))
+
+    async def _apayload(
+        self,
+        call: CallTelemetry,
+        response: Any,
+        model_id: str,
+        user: str,
+        config: types.GenerateContentConfig,
+    ) -> Any:
+        if not _is_truncated(response):
+            return _response_data(response)
+        call.truncations += 1
+        text = getattr(response, "text", None) or ""
+        return _parse_jsonish(await self._acontinue(call, model_id, user, config, text))
+
+    def _repair_locally(
+        self, call: CallTelemetry, data: Any, schema: Type[BaseModel]
+    ) -> BaseModel | None:
+        if repair_mode() == "off":
+            return None
+        result = repair_locally(data, schema)
+        if result is not None:
+            call.validation_failures += 1
+            call.local_repairs += 1
+        return result
+
+    def _repair_request(
+        self,
+        data: Any,
+        error: ValidationError,
+        schema: Type[BaseModel],
+        config: types.GenerateContentConfig,
+    ) -> tuple[str, types.GenerateContentConfig, int] | None:
+        """Prompt, config and token estimate for a model repair, if enabled."""
+        if repair_mode() != "full" or not isinstance(data, dict):
+            return None
+        user = repair_prompt(data, error)
+        max_output_tokens = config.max_output_tokens or 1400
+        repair_config = _generate_config(schema, REPAIR_SYSTEM, 0.0, max_output_tokens)
+        return user, repair_config, _estimate_tokens(REPAIR_SYSTEM, user, max_output_tokens)
+
+    def _validated(
+        self,
+        call: CallTelemetry,
+        data: Any,
+        schema: Type[BaseModel],
+        model_id: str,
+        config: types.GenerateContentConfig,
+    ) -> BaseModel:
+        """Validate `data`, repairing it before falling back to a full regeneration.
+
+        Local fixes come first; if they are not enough, one short prompt with
+        only the validation errors and the rejected JSON asks the model to fix
+        it. If that fails too, the original error is raised for the retry ladder.
+        """
+        try:
+            return schema.model_validate(data)
+        except ValidationError as exc:
+            result = self._repair_locally(call, data, schema)
+            if result is not None:
+                return result
+            request = self._repair_request(data, exc, schema, config)
+            if request is None:
+                raise
+            user, repair_config, tokens = request
+            breaker = get_circuit_breaker(self._resource(model_id))
+            if not breaker.allow():
+                raise
+            try:
+                with _releasing_probe(breaker):
+                    wait = get_rate_limiter(self._resource(model_id)).reserve(tokens)
+                    call.queue_seconds += wait
+                    self._sleep(wait)
+                    call.attempts += 1
+                    try:
+                        with call.provider_time():
+                            response = self.backend.generate(
+                                model_id, user, repair_config
+                            )
+                    except Exception as repair_exc:
+                        _record_outcome(breaker, repair_exc)
+                        raise
+                breaker.record_success()
+                call.add_usage(response)
+                result = _structured_from_response(response, schema)
+            except OperationCancelled:
+                raise
+            except Exception:  # noqa: BLE001 - fall back to a full regeneration
+                raise exc from None
+            call.validation_failures += 1
+            call.prompt_repairs += 1
+            return result
+
+    async def _avalidated(
+        self,
+        call: CallTelemetry,
+        data: Any,
+        schema: Type[BaseModel],
+        model_id: str,
+        config: types.GenerateContentConfig,
+    ) -> BaseModel:
+        """Async twin of `_validated`."""
+        try:
+            return schema.model_validate(data)
+        except ValidationError as exc:
+            result = self._repair_locally(call, data, schema)
+            if result is not None:
+                return result
+            request = self._repair_request(data, exc, schema, config)
+            if request is None:
+                raise
+            user, repair_config, tokens = request
+            breaker = get_circuit_breaker(self._resource(model_id))
+            if not breaker.allow():
+                raise
+            try:
+                with _releasing_probe(breaker):
+                    wait = get_rate_limiter(self._resource(model_id)).reserve(tokens)
+                    call.queue_seconds += wait
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    call.attempts += 1
+                    try:
+                        with call.provider_time():
+                            response = await self.backend.agenerate(
+                                model_id, user, repair_config
+                            )
+                    except Exception as repair_exc:
+                        _record_outcome(breaker, repair_exc)
+                        raise
+                breaker.record_success()
+                call.add_usage(response)
+                result = _structured_from_response(response, schema)
+            except Exception:  # noqa: BLE001 - fall back to a full regeneration
+                raise exc from None
+            call.validation_failures += 1
+            call.prompt_repairs += 1
+            return result
 
     def generate_structured(
         self,
@@ -127,71 +806,366 @@ class GeminiLLM:
         temperature: float = 0.2,
         max_output_tokens: int = 1400,
     ) -> BaseModel:
-        config = types.GenerateContentConfig(
-            system_instruction=system,
-            response_mime_type="application/json",
-            # Pydantic's extra='forbid' emits `additionalProperties`, which Gemini
-            # currently rejects in response_schema. We still validate strictly after.
-            response_schema=_gemini_response_schema(schema),
-            temperature=temperature,
-            max_output_tokens=max_output_tokens,
-        )
+        with self._track(max_output_tokens) as call:
+            return self._generate(
+                call, system, user, schema, temperature, max_output_tokens
+            )
+
+    def _generate(
+        self,
+        call: CallTelemetry,
+        system: str,
+        user: str,
+        schema: Type[BaseModel],
+        temperature: float,
+        max_output_tokens: int,
+    ) -> BaseModel:
+        key = self._cache_key(system, user, schema, temperature)
+        cached = self._cache_get(key, schema)
+        if cached is not None:
+            call.cache_hit = True
+            return cached
+        config = _generate_config(schema, system, temperature, max_output_tokens)
 
-        max_attempts_per_model = 3
         tried_models: list[str] = []
         last_error: Exception | None = None
 
-        for model_id in _fallback_model_candidates(self.model):
-            tried_models.append(model_id)
-            for attempt in range(1, max_attempts_per_model + 1):
-                try:
-                    response = self.client.models.generate_content(
-                        model=model_id,
-                        contents=user,
-                        config=config,
-                    )
-
-                    # Newer SDK versions may expose `.parsed`; validate through our strict model
-                    # either way to keep behavior consistent.
-                    if hasattr(response, "parsed") and response.parsed is not None:
-                        parsed = response.parsed
-                        if isinstance(parsed, BaseModel):
-                            return schema.model_validate(parsed.model_dump())
-                        if isinstance(parsed, dict):
-                            return schema.model_validate(parsed)
-
-                    text = getattr(response, "text", None)
-                    if not text:
-                        raise ValueError(
-                            "Model returned no text and no parsed structured output."
-                        )
-
-                    data = _parse_jsonish(text)
-                    return schema.model_validate(data)
-                except Exception as exc:  # noqa: BLE001 - wrapper converts provider errors
-                    last_error = exc
-                    is_transient = _is_transient_gemini_error(exc)
-                    is_retryable_output = _is_retryable_output_error(exc)
-                    if not is_transient and not is_retryable_output:
-                        raise
+        candidates = _fallback_model_candidates(self.model)
+        tokens = _estimate_tokens(system, user, max_output_tokens)
 
-                    if attempt < max_attempts_per_model:
-                        # Exponential backoff with small jitter for overload spikes.
-                        delay = (0.8 * (2 ** (attempt - 1))) + random.uniform(
-                            0, 0.35
-                        )
-                        time.sleep(delay)
-                        continue
+        with _counting_cancellation():
+            for model_id in candidates:
+                breaker = get_circuit_breaker(self._resource(model_id))
+                limiter = get_rate_limiter(self._resource(model_id))
+                for attempt in range(1, MAX_ATTEMPTS_PER_MODEL + 1):
+                    self._raise_if_cancelled()
+                    if not breaker.allow():
+                        # Unhealthy model: go straight to the next fallback.
+                        break
+                    if model_id not in tried_models:
+                        tried_models.append(model_id)
+                    with _releasing_probe(breaker):
+                        wait = limiter.reserve(tokens)
+                        call.queue_seconds += wait
+                        self._sleep(wait)
+                        call.attempts += 1
+                        try:
+                            with call.provider_time():
+                                response = self.backend.generate(model_id, user, config)
+                            call.add_usage(response)
+                            breaker.record_success()
+                            result = self._validated(
+                                call,
+                                self._payload(call, response, model_id, user, config),
+                                schema,
+                                model_id,
+                                config,
+                            )
+                            call.model = model_id
+                            return self._cache_set(key, result)
+                        except Exception as exc:  # noqa: BLE001 - wrapper converts provider errors
+                            _record_outcome(breaker, exc)
+                            last_error = exc
+                            is_transient = _is_transient_gemini_error(exc)
+                            is_retryable_output = _is_retryable_output_error(exc)
+                            if is_retryable_output:
+                                call.validation_failures += 1
+                            if not is_transient and not is_retryable_output:
+                                raise
+
+                            if attempt < MAX_ATTEMPTS_PER_MODEL:
+                                delay = _backoff_delay(attempt)
+                                call.backoff_seconds += delay
+                                self._sleep(delay)
+                                continue
+
+                            # Final retryable failure for this model:
+                            # try next fallback model if available.
+                            break
+
+        raise _exhausted_error(last_error, tried_models, candidates)
+
+    async def agenerate_structured(
+        self,
+        system: str,
+        user: str,
+        schema: Type[BaseModel],
+        temperature: float = 0.2,
+        max_output_tokens: int = 1400,
+    ) -> BaseModel:
+        """Async twin of `generate_structured` on the SDK's aio client.
+
+        Backoff uses `asyncio.sleep`, so a retrying call holds no thread and the
+        event loop can carry many debates concurrently.
+        """
+        with self._track(max_output_tokens) as call:
+            return await self._agenerate(
+                call, system, user, schema, temperature, max_output_tokens
+            )
+
+    async def _agenerate(
+        self,
+        call: CallTelemetry,
+        system: str,
+        user: str,
+        schema: Type[BaseModel],
+        temperature: float,
+        max_output_tokens: int,
+    ) -> BaseModel:
+        key = self._cache_key(system, user, schema, temperature)
+        cached = self._cache_get(key, schema)
+        if cached is not None:
+            call.cache_hit = True
+            return cached
+        config = _generate_config(schema, system, temperature, max_output_tokens)
+
+        tried_models: list[str] = []
+        last_error: Exception | None = None
+
+        candidates = _fallback_model_candidates(self.model)
+        tokens = _estimate_tokens(system, user, max_output_tokens)
+        # With a hedge policy, the first primary attempt is raced against the next
+        # fallback model once it runs past the policy's latency threshold.
+        hedge_model = candidates[1] if self.hedge is not None and len(candidates) > 1 else None
+
+        with _counting_cancellation():
+            for model_id in candidates:
+                breaker = get_circuit_breaker(self._resource(model_id))
+                for attempt in range(1, MAX_ATTEMPTS_PER_MODEL + 1):
+                    self._raise_if_cancelled()
+                    if not breaker.allow():
+                        break
+                    if model_id not in tried_models:
+                        tried_models.append(model_id)
+                    try:
+                        with _releasing_probe(breaker):
+                            if attempt == 1 and model_id == self.model and hedge_model:
+                                result = await self._ahedged_call(
+                                    model_id, hedge_model, user, config, schema, tokens, call
+                                )
+                            else:
+                                result = await self._acall_once(
+                                    model_id, user, config, schema, tokens, call
+                                )
+                        return self._cache_set(key, result)
+                    except Exception as exc:  # noqa: BLE001 - wrapper converts provider errors
+                        last_error = exc
+                        is_transient = _is_transient_gemini_error(exc)
+                        is_retryable_output = _is_retryable_output_error(exc)
+                        if is_retryable_output:
+                            call.validation_failures += 1
+                        if not is_transient and not is_retryable_output:
+                            raise
+
+                        if attempt < MAX_ATTEMPTS_PER_MODEL:
+                            delay = _backoff_delay(attempt)
+                            call.backoff_seconds += delay
+                            await asyncio.sleep(delay)
+                            continue
+                        break
+
+        raise _exhausted_error(last_error, tried_models, candidates)
+
+    async def _acall_once(
+        self,
+        model_id: str,
+        user: str,
+        config: types.GenerateContentConfig,
+        schema: Type[BaseModel],
+        tokens: int,
+        call: CallTelemetry,
+    ) -> BaseModel:
+        """One rate-limited, breaker-tracked, schema-validated async call."""
+        breaker = get_circuit_breaker(self._resource(model_id))
+        # The hedge's losing call is cancelled in here, out of the caller's sight.
+        with _releasing_probe(breaker):
+            wait = get_rate_limiter(self._resource(model_id)).reserve(tokens)
+            call.queue_seconds += wait
+            if wait > 0:
+                await asyncio.sleep(wait)
+            call.attempts += 1
+            started = time.monotonic()
+            try:
+                with call.provider_time():
+                    response = await self.backend.agenerate(model_id, user, config)
+            except Exception as exc:
+                _record_outcome(breaker, exc)
+                raise
+        breaker.record_success()
+        call.add_usage(response)
+        result = await self._avalidated(
+            call,
+            await self._apayload(call, response, model_id, user, config),
+            schema,
+            model_id,
+            config,
+        )
+        call.model = model_id
+        if self.hedge is not None and model_id == self.model:
+            self.hedge.record(time.monotonic() - started)
+        return result
+
+    async def _ahedged_call(
+        self,
+        primary: str,
+        secondary: str,
+        user: str,
+        config: types.GenerateContentConfig,
+        schema: Type[BaseModel],
+        tokens: int,
+        call: CallTelemetry,
+    ) -> BaseModel:
+        """Race `primary` against `secondary` once the hedge delay has passed.
+
+        Returns the first schema-valid response and cancels the other call. If
+        both fail, the primary's error is raised so the retry ladder continues.
+        """
+        assert self.hedge is not None
+        first = asyncio.ensure_future(
+            self._acall_once(primary, user, config, schema, tokens, call)
+        )
+        delay = self.hedge.delay()
+        if delay is None:
+            return await first
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done or not get_circuit_breaker(self._resource(secondary)).allow():
+            return await first
+
+        self.hedge.fired += 1
+        second = asyncio.ensure_future(
+            self._acall_once(secondary, user, config, schema, tokens, call)
+        )
+        pending = {first, second}
+        errors: dict[asyncio.Future, Exception] = {}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    exc = task.exception()
+                    if exc is None:
+                        if task is second:
+                            self.hedge.won += 1
+                        return task.result()
+                    errors[task] = exc
+        finally:
+            for task in pending:
+                task.cancel()
+            if second in pending:
+                # A task cancelled before it starts never reaches its own release.
+                get_circuit_breaker(self._resource(secondary)).release()
+        raise errors.get(first) or errors[second]
+
+    async def agenerate_streaming(
+        self,
+        system: str,
+        user: str,
+        schema: Type[BaseModel],
+        item_schema: Type[BaseModel],
+        on_item: Callable[[BaseModel], None],
+        temperature: float = 0.2,
+        max_output_tokens: int = 1400,
+    ) -> BaseModel:
+        """Stream a structured response, reporting list items as they close.
 
-                    # Final retryable failure for this model:
-                    # try next fallback model if available.
-                    break
-
-        assert last_error is not None
-        if _is_transient_gemini_error(last_error):
-            raise RuntimeError(
-                f"Gemini models are temporarily unavailable or overloaded after trying: "
-                f"{', '.join(tried_models)}. "
-                "Please retry in 30-60 seconds."
-            ) from last_error
-        raise last_error
+        `on_item` receives each element of the top-level list (validated as
+        `item_schema`) the moment it is complete; the full response is still
+        validated against `schema` at the end. If the stream fails, falls back
+        to `agenerate_structured` with its retries and fallback models; the
+        returned value is always the authoritative result.
+        """
+        with self._track(max_output_tokens, streamed=True) as call:
+            return await self._agenerate_streaming(
+                call,
+                system,
+                user,
+                schema,
+                item_schema,
+                on_item,
+                temperature,
+                max_output_tokens,
+            )
+
+    async def _agenerate_streaming(
+        self,
+        call: CallTelemetry,
+        system: str,
+        user: str,
+        schema: Type[BaseModel],
+        item_schema: Type[BaseModel],
+        on_item: Callable[[BaseModel], None],
+        temperature: float,
+        max_output_tokens: int,
+    ) -> BaseModel:
+        key = self._cache_key(system, user, schema, temperature)
+        cached = self._cache_get(key, schema)
+        if cached is not None:
+            call.cache_hit = True
+            for items in cached.model_dump().values():
+                if isinstance(items, list):
+                    for item in items:
+                        on_item(item_schema.model_validate(item))
+            return cached
+
+        config = _generate_config(schema, system, temperature, max_output_tokens)
+        parser = _StreamingItemParser()
+        breaker = get_circuit_breaker(self._resource(self.model))
+        self._raise_if_cancelled()
+        if not breaker.allow():
+            # Primary is unhealthy: let the fallback chain pick a healthy model.
+            return await self._agenerate(
+                call, system, user, schema, temperature, max_output_tokens
+            )
+        try:
+            with _releasing_probe(breaker):
+                wait = get_rate_limiter(self._resource(self.model)).reserve(
+                    _estimate_tokens(system, user, max_output_tokens)
+                )
+                call.queue_seconds += wait
+                with _counting_cancellation():
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    call.attempts += 1
+                    last_chunk = None
+                    with call.provider_time():
+                        stream = await self.backend.astream(self.model, user, config)
+                        async for last_chunk in stream:
+                            for item in parser.feed(
+                                getattr(last_chunk, "text", None) or ""
+                            ):
+                                try:
+                                    on_item(item_schema.model_validate(item))
+                                except ValidationError:
+                                    # Surfaced by the final validation below.
+                                    continue
+            breaker.record_success()
+            # Streams report cumulative usage on their final chunk.
+            call.add_usage(last_chunk)
+            if parser.text and _is_truncated(last_chunk):
+                call.truncations += 1
+                partial = parser.text
+                full = await self._acontinue(call, self.model, user, config, partial)
+                for item in parser.feed(full[len(partial) :]):
+                    try:
+                        on_item(item_schema.model_validate(item))
+                    except ValidationError:
+                        continue
+            if not parser.text:
+                raise ValueError(
+                    "Model returned no text and no parsed structured output."
+                )
+            result = await self._avalidated(
+                call, _parse_jsonish(parser.text), schema, self.model, config
+            )
+            call.model = self.model
+        except Exception as exc:  # noqa: BLE001 - wrapper converts provider errors
+            _record_outcome(breaker, exc)
+            if _is_retryable_output_error(exc):
+                call.validation_failures += 1
+            elif not _is_transient_gemini_error(exc):
+                raise
+            return await self._agenerate(
+                call, system, user, schema, temperature, max_output_tokens
+            )
+        return self._cache_set(key, result)
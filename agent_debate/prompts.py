@@ -1,3 +1,10 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Literal
+
+from agent_debate.schemas import DEFAULT_RUBRIC, Rubric
+
 PRO_SYSTEM = """\
 You are a sharp devil's advocate arguing IN FAVOR of a decision.
 Generate 3–8 arguments that support taking the action.
@@ -18,25 +25,90 @@ Rules:
 - Output strict JSON matching the DebatePosition schema.
 """
 
-JUDGE_SYSTEM = """\
-You are an impartial senior decision analyst. You receive PRO and CON arguments for a decision and must deliver a structured verdict.
-
-Scoring rubric (use these exact criteria and weights):
-- Feasibility: 0.18
-- Cost/Time: 0.16
-- Risk/Uncertainty: 0.16
-- Reversibility: 0.10
-- Expected value: 0.18
-- Evidence quality: 0.12
-- Alignment with constraints: 0.10
-
-Score each criterion 0–10 for both PRO and CON sides.
-Weighted total determines the winner; your decision should reflect the overall picture.
-- decision: "go" if PRO wins clearly, "no_go" if CON wins clearly, "conditional_go" if close or heavily conditional.
+
+def _rubric_lines(rubric: Rubric) -> str:
+    return "\n".join(f"- {c.name}: {c.weight:.2f}" for c in rubric.criteria)
+
+
+JUDGE_SYSTEM = f"""\
+You are an impartial senior decision analyst. You receive PRO and CON arguments for a decision and must deliver a structured assessment.
+
+Scoring rubric (use these exact criterion names; weights shown for context):
+{_rubric_lines(DEFAULT_RUBRIC)}
+
+Score each criterion 0–10 for both PRO and CON sides, with a short rationale.
+Do not compute totals, a winner or a go/no-go decision: they are derived from your scores with the rubric weights.
+- confidence: 0–1, how reliable your scoring is given the evidence.
 - summary: 3–6 sentences synthesizing the debate.
 - key_risks: 2–8 most critical risks regardless of outcome.
 - assumptions_to_verify: 1–8 key assumptions that need validation.
 - next_48h_actions: 2–8 concrete immediate actions.
 - needs_more_info: true if critical data is missing; list up to 5 clarifying_questions.
-- Output strict JSON matching the Verdict schema.
+- Output strict JSON matching the JudgeAssessment schema.
 """
+
+# Judge input encodings. "indented" is the original pretty-printed JSON;
+# "minified" drops whitespace; "table" renders one numbered row per argument.
+JudgeEncoding = Literal["indented", "minified", "table"]
+JudgeFields = Literal["full", "compact"]
+
+# "compact" drops `reasoning`: the rubric scores claims, evidence and risks.
+ARGUMENT_FIELDS: dict[str, tuple[str, ...]] = {
+    "full": ("claim", "reasoning", "evidence", "risk", "confidence"),
+    "compact": ("claim", "evidence", "risk", "confidence"),
+}
+
+
+def _table_cell(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return " ".join(str(value).split()).replace("|", "/")
+
+
+def encode_arguments(
+    arguments: list[dict[str, Any]],
+    prefix: str,
+    encoding: JudgeEncoding = "indented",
+    fields: JudgeFields = "full",
+) -> str:
+    """Serialise one side's arguments for the judge prompt.
+
+    `prefix` labels table rows (P1, P2... / C1, C2...).
+    """
+    keys = ARGUMENT_FIELDS[fields]
+    rows = [{key: arg[key] for key in keys if key in arg} for arg in arguments]
+    if encoding == "indented":
+        return json.dumps(rows, ensure_ascii=False, indent=2)
+    if encoding == "minified":
+        return json.dumps(rows, ensure_ascii=False, separators=(",", ":"))
+    header = " | ".join(["#", *("conf" if key == "confidence" else key for key in keys)])
+    lines = [header]
+    for index, row in enumerate(rows, 1):
+        cells = [f"{prefix}{index}", *(_table_cell(row.get(key, "")) for key in keys)]
+        lines.append(" | ".join(cells))
+    return "\n".join(lines)
+
+
+def user_prompt(decision: str, context: str) -> str:
+    """Advocate user prompt: the decision and, if given, its context."""
+    parts = [f"Decision under consideration: {decision}"]
+    if context:
+        parts.append(f"Additional context: {context}")
+    return "\n".join(parts)
+
+
+def judge_prompt(
+    decision: str,
+    context: str,
+    pro: list[dict],
+    con: list[dict],
+    encoding: JudgeEncoding = "indented",
+    fields: JudgeFields = "full",
+) -> str:
+    """Judge user prompt: the decision with both sides' encoded arguments."""
+    return (
+        f"Decision: {decision}\n"
+        f"Context: {context}\n\n"
+        f"PRO arguments:\n{encode_arguments(pro, 'P', encoding, fields)}\n\n"
+        f"CON arguments:\n{encode_arguments(con, 'C', encoding, fields)}"
+    )
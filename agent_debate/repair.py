@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import difflib
+import json
+import os
+from typing import Any, Callable, Literal, Type
+
+from pydantic import BaseModel, ValidationError
+
+from agent_debate.schemas import DEFAULT_RUBRIC, JudgeAssessment
+
+RepairMode = Literal["off", "local", "full"]
+
+REPAIR_SYSTEM = """\
+You fix JSON that failed schema validation.
+You receive the validation errors and the JSON. Return the corrected JSON only.
+Change only what the errors require and keep every other value as it is.
+"""
+
+
+def repair_mode() -> RepairMode:
+    """DEBATE_REPAIR: off (regenerate), local (local fixes only) or full (default)."""
+    mode = os.environ.get("DEBATE_REPAIR", "full").strip().lower()
+    return mode if mode in ("off", "local") else "full"  # type: ignore[return-value]
+
+
+def _truncate_lists(data: dict[str, Any], schema: Type[BaseModel]) -> None:
+    """Cut top-level lists down to the schema's `max_length`."""
+    for name, field in schema.model_fields.items():
+        value = data.get(name)
+        if not isinstance(value, list):
+            continue
+        for constraint in field.metadata:
+            # annotated_types.MaxLen or pydantic's own metadata, both expose it.
+            max_length = getattr(constraint, "max_length", None)
+            if isinstance(max_length, int) and len(value) > max_length:
+                data[name] = value[:max_length]
+
+
+def _fix_assessment(data: dict[str, Any]) -> None:
+    # Map near-miss criterion names onto the rubric; drop duplicates and unknowns.
+    rows = data.get("scorecard")
+    if isinstance(rows, list):
+        names = {name.casefold(): name for name in DEFAULT_RUBRIC.names}
+        seen: set[str] = set()
+        fixed: list[Any] = []
+        for row in rows:
+            if not isinstance(row, dict) or not isinstance(row.get("criterion"), str):
+                fixed.append(row)
+                continue
+            key = row["criterion"].strip().casefold()
+            if key not in names:
+                close = difflib.get_close_matches(key, list(names), n=1, cutoff=0.6)
+                if not close:
+                    continue
+                key = close[0]
+            if key in seen:
+                continue
+            seen.add(key)
+            fixed.append({**row, "criterion": names[key]})
+        data["scorecard"] = fixed
+    # The questions are the evidence: the flag follows them.
+    questions = data.get("clarifying_questions")
+    if isinstance(questions, list) and isinstance(data.get("needs_more_info"), bool):
+        data["needs_more_info"] = bool(questions)
+
+
+_SCHEMA_FIXES: dict[Type[BaseModel], Callable[[dict[str, Any]], None]] = {
+    JudgeAssessment: _fix_assessment,
+}
+
+
+def repair_locally(data: Any, schema: Type[BaseModel]) -> BaseModel | None:
+    """Apply cheap deterministic fixes to `data`; the valid result or None."""
+    if not isinstance(data, dict):
+        return None
+    fixed = json.loads(json.dumps(data))
+    _truncate_lists(fixed, schema)
+    fix = _SCHEMA_FIXES.get(schema)
+    if fix is not None:
+        fix(fixed)
+    try:
+        return schema.model_validate(fixed)
+    except ValidationError:
+        return None
+
+
+def repair_prompt(data: Any, error: ValidationError) -> str:
+    """User prompt for a model repair: the validation errors and the rejected JSON."""
+    errors = "\n".join(
+        f"- {'.'.join(str(part) for part in item['loc']) or '<root>'}: {item['msg']}"
+        for item in error.errors()
+    )
+    return (
+        f"Validation errors:\n{errors}\n\n"
+        f"JSON:\n{json.dumps(data, ensure_ascii=False)}"
+    )
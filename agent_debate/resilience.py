@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any
+
+DEFAULT_BREAKER_FAILURES = 5
+DEFAULT_BREAKER_RESET_SECONDS = 30.0
+# A half-open probe with no outcome after this long is presumed lost.
+DEFAULT_PROBE_TIMEOUT_SECONDS = 120.0
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `per_minute` units per minute.
+
+    `reserve` always succeeds and returns how long the caller must wait before
+    using what it took, so waiters are served in arrival order and both the
+    sync and async paths can share one bucket. A rate of 0 means unlimited.
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        self.per_minute = per_minute
+        self.capacity = per_minute
+        self._available = per_minute
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        if self.per_minute <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            rate = self.per_minute / 60.0
+            self._available = min(
+                self.capacity, self._available + (now - self._updated) * rate
+            )
+            self._updated = now
+            self._available -= amount
+            if self._available >= 0:
+                return 0.0
+            return -self._available / rate
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            return {"per_minute": self.per_minute, "available": round(self._available, 2)}
+
+
+class ModelRateLimiter:
+    """Requests/min and tokens/min budget for one model id."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float) -> None:
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.throttled = 0
+        self.throttled_seconds = 0.0
+
+    def reserve(self, tokens: int) -> float:
+        """Take one request and `tokens` tokens; return the required wait in seconds."""
+        wait = max(self.requests.reserve(1), self.tokens.reserve(tokens))
+        if wait > 0:
+            self.throttled += 1
+            self.throttled_seconds += wait
+        return wait
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests.snapshot(),
+            "tokens": self.tokens.snapshot(),
+            "throttled": self.throttled,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+        }
+
+
+class CircuitBreaker:
+    """Closed -> open after N consecutive transient failures -> half-open probe.
+
+    While open, `allow()` refuses calls so callers move to the next fallback
+    model. After `reset_seconds` a single probe call is let through; its
+    success closes the breaker, its failure re-opens it. A probe abandoned
+    without an outcome is handed back with `release()`, and one that has been
+    in flight for `probe_timeout_seconds` is replaced by a new probe.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_BREAKER_FAILURES,
+        reset_seconds: float = DEFAULT_BREAKER_RESET_SECONDS,
+        probe_timeout_seconds: float = DEFAULT_PROBE_TIMEOUT_SECONDS,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._probe_in_flight = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            now = time.monotonic()
+            if self.state == "open":
+                if now - self.opened_at < self.reset_seconds:
+                    self.rejected += 1
+                    return False
+                self.state = "half_open"
+                self._probe_in_flight = False
+            if (
+                self._probe_in_flight
+                and now - self._probe_started < self.probe_timeout_seconds
+            ):
+                self.rejected += 1
+                return False
+            self._probe_in_flight = True
+            self._probe_started = now
+            return True
+
+    def release(self) -> None:
+        """Hand back a probe whose call ended without an outcome (e.g. cancelled).
+
+        Harmless for calls that were not the probe: at worst one extra probe
+        is let through.
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.times_opened += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+            }
+
+
+_limiters: dict[str, ModelRateLimiter] = {}
+_breakers: dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_rate_limiter(model: str) -> ModelRateLimiter:
+    """Process-wide limiter for `model` (DEBATE_RPM / DEBATE_TPM, 0 = unlimited)."""
+    with _registry_lock:
+        limiter = _limiters.get(model)
+        if limiter is None:
+            limiter = ModelRateLimiter(
+                requests_per_minute=float(os.environ.get("DEBATE_RPM", 0)),
+                tokens_per_minute=float(os.environ.get("DEBATE_TPM", 0)),
+            )
+            _limiters[model] = limiter
+        return limiter
+
+
+def get_circuit_breaker(model: str) -> CircuitBreaker:
+    """Process-wide breaker for `model` (DEBATE_BREAKER_FAILURES / _RESET_SECONDS)."""
+    with _registry_lock:
+        breaker = _breakers.get(model)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                failure_threshold=int(
+                    os.environ.get("DEBATE_BREAKER_FAILURES", DEFAULT_BREAKER_FAILURES)
+                ),
+                reset_seconds=float(
+                    os.environ.get(
+                        "DEBATE_BREAKER_RESET_SECONDS", DEFAULT_BREAKER_RESET_SECONDS
+                    )
+                ),
+            )
+            _breakers[model] = breaker
+        return breaker
+
+
+def resilience_snapshot() -> dict[str, Any]:
+    """Limiter and breaker state per model id, for monitoring."""
+    with _registry_lock:
+        models = sorted(set(_limiters) | set(_breakers))
+        limiters = dict(_limiters)
+        breakers = dict(_breakers)
+    return {
+        model: {
+            "rate_limiter": limiters[model].snapshot() if model in limiters else None,
+            "circuit_breaker": breakers[model].snapshot() if model in breakers else None,
+        }
+        for model in models
+    }
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Literal
+
+MAX_ROUNDS = 5
+# Output budget of a rebuttal round; the opening round keeps the full budget.
+OPENING_MAX_TOKENS = 2200
+REBUTTAL_MAX_TOKENS = 1400
+# Strongest arguments per side carried into the next round.
+SUMMARY_TOP_K = 3
+SUMMARY_REASONING_CHARS = 160
+# Stop once both sides' top claims are at least this similar to the last round.
+STOP_SIMILARITY = 0.8
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def summarise_arguments(
+    arguments: list[dict[str, Any]], top_k: int = SUMMARY_TOP_K
+) -> list[str]:
+    """One line per top-confidence argument: claim, clipped reasoning, confidence.
+
+    Only these lines reach the next round, so prompts stay the same size no
+    matter how many rounds came before.
+    """
+    ranked = sorted(arguments, key=lambda arg: arg.get("confidence", 0.0), reverse=True)
+    lines = []
+    for arg in ranked[:top_k]:
+        reasoning = " ".join(str(arg.get("reasoning", "")).split())
+        if len(reasoning) > SUMMARY_REASONING_CHARS:
+            reasoning = reasoning[: SUMMARY_REASONING_CHARS - 1].rstrip() + "…"
+        lines.append(
+            f"{arg.get('claim', '').strip()} — {reasoning} "
+            f"(confidence {float(arg.get('confidence', 0.0)):.2f})"
+        )
+    return lines
+
+
+def _words(line: str) -> set[str]:
+    # Compare claims only; the confidence suffix changes without the point changing.
+    claim = line.split(" — ", 1)[0]
+    return {word.casefold() for word in _WORD.findall(claim)}
+
+
+def summary_similarity(previous: list[str], current: list[str]) -> float:
+    """Mean best-match Jaccard similarity of current claims against the previous ones."""
+    if not previous or not current:
+        return 0.0
+    before = [_words(line) for line in previous]
+    scores = []
+    for line in current:
+        words = _words(line)
+        scores.append(
+            max(
+                (len(words & other) / len(words | other) if words | other else 1.0)
+                for other in before
+            )
+        )
+    return sum(scores) / len(scores)
+
+
+def rebuttal_block(
+    side: Literal["pro", "con"],
+    summaries: dict[str, list[str]],
+    round_number: int,
+    language: Literal["en", "ru"] = "en",
+) -> str:
+    """Prompt section asking `side` to answer the opponent's strongest points."""
+    opponent = "con" if side == "pro" else "pro"
+    own = "\n".join(f"- {line}" for line in summaries.get(side, []))
+    theirs = "\n".join(f"- {line}" for line in summaries.get(opponent, []))
+    if language == "ru":
+        return (
+            f"\n\nРаунд {round_number}. Сильнейшие аргументы оппонента в прошлом раунде:\n"
+            f"{theirs}\n\nВаши сильнейшие аргументы в прошлом раунде:\n{own}\n\n"
+            "Опровергните аргументы оппонента и верните полный обновленный набор "
+            "аргументов: сохраните то, что выдержало критику, скорректируйте "
+            "уверенность и добавьте новые доводы, если они есть."
+        )
+    return (
+        f"\n\nRound {round_number}. The opponent's strongest points last round:\n"
+        f"{theirs}\n\nYour strongest points last round:\n{own}\n\n"
+        "Rebut the opponent's points and return your full updated set of "
+        "arguments: keep what survives, adjust confidence, and add new points "
+        "if you have them."
+    )
+
+
+def advance_round(
+    pro: list[dict[str, Any]],
+    con: list[dict[str, Any]],
+    previous: dict[str, list[str]] | None,
+    round_number: int,
+) -> dict[str, Any]:
+    """History entry for a finished round: summaries and similarity to the last one."""
+    summaries = {"pro": summarise_arguments(pro), "con": summarise_arguments(con)}
+    entry: dict[str, Any] = {"round": round_number, "summaries": summaries}
+    if previous:
+        entry["similarity"] = {
+            side: round(summary_similarity(previous[side], summaries[side]), 3)
+            for side in ("pro", "con")
+        }
+    return entry
+
+
+def converged(entry: dict[str, Any], threshold: float = STOP_SIMILARITY) -> bool:
+    """Whether neither side's top arguments changed meaningfully this round."""
+    similarity = entry.get("similarity")
+    return bool(similarity) and all(value >= threshold for value in similarity.values())
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import math
 from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
@@ -21,6 +22,92 @@ class DebatePosition(StrictModel):
     arguments: list[Argument] = Field(min_length=3, max_length=8)
 
 
+class RubricCriterion(StrictModel):
+    name: str
+    weight: float = Field(gt=0.0, le=1.0)
+
+
+class Rubric(StrictModel):
+    criteria: list[RubricCriterion] = Field(min_length=1)
+    # Weighted-total margins (0–10 scale): below `tie_margin` the sides tie,
+    # at or above `go_margin` the winner is clear (go / no_go).
+    tie_margin: float = Field(default=0.1, ge=0.0)
+    go_margin: float = Field(default=0.75, ge=0.0)
+
+    @model_validator(mode="after")
+    def validate_rubric(self) -> "Rubric":
+        total = sum(c.weight for c in self.criteria)
+        if not math.isclose(total, 1.0, abs_tol=1e-6):
+            raise ValueError(f"rubric weights must sum to 1, got {total:.4f}")
+        names = [c.name.casefold() for c in self.criteria]
+        if len(set(names)) != len(names):
+            raise ValueError("rubric criterion names must be unique")
+        if self.tie_margin > self.go_margin:
+            raise ValueError("tie_margin must not exceed go_margin")
+        return self
+
+    @property
+    def names(self) -> list[str]:
+        return [c.name for c in self.criteria]
+
+    @property
+    def weights(self) -> list[float]:
+        return [c.weight for c in self.criteria]
+
+
+DEFAULT_RUBRIC = Rubric(
+    criteria=[
+        RubricCriterion(name="Feasibility", weight=0.18),
+        RubricCriterion(name="Cost/Time", weight=0.16),
+        RubricCriterion(name="Risk/Uncertainty", weight=0.16),
+        RubricCriterion(name="Reversibility", weight=0.10),
+        RubricCriterion(name="Expected value", weight=0.18),
+        RubricCriterion(name="Evidence quality", weight=0.12),
+        RubricCriterion(name="Alignment with constraints", weight=0.10),
+    ]
+)
+
+
+class CriterionScore(StrictModel):
+    criterion: str
+    pro_score: float = Field(ge=0.0, le=10.0)
+    con_score: float = Field(ge=0.0, le=10.0)
+    rationale: str
+
+
+class JudgeAssessment(StrictModel):
+    """What the judge model returns; totals, winner and decision are computed locally."""
+
+    confidence: float = Field(ge=0.0, le=1.0)
+    summary: str
+    scorecard: list[CriterionScore] = Field(
+        min_length=len(DEFAULT_RUBRIC.criteria), max_length=len(DEFAULT_RUBRIC.criteria)
+    )
+    key_risks: list[str] = Field(min_length=2, max_length=8)
+    assumptions_to_verify: list[str] = Field(min_length=1, max_length=8)
+    next_48h_actions: list[str] = Field(min_length=2, max_length=8)
+    needs_more_info: bool
+    clarifying_questions: list[str] = Field(default_factory=list, max_length=5)
+
+    @model_validator(mode="after")
+    def validate_assessment(self) -> "JudgeAssessment":
+        expected = {name.casefold() for name in DEFAULT_RUBRIC.names}
+        got = {row.criterion.strip().casefold() for row in self.scorecard}
+        if got != expected:
+            raise ValueError(
+                f"scorecard criteria must be exactly: {', '.join(DEFAULT_RUBRIC.names)}"
+            )
+        if self.needs_more_info and not self.clarifying_questions:
+            raise ValueError(
+                "clarifying_questions must be provided when needs_more_info=true"
+            )
+        if not self.needs_more_info and self.clarifying_questions:
+            raise ValueError(
+                "clarifying_questions must be empty when needs_more_info=false"
+            )
+        return self
+
+
 class ScorecardCriterion(StrictModel):
     criterion: str
     weight: float = Field(gt=0.0, le=1.0)
@@ -29,6 +116,48 @@ class ScorecardCriterion(StrictModel):
     rationale: str
 
 
+class CriterionAgreement(StrictModel):
+    """Spread of one criterion's scores across ensemble judges."""
+
+    criterion: str
+    pro_mean: float
+    pro_median: float
+    pro_std: float
+    con_mean: float
+    con_median: float
+    con_std: float
+
+
+class JudgeVote(StrictModel):
+    model: str
+    temperature: float
+    decision: Literal["go", "no_go", "conditional_go"]
+    winner: Literal["pro", "con", "tie"]
+    confidence: float = Field(ge=0.0, le=1.0)
+    pro_total: float | None = None
+    con_total: float | None = None
+
+
+class EnsembleAgreement(StrictModel):
+    """How far the judges of an ensemble verdict agreed, and how many ran."""
+
+    judges: int = Field(ge=1)
+    completed: int = Field(ge=1)
+    failed: int = 0
+    cancelled: int = 0
+    quorum: int = Field(ge=1)
+    # Decision that reached the quorum first and that the median scorecard of the
+    # judges finished by then confirmed, if any (later judges were cancelled).
+    quorum_decision: Literal["go", "no_go", "conditional_go"] | None = None
+    # Share of completed judges whose decision matches the aggregated one.
+    agreement: float = Field(ge=0.0, le=1.0)
+    votes: dict[str, int]
+    pro_total_std: float
+    con_total_std: float
+    criteria: list[CriterionAgreement]
+    members: list[JudgeVote]
+
+
 class Verdict(StrictModel):
     decision: Literal["go", "no_go", "conditional_go"]
     winner: Literal["pro", "con", "tie"]
@@ -40,6 +169,11 @@ class Verdict(StrictModel):
     next_48h_actions: list[str] = Field(min_length=2, max_length=8)
     needs_more_info: bool
     clarifying_questions: list[str] = Field(default_factory=list, max_length=5)
+    # Weighted totals computed locally from the rubric (absent on legacy verdicts).
+    pro_total: float | None = None
+    con_total: float | None = None
+    # Present when the verdict aggregates several judges.
+    agreement: EnsembleAgreement | None = None
 
     @model_validator(mode="after")
     def validate_clarifying_questions(self) -> "Verdict":
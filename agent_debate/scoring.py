@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import numpy as np
+
+from agent_debate.schemas import (
+    DEFAULT_RUBRIC,
+    JudgeAssessment,
+    Rubric,
+    ScorecardCriterion,
+    Verdict,
+)
+
+# Outcome codes used by the vectorised helpers.
+WINNERS = np.array(["con", "tie", "pro"])
+DECISIONS = np.array(["no_go", "conditional_go", "go"])
+
+
+def weighted_totals(
+    weights: np.ndarray, pro_scores: np.ndarray, con_scores: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Weighted PRO and CON totals.
+
+    `weights` is `(n,)` for one rubric or `(m, n)` for m weight vectors; scores
+    are `(n,)`. Returns arrays of shape `()` or `(m,)`.
+    """
+    weights = np.asarray(weights, dtype=float)
+    pro = np.asarray(pro_scores, dtype=float)
+    con = np.asarray(con_scores, dtype=float)
+    return weights @ pro, weights @ con
+
+
+def outcome_codes(
+    pro_total: np.ndarray, con_total: np.ndarray, tie_margin: float, go_margin: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Winner and decision as -1 / 0 / +1 codes (index WINNERS / DECISIONS with code + 1).
+
+    Winner follows the sign of the PRO - CON margin, tie when |margin| <
+    tie_margin. Decision is go / no_go when |margin| >= go_margin and
+    conditional_go otherwise.
+    """
+    margin = np.asarray(pro_total) - np.asarray(con_total)
+    winner = np.where(np.abs(margin) < tie_margin, 0, np.sign(margin)).astype(int)
+    decision = np.where(np.abs(margin) >= go_margin, np.sign(margin), 0).astype(int)
+    return winner, decision
+
+
+def score_matrix(
+    scorecard: list, rubric: Rubric = DEFAULT_RUBRIC
+) -> tuple[np.ndarray, np.ndarray]:
+    """PRO and CON score vectors aligned to the rubric's criterion order.
+
+    Rows are matched by case-insensitive criterion name, so the judge may list
+    them in any order.
+    """
+    by_name = {row.criterion.strip().casefold(): row for row in scorecard}
+    rows = [by_name[name.casefold()] for name in rubric.names]
+    pro = np.array([row.pro_score for row in rows], dtype=float)
+    con = np.array([row.con_score for row in rows], dtype=float)
+    return pro, con
+
+
+def build_verdict(
+    assessment: JudgeAssessment, rubric: Rubric = DEFAULT_RUBRIC
+) -> Verdict:
+    """Turn the judge's per-criterion scores into a reproducible Verdict."""
+    pro, con = score_matrix(assessment.scorecard, rubric)
+    weights = np.array(rubric.weights)
+    pro_total, con_total = weighted_totals(weights, pro, con)
+    winner, decision = outcome_codes(
+        pro_total, con_total, rubric.tie_margin, rubric.go_margin
+    )
+
+    by_name = {row.criterion.strip().casefold(): row for row in assessment.scorecard}
+    scorecard = [
+        ScorecardCriterion(
+            criterion=criterion.name,
+            weight=criterion.weight,
+            pro_score=by_name[criterion.name.casefold()].pro_score,
+            con_score=by_name[criterion.name.casefold()].con_score,
+            rationale=by_name[criterion.name.casefold()].rationale,
+        )
+        for criterion in rubric.criteria
+    ]
+    return Verdict(
+        decision=str(DECISIONS[int(decision) + 1]),
+        winner=str(WINNERS[int(winner) + 1]),
+        confidence=assessment.confidence,
+        summary=assessment.summary,
+        scorecard=scorecard,
+        key_risks=assessment.key_risks,
+        assumptions_to_verify=assessment.assumptions_to_verify,
+        next_48h_actions=assessment.next_48h_actions,
+        needs_more_info=assessment.needs_more_info,
+        clarifying_questions=assessment.clarifying_questions,
+        pro_total=round(float(pro_total), 4),
+        con_total=round(float(con_total), 4),
+    )
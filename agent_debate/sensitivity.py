@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import itertools
+import math
+import time
+from typing import Any
+
+import numpy as np
+
+from agent_debate.schemas import DEFAULT_RUBRIC, Rubric, Verdict
+from agent_debate.scoring import DECISIONS, WINNERS, outcome_codes, weighted_totals
+
+
+def grid_units(step: float) -> int:
+    """Grid cells per unit weight; `step` must divide 1 evenly (0.05, 0.1, 0.125, ...)."""
+    units = round(1 / step) if step > 0 else 0
+    if units < 1 or not math.isclose(units * step, 1.0, abs_tol=1e-9):
+        raise ValueError(f"grid_step must divide 1 evenly, got {step}")
+    return units
+
+
+def grid_weights(n_criteria: int, step: float = 0.1) -> np.ndarray:
+    """Every weight vector on the simplex with the given step (weights may be 0)."""
+    units = grid_units(step)
+    # Stars and bars: choose n-1 divider positions among units + n - 1 slots.
+    slots = units + n_criteria - 1
+    dividers = np.array(list(itertools.combinations(range(slots), n_criteria - 1)))
+    bounds = np.hstack(
+        [
+            np.full((len(dividers), 1), -1),
+            dividers,
+            np.full((len(dividers), 1), slots),
+        ]
+    )
+    return (np.diff(bounds, axis=1) - 1) / units
+
+
+def dirichlet_weights(
+    base: np.ndarray, samples: int, concentration: float, rng: np.random.Generator
+) -> np.ndarray:
+    """Weight vectors scattered around `base`; higher concentration = tighter."""
+    return rng.dirichlet(np.asarray(base) * concentration, size=samples)
+
+
+def _summarise(
+    weights: np.ndarray,
+    pro: np.ndarray,
+    con: np.ndarray,
+    base_weights: np.ndarray,
+    base_winner: int,
+    base_decision: int,
+    rubric: Rubric,
+) -> dict[str, Any]:
+    pro_total, con_total = weighted_totals(weights, pro, con)
+    winner, decision = outcome_codes(
+        pro_total, con_total, rubric.tie_margin, rubric.go_margin
+    )
+    winner_flips = winner != base_winner
+    decision_flips = decision != base_decision
+    summary: dict[str, Any] = {
+        "samples": int(len(weights)),
+        "winner_flip_rate": round(float(winner_flips.mean()), 4),
+        "decision_flip_rate": round(float(decision_flips.mean()), 4),
+        "winners": {
+            str(name): int((winner == code).sum())
+            for code, name in zip((-1, 0, 1), WINNERS)
+        },
+        "decisions": {
+            str(name): int((decision == code).sum())
+            for code, name in zip((-1, 0, 1), DECISIONS)
+        },
+        "nearest_decision_flip": None,
+    }
+    if decision_flips.any():
+        # Smallest L1 move away from the base weights that changes the decision.
+        distance = np.abs(weights - base_weights).sum(axis=1)
+        distance[~decision_flips] = np.inf
+        index = int(distance.argmin())
+        summary["nearest_decision_flip"] = {
+            "l1_distance": round(float(distance[index]), 4),
+            "weights": {
+                name: round(float(w), 4) for name, w in zip(rubric.names, weights[index])
+            },
+            "decision": str(DECISIONS[decision[index] + 1]),
+            "winner": str(WINNERS[winner[index] + 1]),
+        }
+    return summary
+
+
+def one_at_a_time(
+    base: np.ndarray, pro: np.ndarray, con: np.ndarray, rubric: Rubric
+) -> list[dict[str, Any]]:
+    """Boundary weights per criterion when only that weight moves.
+
+    Moving criterion i to weight t rescales the others proportionally, so the
+    margin is linear in t: m(t) = t * d_i + (1 - t) * (M - b_i * d_i) / (1 - b_i).
+    Solving m(t) = ±tie_margin and ±go_margin gives every flip point in [0, 1].
+    """
+    diff = pro - con
+    margin = float(base @ diff)
+    rest = (margin - base * diff) / np.where(base < 1, 1 - base, 1)
+    slope = diff - rest
+    thresholds = {
+        "winner": (rubric.tie_margin, -rubric.tie_margin),
+        "decision": (rubric.go_margin, -rubric.go_margin),
+    }
+
+    report: list[dict[str, Any]] = []
+    for i, name in enumerate(rubric.names):
+        entry: dict[str, Any] = {"criterion": name, "weight": round(float(base[i]), 4)}
+        for kind, levels in thresholds.items():
+            points: list[float] = []
+            if slope[i] != 0:
+                for level in levels:
+                    t = (level - rest[i]) / slope[i]
+                    if 0.0 <= t <= 1.0 and not np.isclose(t, base[i]):
+                        points.append(round(float(t), 4))
+            entry[f"{kind}_boundaries"] = sorted(set(points))
+        report.append(entry)
+    return report
+
+
+def run_sensitivity(
+    verdict: Verdict | dict[str, Any],
+    samples: int = 5000,
+    concentration: float = 50.0,
+    grid_step: float = 0.1,
+    seed: int | None = 0,
+    rubric: Rubric = DEFAULT_RUBRIC,
+) -> dict[str, Any]:
+    """What-if analysis of a stored verdict's scorecard under weight changes.
+
+    Sweeps a simplex grid, Dirichlet samples around the stored weights and
+    one-at-a-time moves, all vectorised and without any LLM calls.
+    """
+    started = time.perf_counter()
+    if isinstance(verdict, dict):
+        verdict = Verdict.model_validate(verdict)
+    names = [row.criterion for row in verdict.scorecard]
+    base = np.array([row.weight for row in verdict.scorecard], dtype=float)
+    base = base / base.sum()
+    pro = np.array([row.pro_score for row in verdict.scorecard], dtype=float)
+    con = np.array([row.con_score for row in verdict.scorecard], dtype=float)
+    rubric = Rubric(
+        criteria=[{"name": n, "weight": float(w)} for n, w in zip(names, base)],
+        tie_margin=rubric.tie_margin,
+        go_margin=rubric.go_margin,
+    )
+
+    pro_total, con_total = weighted_totals(base, pro, con)
+    base_winner, base_decision = outcome_codes(
+        pro_total, con_total, rubric.tie_margin, rubric.go_margin
+    )
+    base_winner, base_decision = int(base_winner), int(base_decision)
+    rng = np.random.default_rng(seed)
+
+    def summarise(weights: np.ndarray) -> dict[str, Any]:
+        return _summarise(weights, pro, con, base, base_winner, base_decision, rubric)
+
+    return {
+        "base": {
+            "pro_total": round(float(pro_total), 4),
+            "con_total": round(float(con_total), 4),
+            "winner": str(WINNERS[base_winner + 1]),
+            "decision": str(DECISIONS[base_decision + 1]),
+        },
+        "grid": {"step": grid_step, **summarise(grid_weights(len(base), grid_step))},
+        "dirichlet": {
+            "concentration": concentration,
+            **summarise(dirichlet_weights(base, samples, concentration, rng)),
+        },
+        "one_at_a_time": one_at_a_time(base, pro, con, rubric),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
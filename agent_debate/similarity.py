@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import math
+import os
+import re
+import threading
+import time
+from array import array
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Any, Literal
+
+import numpy as np
+
+from agent_debate.rounds import summarise_arguments
+
+# Words are also indexed by this many leading characters, a crude stemmer
+# that lets "migrate"/"migration" and Russian word forms meet.
+PREFIX_CHARS = 5
+# Context terms count for less than the decision itself.
+CONTEXT_WEIGHT = 0.5
+# Recompute document norms once the index has grown this much since the last time.
+RENORM_GROWTH = 0.25
+# Matches offered or used as seeds by default: how similar and how recent.
+DEFAULT_MIN_SCORE = 0.35
+DEFAULT_MAX_AGE_DAYS = 30.0
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_LANGUAGES = ("en", "ru")
+
+
+def features(decision: str, context: str = "") -> dict[str, float]:
+    """Sublinear term weights over words and word prefixes."""
+    counts: Counter[str] = Counter()
+    for text, weight in ((decision, 1.0), (context, CONTEXT_WEIGHT)):
+        for word in _WORD.findall(text.casefold()):
+            counts[word] += weight
+            if len(word) > PREFIX_CHARS:
+                counts[word[:PREFIX_CHARS] + "~"] += weight
+    return {term: 1.0 + math.log(count) if count > 1 else count for term, count in counts.items()}
+
+
+@dataclass
+class SimilarDebate:
+    debate_id: str
+    decision: str
+    language: str
+    verdict: str | None
+    created_at: float
+    score: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class SimilarityIndex:
+    """TF-IDF cosine search over past decisions, held as NumPy-readable postings.
+
+    Each term keeps parallel `array`s of document numbers and term weights, so
+    a query gathers the postings of its own terms and scores every document
+    with one `np.bincount`. Cost grows with the postings touched rather than
+    the vocabulary, which keeps lookups in milliseconds at 100k debates.
+    IDF moves as debates are added; document norms use the IDF of the moment
+    they were added and are recomputed in bulk as the index grows.
+    """
+
+    def __init__(self) -> None:
+        self._ids: list[str] = []
+        self._positions: dict[str, int] = {}
+        self._decisions: list[str] = []
+        # Index into _LANGUAGES per debate, so a language filter is one comparison.
+        self._languages = array("b")
+        self._verdicts: list[str | None] = []
+        self._created = array("d")
+        self._norms = array("f")
+        self._postings: dict[str, tuple[array, array]] = {}
+        self._normed_size = 0
+        self._lock = threading.Lock()
+        self.searches = 0
+        self._search_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _idf(self, term: str) -> float:
+        postings = self._postings.get(term)
+        df = len(postings[0]) if postings is not None else 0
+        return math.log((1 + len(self._ids)) / (1 + df)) + 1.0
+
+    def add(
+        self,
+        debate_id: str,
+        decision: str,
+        context: str = "",
+        language: str = "en",
+        verdict: str | None = None,
+        created_at: float | None = None,
+    ) -> None:
+        """Index one finished debate; ids already indexed are ignored."""
+        terms = features(decision, context)
+        with self._lock:
+            if not self._append(debate_id, terms, decision, language, verdict, created_at):
+                return
+            if len(self._ids) > self._normed_size * (1 + RENORM_GROWTH):
+                self._renormalise()
+            else:
+                self._norms.append(
+                    math.sqrt(sum((weight * self._idf(term)) ** 2 for term, weight in terms.items()))
+                )
+
+    def add_many(self, rows: list[dict[str, Any]]) -> None:
+        """Bulk `add` of store rows (`SimilarityIndex.add` keywords), normalised once at the end."""
+        with self._lock:
+            for row in rows:
+                self._append(
+                    row["id"],
+                    features(row["decision"], row["context"]),
+                    row["decision"],
+                    row["language"],
+                    row["verdict"],
+                    row["created_at"],
+                )
+            self._renormalise()
+
+    def _append(
+        self,
+        debate_id: str,
+        terms: dict[str, float],
+        decision: str,
+        language: str,
+        verdict: str | None,
+        created_at: float | None,
+    ) -> bool:
+        if debate_id in self._positions or not terms:
+            return False
+        number = len(self._ids)
+        self._positions[debate_id] = number
+        self._ids.append(debate_id)
+        self._decisions.append(decision)
+        self._languages.append(_LANGUAGES.index(language) if language in _LANGUAGES else -1)
+        self._verdicts.append(verdict)
+        self._created.append(created_at if created_at is not None else time.time())
+        for term, weight in terms.items():
+            numbers, weights = self._postings.setdefault(term, (array("i"), array("f")))
+            numbers.append(number)
+            weights.append(weight)
+        return True
+
+    def _renormalise(self) -> None:
+        if not self._postings:
+            return
+        docs = np.concatenate(
+            [np.frombuffer(numbers, dtype=np.int32) for numbers, _ in self._postings.values()]
+        )
+        weights = np.concatenate(
+            [
+                np.frombuffer(weights, dtype=np.float32) * self._idf(term)
+                for term, (_, weights) in self._postings.items()
+            ]
+        )
+        squares = np.bincount(docs, weights=weights**2, minlength=len(self._ids))
+        self._norms = array("f", np.sqrt(squares).astype(np.float32).tobytes())
+        self._normed_size = len(self._ids)
+
+    def search(
+        self,
+        decision: str,
+        context: str = "",
+        k: int = 5,
+        language: str | None = None,
+        min_score: float = 0.0,
+        max_age_days: float | None = None,
+        exclude: str | None = None,
+    ) -> list[SimilarDebate]:
+        """Top `k` indexed debates by cosine similarity, best first."""
+        started = time.perf_counter()
+        terms = features(decision, context)
+        with self._lock:
+            size = len(self._ids)
+            if not size or not terms:
+                return []
+            # Copies throughout: a live view of an `array` would block appending to it.
+            docs_parts, weight_parts = [], []
+            query_norm = 0.0
+            for term, weight in terms.items():
+                idf = self._idf(term)
+                query_norm += (weight * idf) ** 2
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                docs_parts.append(np.frombuffer(postings[0], dtype=np.int32).copy())
+                weight_parts.append(
+                    np.frombuffer(postings[1], dtype=np.float32) * (weight * idf * idf)
+                )
+            if not docs_parts:
+                return []
+            scores = np.bincount(
+                np.concatenate(docs_parts),
+                weights=np.concatenate(weight_parts),
+                minlength=size,
+            )
+            norms = np.frombuffer(self._norms, dtype=np.float32)[:size].copy()
+            created = np.frombuffer(self._created, dtype=np.float64)[:size].copy()
+            scores /= np.maximum(norms, 1e-9) * math.sqrt(query_norm)
+            if language is not None:
+                code = _LANGUAGES.index(language) if language in _LANGUAGES else -1
+                scores[np.frombuffer(self._languages, dtype=np.int8) != code] = 0.0
+            if max_age_days is not None:
+                scores[created < time.time() - max_age_days * 86400] = 0.0
+            if exclude is not None and exclude in self._positions:
+                scores[self._positions[exclude]] = 0.0
+            count = min(k, size)
+            top = np.argpartition(-scores, count - 1)[:count]
+            # Best score first; equal scores go to the more recent debate.
+            top = top[np.lexsort((-created[top], -scores[top]))]
+            matches = [
+                SimilarDebate(
+                    debate_id=self._ids[number],
+                    decision=self._decisions[number],
+                    language=_LANGUAGES[self._languages[number]]
+                    if self._languages[number] >= 0
+                    else "unknown",
+                    verdict=self._verdicts[number],
+                    created_at=float(created[number]),
+                    score=round(min(1.0, float(scores[number])), 4),
+                )
+                for number in top
+                if scores[number] > 0.0 and scores[number] >= min_score
+            ]
+            self.searches += 1
+            self._search_seconds += time.perf_counter() - started
+        return matches
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "indexed": len(self._ids),
+                "terms": len(self._postings),
+                "searches": self.searches,
+                "avg_search_ms": round(
+                    1000 * self._search_seconds / self.searches, 3
+                ) if self.searches else None,
+            }
+
+
+def seed_block(
+    side: Literal["pro", "con"],
+    match: SimilarDebate,
+    stages: dict[str, Any],
+    language: Literal["en", "ru"] = "en",
+) -> str:
+    """Prompt section handing an advocate the strongest arguments of a similar past debate."""
+    own = "\n".join(f"- {line}" for line in summarise_arguments(stages.get(side) or []))
+    opponent = "con" if side == "pro" else "pro"
+    theirs = "\n".join(f"- {line}" for line in summarise_arguments(stages.get(opponent) or []))
+    if language == "ru":
+        return (
+            f"\n\nПохожее решение уже разбиралось: «{match.decision}».\n"
+            f"Сильнейшие аргументы вашей стороны тогда:\n{own}\n\n"
+            f"Сильнейшие аргументы оппонента тогда:\n{theirs}\n\n"
+            "Используйте то, что применимо к текущему решению, отбросьте то, что нет, "
+            "и добавьте недостающее."
+        )
+    return (
+        f"\n\nA similar decision was debated before: \"{match.decision}\".\n"
+        f"Your side's strongest points then:\n{own}\n\n"
+        f"The opponent's strongest points then:\n{theirs}\n\n"
+        "Reuse what applies to this decision, drop what does not, and add what is missing."
+    )
+
+
+_index: SimilarityIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_similarity_index() -> SimilarityIndex:
+    """Process-wide index, filled from the debate store's finished debates on first use."""
+    global _index
+    if _index is None:
+        from agent_debate.store import get_store
+
+        with _index_lock:
+            if _index is None:
+                index = SimilarityIndex()
+                index.add_many(get_store().completed())
+                _index = index
+    return _index
+
+
+def similarity_stats() -> dict[str, Any] | None:
+    """Index snapshot, or None if nothing has loaded the index yet."""
+    return _index.snapshot() if _index is not None else None
+
+
+def index_debate(
+    debate_id: str, decision: str, context: str, language: str, verdict: str | None
+) -> None:
+    """Add a just-finished debate if the index is loaded; otherwise the store has it."""
+    if _index is not None:
+        _index.add(debate_id, decision, context, language, verdict)
+
+
+def similar_defaults() -> tuple[float, float]:
+    """Score and age limits for offered / seeded matches (DEBATE_SIMILAR_MIN_SCORE, _MAX_AGE_DAYS)."""
+    return (
+        float(os.environ.get("DEBATE_SIMILAR_MIN_SCORE", DEFAULT_MIN_SCORE)),
+        float(os.environ.get("DEBATE_SIMILAR_MAX_AGE_DAYS", DEFAULT_MAX_AGE_DAYS)),
+    )
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+DEFAULT_STORE_PATH = "debates.sqlite3"
+
+# Statuses a debate never leaves; anything else can be resumed.
+FINISHED_STATUSES = ("done", "error")
+STAGES = ("pro", "con", "judge")
+
+
+class DebateStore:
+    """Durable record of every debate: request, stage results and SSE events.
+
+    Events are appended in order with a per-debate sequence number, so a
+    client reconnecting with `Last-Event-ID` can be replayed exactly what it
+    missed, and a debate interrupted mid-way restarts from its saved stages.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_STORE_PATH) -> None:
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS debates ("
+            " id TEXT PRIMARY KEY,"
+            " request TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " pro TEXT,"
+            " con TEXT,"
+            " judge TEXT,"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS debate_events ("
+            " debate_id TEXT NOT NULL,"
+            " seq INTEGER NOT NULL,"
+            " event TEXT NOT NULL,"
+            " data TEXT NOT NULL,"
+            " PRIMARY KEY (debate_id, seq))"
+        )
+        self._conn.commit()
+
+    def create(self, debate_id: str, request: dict[str, Any]) -> None:
+        self.apply([("create", (debate_id, request))])
+
+    def append_event(self, debate_id: str, seq: int, event: str, data: str) -> None:
+        self.apply([("append_event", (debate_id, seq, event, data))])
+
+    def save_stage(self, debate_id: str, stage: str, result: Any) -> None:
+        self.apply([("save_stage", (debate_id, stage, result))])
+
+    def set_status(self, debate_id: str, status: str) -> None:
+        self.apply([("set_status", (debate_id, status))])
+
+    def apply(self, writes: list[tuple[str, tuple[Any, ...]]]) -> None:
+        """Run several writes (method name, args) in one transaction."""
+        with self._lock:
+            try:
+                for name, args in writes:
+                    getattr(self, f"_{name}")(*args)
+            except BaseException:
+                self._conn.rollback()
+                raise
+            self._conn.commit()
+
+    def _create(self, debate_id: str, request: dict[str, Any]) -> None:
+        now = time.time()
+        self._conn.execute(
+            "INSERT INTO debates (id, request, status, created_at, updated_at)"
+            " VALUES (?, ?, 'running', ?, ?)",
+            (debate_id, json.dumps(request, ensure_ascii=False), now, now),
+        )
+
+    def _append_event(self, debate_id: str, seq: int, event: str, data: str) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO debate_events (debate_id, seq, event, data)"
+            " VALUES (?, ?, ?, ?)",
+            (debate_id, seq, event, data),
+        )
+
+    def _save_stage(self, debate_id: str, stage: str, result: Any) -> None:
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage: {stage!r}")
+        self._conn.execute(
+            f"UPDATE debates SET {stage} = ?, updated_at = ? WHERE id = ?",
+            (json.dumps(result, ensure_ascii=False), time.time(), debate_id),
+        )
+
+    def _set_status(self, debate_id: str, status: str) -> None:
+        self._conn.execute(
+            "UPDATE debates SET status = ?, updated_at = ? WHERE id = ?",
+            (status, time.time(), debate_id),
+        )
+
+    def get(self, debate_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, request, status, pro, con, judge, created_at, updated_at"
+                " FROM debates WHERE id = ?",
+                (debate_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            last_seq = self._conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM debate_events WHERE debate_id = ?",
+                (debate_id,),
+            ).fetchone()[0]
+        return {
+            "id": row[0],
+            "request": json.loads(row[1]),
+            "status": row[2],
+            "stages": {
+                stage: json.loads(value)
+                for stage, value in zip(STAGES, row[3:6])
+                if value is not None
+            },
+            "created_at": row[6],
+            "updated_at": row[7],
+            "last_seq": last_seq,
+        }
+
+    def completed(self) -> list[dict[str, Any]]:
+        """Debates that reached `done`, oldest first, with the fields the similarity index needs."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, json_extract(request, '$.decision'),"
+                " json_extract(request, '$.context'), json_extract(request, '$.language'),"
+                " json_extract(judge, '$.decision'), created_at"
+                " FROM debates WHERE status = 'done' ORDER BY created_at"
+            ).fetchall()
+        return [
+            {
+                "id": row[0],
+                "decision": row[1] or "",
+                "context": row[2] or "",
+                "language": row[3] or "en",
+                "verdict": row[4],
+                "created_at": row[5],
+            }
+            for row in rows
+        ]
+
+    def events(self, debate_id: str, after_seq: int = 0) -> list[dict[str, str]]:
+        """Stored events after `after_seq`, shaped like the live SSE events."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, event, data FROM debate_events"
+                " WHERE debate_id = ? AND seq > ? ORDER BY seq",
+                (debate_id, after_seq),
+            ).fetchall()
+        return [
+            {"id": f"{debate_id}:{seq}", "event": event, "data": data}
+            for seq, event, data in rows
+        ]
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            by_status = dict(
+                self._conn.execute(
+                    "SELECT status, COUNT(*) FROM debates GROUP BY status"
+                ).fetchall()
+            )
+        return {"path": self.path, "debates": by_status}
+
+
+class StoreWriter:
+    """Applies store writes on one background thread, committing them in batches.
+
+    `submit` only enqueues, so the event loop never waits on SQLite, and
+    writes queued back to back share one transaction. `call` runs a function
+    on the same thread once everything before it is committed; `flush`
+    resolves once everything submitted before it is committed.
+    """
+
+    def __init__(self, store: DebateStore, max_batch: int = 256) -> None:
+        self.store = store
+        self.max_batch = max_batch
+        self.writes = 0
+        self.batches = 0
+        self.failed = 0
+        self._queue: queue.SimpleQueue[tuple[str, tuple[Any, ...]]] = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, name="debate-store-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, write: str, *args: Any) -> None:
+        """Queue a `DebateStore` write by name: create, append_event, save_stage or set_status."""
+        self._queue.put((write, args))
+
+    def call(self, function: Callable[..., Any], *args: Any) -> None:
+        self._queue.put(("call", (function, *args)))
+
+    async def flush(self) -> None:
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+        self._queue.put(("flush", (loop, done)))
+        await done
+
+    def _run(self) -> None:
+        while True:
+            items = [self._queue.get()]
+            while len(items) < self.max_batch:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            writes: list[tuple[str, tuple[Any, ...]]] = []
+            for kind, args in items:
+                if kind not in ("call", "flush"):
+                    writes.append((kind, args))
+                    continue
+                self._commit(writes)
+                writes = []
+                if kind == "call":
+                    try:
+                        args[0](*args[1:])
+                    except Exception:
+                        self.failed += 1
+                else:
+                    _resolve(*args)
+            self._commit(writes)
+
+    def _commit(self, writes: list[tuple[str, tuple[Any, ...]]]) -> None:
+        if not writes:
+            return
+        try:
+            self.store.apply(writes)
+        except Exception:
+            # One bad write must not take the rest of the batch with it.
+            for write in writes:
+                try:
+                    self.store.apply([write])
+                except Exception:
+                    self.failed += 1
+        self.writes += len(writes)
+        self.batches += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "queued": self._queue.qsize(),
+            "writes": self.writes,
+            "batches": self.batches,
+            "failed": self.failed,
+        }
+
+
+def _resolve(loop: asyncio.AbstractEventLoop, done: asyncio.Future[None]) -> None:
+    def _set() -> None:
+        if not done.done():
+            done.set_result(None)
+
+    try:
+        loop.call_soon_threadsafe(_set)
+    except RuntimeError:
+        # The waiting loop is already closed.
+        pass
+
+
+_store: DebateStore | None = None
+_writer: StoreWriter | None = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> DebateStore:
+    """Process-wide debate store at DEBATE_STORE_PATH (":memory:" keeps it in RAM)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = DebateStore(os.environ.get("DEBATE_STORE_PATH", DEFAULT_STORE_PATH))
+    return _store
+
+
+def get_store_writer() -> StoreWriter:
+    """Process-wide writer for `get_store()`."""
+    global _writer
+    if _writer is None:
+        store = get_store()
+        with _store_lock:
+            if _writer is None:
+                _writer = StoreWriter(store)
+    return _writer
@@ -0,0 +1,356 @@
+from __future__ import annotations
+
+import bisect
+import contextlib
+import contextvars
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Iterator
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+ATTEMPT_BUCKETS = (1, 2, 3, 4, 6, 9)
+RATIO_BUCKETS = (0.1, 0.25, 0.5, 0.75, 0.9, 1.0, 1.25, 1.5, 2.0)
+
+
+@dataclass
+class CallTelemetry:
+    """What one structured LLM call cost, across its retries and fallbacks.
+
+    `queue_seconds` is time spent waiting for the shared rate limiter,
+    `llm_seconds` time inside provider calls and `backoff_seconds` time
+    sleeping between retries.
+    """
+
+    requested_model: str
+    stage: str = "unknown"
+    model: str | None = None
+    outcome: str = "ok"
+    cache_hit: bool = False
+    streamed: bool = False
+    attempts: int = 0
+    validation_failures: int = 0
+    # Invalid responses salvaged without a full regeneration.
+    local_repairs: int = 0
+    prompt_repairs: int = 0
+    backoff_seconds: float = 0.0
+    queue_seconds: float = 0.0
+    llm_seconds: float = 0.0
+    total_seconds: float = 0.0
+    input_tokens: int = 0
+    # Part of `input_tokens` the provider served from its implicit context cache.
+    cached_input_tokens: int = 0
+    output_tokens: int = 0
+    # Output budget of one generation, and how often it was hit.
+    max_output_tokens: int = 0
+    truncations: int = 0
+    continuations: int = 0
+
+    @contextlib.contextmanager
+    def provider_time(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.llm_seconds += time.perf_counter() - started
+
+    def add_usage(self, response: Any) -> None:
+        usage = getattr(response, "usage_metadata", None)
+        if usage is None:
+            return
+        self.input_tokens += getattr(usage, "prompt_token_count", None) or 0
+        self.cached_input_tokens += getattr(usage, "cached_content_token_count", None) or 0
+        self.output_tokens += getattr(usage, "candidates_token_count", None) or 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            key: round(value, 4) if isinstance(value, float) else value
+            for key, value in asdict(self).items()
+        }
+
+
+def _label_text(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    escaped = (
+        value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        for value in values
+    )
+    pairs = ",".join(f'{name}="{value}"' for name, value in zip(names, escaped))
+    return "{" + pairs + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_text(self.labels, key)} {value:g}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self._lock:
+            self._values[key] = value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_text(self.labels, key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus exposition format."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = SECONDS_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket..., +Inf count], sum.
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._series.setdefault(
+                key, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[index] += 1
+            total[0] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip((*self.buckets, float("inf")), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    labels = _label_text((*self.labels, "le"), (*key, le))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                base = _label_text(self.labels, key)
+                lines.append(f"{self.name}_sum{base} {total[0]:.6f}")
+                lines.append(f"{self.name}_count{base} {cumulative}")
+        return lines
+
+
+LLM_CALLS = Counter(
+    "debate_llm_calls_total",
+    "Structured LLM calls by stage, model used and outcome.",
+    ("stage", "model", "outcome", "cache"),
+)
+LLM_FALLBACKS = Counter(
+    "debate_llm_fallbacks_total",
+    "Calls answered by a fallback model instead of the requested one.",
+    ("requested_model", "model"),
+)
+LLM_TOKENS = Counter(
+    "debate_llm_tokens_total", "Tokens reported by the provider.", ("model", "direction")
+)
+LLM_VALIDATION_FAILURES = Counter(
+    "debate_llm_validation_failures_total",
+    "Responses rejected as malformed or schema-invalid.",
+    ("stage",),
+)
+LLM_CALL_SECONDS = Histogram(
+    "debate_llm_call_seconds",
+    "Wall time of a structured call including retries and waits.",
+    ("stage", "outcome"),
+)
+LLM_PROVIDER_SECONDS = Histogram(
+    "debate_llm_provider_seconds", "Time spent inside provider requests per call.", ("model",)
+)
+LLM_QUEUE_SECONDS = Histogram(
+    "debate_llm_queue_wait_seconds", "Time spent waiting for the rate limiter per call.", ("model",)
+)
+LLM_BACKOFF_SECONDS = Histogram(
+    "debate_llm_backoff_seconds", "Time spent in retry backoff per call.", ("stage",)
+)
+LLM_ATTEMPTS = Histogram(
+    "debate_llm_attempts", "Provider attempts per call.", ("stage",), ATTEMPT_BUCKETS
+)
+LLM_RETRIES_AVOIDED = Counter(
+    "debate_llm_retries_avoided_total",
+    "Invalid responses repaired instead of regenerated, by repair method.",
+    ("stage", "method"),
+)
+LLM_TRUNCATIONS = Counter(
+    "debate_llm_truncations_total",
+    "Generations cut off at max_output_tokens, by how they were recovered.",
+    ("stage", "recovery"),
+)
+LLM_BUDGET_USED = Histogram(
+    "debate_llm_output_budget_ratio",
+    "Output tokens of a call relative to its max_output_tokens budget.",
+    ("stage",),
+    RATIO_BUCKETS,
+)
+ENSEMBLE_JUDGES = Counter(
+    "debate_ensemble_judges_total",
+    "Judge calls of ensemble verdicts by how they ended.",
+    ("outcome",),
+)
+ENSEMBLE_AGREEMENT = Histogram(
+    "debate_ensemble_agreement_ratio",
+    "Share of ensemble judges agreeing with the aggregated decision.",
+    (),
+    RATIO_BUCKETS,
+)
+STAGE_SECONDS = Histogram(
+    "debate_stage_seconds", "Duration of each debate stage.", ("stage",)
+)
+DEBATE_SECONDS = Histogram(
+    "debate_duration_seconds", "End-to-end debate duration.", ("outcome",)
+)
+ADMISSION_ACTIVE = Gauge("debate_admission_active", "Debates currently holding a run slot.")
+ADMISSION_QUEUED = Gauge("debate_admission_queued", "Debates waiting for a run slot.")
+ADMISSION_WAIT_SECONDS = Histogram(
+    "debate_admission_wait_seconds", "Time a debate waited in the admission queue."
+)
+ADMISSION_REJECTED = Counter(
+    "debate_admission_rejected_total",
+    "Debates rejected with 429 because the queue was full.",
+    ("reason",),
+)
+
+METRICS: tuple[Counter | Gauge | Histogram, ...] = (
+    LLM_CALLS,
+    LLM_FALLBACKS,
+    LLM_TOKENS,
+    LLM_VALIDATION_FAILURES,
+    LLM_RETRIES_AVOIDED,
+    LLM_TRUNCATIONS,
+    LLM_BUDGET_USED,
+    LLM_CALL_SECONDS,
+    LLM_PROVIDER_SECONDS,
+    LLM_QUEUE_SECONDS,
+    LLM_BACKOFF_SECONDS,
+    LLM_ATTEMPTS,
+    ENSEMBLE_JUDGES,
+    ENSEMBLE_AGREEMENT,
+    STAGE_SECONDS,
+    DEBATE_SECONDS,
+    ADMISSION_ACTIVE,
+    ADMISSION_QUEUED,
+    ADMISSION_WAIT_SECONDS,
+    ADMISSION_REJECTED,
+)
+
+
+def _observe_call(call: CallTelemetry) -> None:
+    model = call.model or call.requested_model
+    LLM_CALLS.inc(
+        stage=call.stage,
+        model=model,
+        outcome=call.outcome,
+        cache="hit" if call.cache_hit else "miss",
+    )
+    LLM_CALL_SECONDS.observe(call.total_seconds, stage=call.stage, outcome=call.outcome)
+    if call.cache_hit:
+        return
+    if call.model and call.model != call.requested_model:
+        LLM_FALLBACKS.inc(requested_model=call.requested_model, model=call.model)
+    LLM_TOKENS.inc(call.input_tokens, model=model, direction="input")
+    LLM_TOKENS.inc(call.cached_input_tokens, model=model, direction="cached_input")
+    LLM_TOKENS.inc(call.output_tokens, model=model, direction="output")
+    if call.validation_failures:
+        LLM_VALIDATION_FAILURES.inc(call.validation_failures, stage=call.stage)
+    if call.local_repairs:
+        LLM_RETRIES_AVOIDED.inc(call.local_repairs, stage=call.stage, method="local")
+    if call.prompt_repairs:
+        LLM_RETRIES_AVOIDED.inc(call.prompt_repairs, stage=call.stage, method="prompt")
+    LLM_PROVIDER_SECONDS.observe(call.llm_seconds, model=model)
+    LLM_QUEUE_SECONDS.observe(call.queue_seconds, model=model)
+    LLM_BACKOFF_SECONDS.observe(call.backoff_seconds, stage=call.stage)
+    LLM_ATTEMPTS.observe(call.attempts, stage=call.stage)
+    if call.max_output_tokens:
+        LLM_BUDGET_USED.observe(call.output_tokens / call.max_output_tokens, stage=call.stage)
+    if call.truncations:
+        recovered = min(call.truncations, call.continuations)
+        if recovered:
+            LLM_TRUNCATIONS.inc(recovered, stage=call.stage, recovery="continued")
+        if call.truncations > recovered:
+            LLM_TRUNCATIONS.inc(
+                call.truncations - recovered, stage=call.stage, recovery="regenerated"
+            )
+
+
+_collector: contextvars.ContextVar[list[CallTelemetry] | None] = contextvars.ContextVar(
+    "debate_call_collector", default=None
+)
+
+
+@contextlib.contextmanager
+def collect_calls(calls: list[CallTelemetry]) -> Iterator[list[CallTelemetry]]:
+    """Append every call finished in this context (and tasks it starts) to `calls`."""
+    token = _collector.set(calls)
+    try:
+        yield calls
+    finally:
+        _collector.reset(token)
+
+
+def record_call(call: CallTelemetry) -> None:
+    collector = _collector.get()
+    if collector is not None:
+        collector.append(call)
+    _observe_call(call)
+
+
+def summarise_calls(calls: list[CallTelemetry]) -> dict[str, Any]:
+    """Totals over a debate's calls, for the `timings` event."""
+    totals: dict[str, Any] = {
+        "calls": len(calls),
+        "cache_hits": sum(call.cache_hit for call in calls),
+        "attempts": sum(call.attempts for call in calls),
+        "validation_failures": sum(call.validation_failures for call in calls),
+        "retries_avoided": sum(call.local_repairs + call.prompt_repairs for call in calls),
+        "truncations": sum(call.truncations for call in calls),
+        "continuations": sum(call.continuations for call in calls),
+        "input_tokens": sum(call.input_tokens for call in calls),
+        "cached_input_tokens": sum(call.cached_input_tokens for call in calls),
+        "output_tokens": sum(call.output_tokens for call in calls),
+    }
+    for name in ("queue_seconds", "llm_seconds", "backoff_seconds"):
+        totals[name] = round(sum(getattr(call, name) for call in calls), 4)
+    return totals
+
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines: list[str] = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
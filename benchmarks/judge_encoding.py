@@ -0,0 +1,129 @@
+"""Compare judge input encodings: prompt tokens, judge latency and verdict drift.
+
+Usage:
+    python benchmarks/judge_encoding.py out.json
+    python benchmarks/judge_encoding.py out.json --count-tokens --runs 3 --output judge_encoding.json
+
+`out.json` is a saved debate (`agent-debate debate ... --save-json out.json`).
+Without `--count-tokens` token counts are estimated as characters / 4; with
+`--runs N` the judge is called N times per encoding (no cache) and its
+latency and agreement with the saved verdict are reported.
+"""
+
+from __future__ import annotations
+
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from agent_debate.llm import GeminiLLM, get_client
+from agent_debate.prompts import ARGUMENT_FIELDS, JUDGE_SYSTEM, judge_prompt
+from agent_debate.schemas import JudgeAssessment
+from agent_debate.scoring import build_verdict
+
+ENCODINGS = ("indented", "minified", "table")
+
+app = typer.Typer(add_completion=False)
+console = Console()
+
+
+def _count_tokens(text: str, model: str, exact: bool) -> int:
+    if not exact:
+        return len(text) // 4
+    return get_client().models.count_tokens(model=model, contents=text).total_tokens
+
+
+@app.command()
+def main(
+    debate_json: Path = typer.Argument(..., help="Saved debate from --save-json."),
+    model: Optional[str] = typer.Option(None, "--model", "-m", help="Override model ID."),
+    count_tokens: bool = typer.Option(
+        False, "--count-tokens", help="Use the Gemini count_tokens API."
+    ),
+    runs: int = typer.Option(0, "--runs", help="Judge calls per encoding (0 = none)."),
+    output: Optional[Path] = typer.Option(None, "--output", help="Write JSON results."),
+) -> None:
+    payload = json.loads(debate_json.read_text())
+    model_id = model or payload["model"]
+    baseline = payload.get("verdict") or {}
+
+    results: list[dict[str, Any]] = []
+    for fields in ARGUMENT_FIELDS:
+        for encoding in ENCODINGS:
+            prompt = judge_prompt(
+                payload["decision"],
+                payload["context"],
+                payload["pro_arguments"],
+                payload["con_arguments"],
+                encoding,
+                fields,
+            )
+            row: dict[str, Any] = {
+                "encoding": encoding,
+                "fields": fields,
+                "chars": len(prompt),
+                "input_tokens": _count_tokens(prompt, model_id, count_tokens),
+            }
+            latencies: list[float] = []
+            agree = 0
+            for _ in range(runs):
+                started = time.perf_counter()
+                assessment: JudgeAssessment = GeminiLLM(
+                    model=model_id
+                ).generate_structured(
+                    system=JUDGE_SYSTEM,
+                    user=prompt,
+                    schema=JudgeAssessment,
+                    max_output_tokens=2800,
+                )
+                verdict = build_verdict(assessment)
+                latencies.append(time.perf_counter() - started)
+                agree += int(
+                    verdict.decision == baseline.get("decision")
+                    and verdict.winner == baseline.get("winner")
+                )
+            if latencies:
+                row["judge_latency_p50"] = round(statistics.median(latencies), 3)
+                row["judge_latency_max"] = round(max(latencies), 3)
+                row["verdict_agreement"] = round(agree / runs, 3)
+            results.append(row)
+
+    reference = results[0]["input_tokens"] or 1
+    table = Table(title=f"Judge input encodings ({model_id})")
+    for column in ("encoding", "fields", "chars", "input_tokens", "saved"):
+        table.add_column(column, justify="right" if column != "encoding" else "left")
+    if runs:
+        table.add_column("p50 s", justify="right")
+        table.add_column("agree", justify="right")
+    for row in results:
+        cells = [
+            row["encoding"],
+            row["fields"],
+            str(row["chars"]),
+            str(row["input_tokens"]),
+            f"{1 - row['input_tokens'] / reference:.0%}",
+        ]
+        if runs:
+            cells += [f"{row['judge_latency_p50']:.2f}", f"{row['verdict_agreement']:.0%}"]
+        table.add_row(*cells)
+    console.print(table)
+
+    if output:
+        output.write_text(
+            json.dumps(
+                {"model": model_id, "exact_tokens": count_tokens, "runs": runs, "results": results},
+                ensure_ascii=False,
+                indent=2,
+            )
+        )
+        console.print(f"[dim]Results saved to {output}[/dim]")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,351 @@
+"""Benchmark suite on the fake LLM backend: hot-path microbenchmarks and an SSE load test.
+
+Usage:
+    python benchmarks/suite.py
+    python benchmarks/suite.py --connections 50 --requests 200 --latency-ms 400
+    python benchmarks/suite.py --skip-load --output /tmp/micro.jsonl
+    python benchmarks/suite.py --url http://localhost:8000 --skip-micro
+
+Without `--url` a uvicorn server is started with `DEBATE_LLM_BACKEND=fake` and
+the cache off, so every debate runs the full pipeline with no Gemini quota;
+its CPU and memory are sampled from /proc (Linux). Each run appends one JSON
+line (with the git commit) to `--output`, so results can be compared across
+commits.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import httpx
+import numpy as np
+import typer
+from rich.console import Console
+from rich.table import Table
+from sse_starlette.sse import ServerSentEvent
+
+from agent_debate.api import _event
+from agent_debate.fake import sample_output
+from agent_debate.llm import _parse_jsonish, _sanitize_response_schema
+from agent_debate.schemas import DebatePosition, JudgeAssessment, Verdict
+from agent_debate.scoring import build_verdict
+
+ROOT = Path(__file__).resolve().parent.parent
+
+app = typer.Typer(add_completion=False)
+console = Console()
+
+
+def _time_call(fn: Callable[[], Any], repeat: int) -> dict[str, float]:
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    runs = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    median = statistics.median(runs)
+    return {
+        "loops": number,
+        "median_us": round(median * 1e6, 3),
+        "best_us": round(min(runs) * 1e6, 3),
+        "ops_per_sec": round(1 / median, 1),
+    }
+
+
+def run_micro(repeat: int) -> dict[str, dict[str, float]]:
+    rng = random.Random(0)
+    position_json = json.dumps(sample_output(DebatePosition, rng))
+    assessment = JudgeAssessment.model_validate(sample_output(JudgeAssessment, rng))
+    verdict = build_verdict(assessment).model_dump()
+    verdict_json = json.dumps(verdict)
+    fenced = f"```json\n{verdict_json}\n```"
+    judge_schema = JudgeAssessment.model_json_schema()
+    result_event = _event("result", {"agent": "judge", "data": verdict})
+
+    cases: dict[str, Callable[[], Any]] = {
+        "parse_jsonish_position": lambda: _parse_jsonish(position_json),
+        "parse_jsonish_verdict": lambda: _parse_jsonish(verdict_json),
+        "parse_jsonish_fenced": lambda: _parse_jsonish(fenced),
+        "parse_jsonish_double_encoded": lambda: _parse_jsonish(json.dumps(verdict_json)),
+        "sanitize_response_schema": lambda: _sanitize_response_schema(judge_schema),
+        "verdict_validate": lambda: Verdict.model_validate(verdict),
+        "verdict_validate_json": lambda: Verdict.model_validate_json(verdict_json),
+        "sse_event_serialise": lambda: ServerSentEvent(
+            **_event("result", {"agent": "judge", "data": verdict})
+        ).encode(),
+        "sse_event_encode_only": lambda: ServerSentEvent(**result_event).encode(),
+    }
+    return {name: _time_call(fn, repeat) for name, fn in cases.items()}
+
+
+def _percentiles(values: list[float]) -> dict[str, float | None]:
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "p50": round(float(p50), 4),
+        "p95": round(float(p95), 4),
+        "p99": round(float(p99), 4),
+        "max": round(max(values), 4),
+    }
+
+
+def _proc_usage(pid: int) -> dict[str, float] | None:
+    """CPU seconds and resident memory of `pid` from /proc (Linux only)."""
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+        status = Path(f"/proc/{pid}/status").read_text().splitlines()
+    except OSError:
+        return None
+    ticks = os.sysconf("SC_CLK_TCK")
+    memory = {
+        line.split(":")[0]: int(line.split()[1]) / 1024
+        for line in status
+        if line.startswith(("VmRSS", "VmHWM"))
+    }
+    return {
+        # utime and stime are fields 14 and 15; the split starts at field 3.
+        "cpu_seconds": (int(stat[11]) + int(stat[12])) / ticks,
+        "rss_mb": round(memory.get("VmRSS", 0.0), 1),
+        "peak_rss_mb": round(memory.get("VmHWM", 0.0), 1),
+    }
+
+
+async def _one_debate(
+    client: httpx.AsyncClient, url: str, index: int, model: str
+) -> dict[str, Any]:
+    body = {
+        # Unique decisions so single-flight coalescing does not merge requests.
+        "decision": f"Benchmark decision #{index}",
+        "context": "Synthetic load test",
+        "model": model,
+        "cache": "bypass",
+        "backend": "fake",
+    }
+    started = time.perf_counter()
+    first_event: float | None = None
+    events = 0
+    last_event = ""
+    async with client.stream("POST", f"{url}/debate/stream", json=body) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if not line.startswith("event:"):
+                continue
+            if first_event is None:
+                first_event = time.perf_counter() - started
+            events += 1
+            last_event = line.split(":", 1)[1].strip()
+    return {
+        "ttfe": first_event,
+        "total": time.perf_counter() - started,
+        "events": events,
+        "ok": last_event == "done",
+    }
+
+
+async def run_load(
+    url: str, connections: int, requests: int, model: str, server_pid: int | None
+) -> dict[str, Any]:
+    semaphore = asyncio.Semaphore(connections)
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+
+    async def bounded(client: httpx.AsyncClient, index: int) -> dict[str, Any]:
+        async with semaphore:
+            try:
+                return await _one_debate(client, url, index, model)
+            except httpx.HTTPError as exc:
+                return {"ttfe": None, "total": None, "events": 0, "ok": False, "error": str(exc)}
+
+    before = _proc_usage(server_pid) if server_pid else None
+    started = time.perf_counter()
+    async with httpx.AsyncClient(timeout=None, limits=limits) as client:
+        results = await asyncio.gather(*(bounded(client, i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    after = _proc_usage(server_pid) if server_pid else None
+
+    ok = [r for r in results if r["ok"]]
+    events = sum(r["events"] for r in results)
+    report: dict[str, Any] = {
+        "connections": connections,
+        "requests": requests,
+        "succeeded": len(ok),
+        "failed": requests - len(ok),
+        "elapsed_seconds": round(elapsed, 3),
+        "debates_per_second": round(len(ok) / elapsed, 3),
+        "events_per_second": round(events / elapsed, 2),
+        "time_to_first_event": _percentiles([r["ttfe"] for r in ok if r["ttfe"] is not None]),
+        "debate_latency": _percentiles([r["total"] for r in ok]),
+        "server": None,
+    }
+    if before and after:
+        report["server"] = {
+            "cpu_seconds": round(after["cpu_seconds"] - before["cpu_seconds"], 3),
+            "cpu_percent": round(
+                (after["cpu_seconds"] - before["cpu_seconds"]) / elapsed * 100, 1
+            ),
+            "rss_mb": after["rss_mb"],
+            "peak_rss_mb": after["peak_rss_mb"],
+        }
+    return report
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(latency_ms: float, error_rate: float, seed: int) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "DEBATE_LLM_BACKEND": "fake",
+        "DEBATE_CACHE": "off",
+        "DEBATE_FAKE_LATENCY_MS": str(latency_ms),
+        # Split the error budget evenly across 429, 503 and malformed JSON.
+        "DEBATE_FAKE_429_RATE": str(error_rate / 3),
+        "DEBATE_FAKE_503_RATE": str(error_rate / 3),
+        "DEBATE_FAKE_MALFORMED_RATE": str(error_rate / 3),
+        "DEBATE_FAKE_SEED": str(seed),
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")])),
+    }
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "agent_debate.api:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("Benchmark server exited during startup.")
+        try:
+            httpx.get(f"{url}/cache/stats", timeout=1).raise_for_status()
+            return server, url
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("Benchmark server did not start within 30s.")
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@app.command()
+def main(
+    connections: int = typer.Option(20, "--connections", "-c", help="Concurrent SSE streams."),
+    requests: int = typer.Option(100, "--requests", "-n", help="Debates to run in total."),
+    latency_ms: float = typer.Option(300.0, "--latency-ms", help="Fake backend median latency."),
+    error_rate: float = typer.Option(
+        0.0, "--error-rate", help="Fake 429/503/malformed rate per call (split evenly)."
+    ),
+    seed: int = typer.Option(0, "--seed", help="Fake backend seed."),
+    model: str = typer.Option("gemini-3-flash-preview", "--model", help="Model ID in requests."),
+    repeat: int = typer.Option(5, "--repeat", help="Microbenchmark repeats."),
+    url: Optional[str] = typer.Option(
+        None, "--url", help="Use a running server instead of starting one."
+    ),
+    skip_micro: bool = typer.Option(False, "--skip-micro", help="Skip microbenchmarks."),
+    skip_load: bool = typer.Option(False, "--skip-load", help="Skip the load test."),
+    output: Path = typer.Option(
+        ROOT / "benchmarks" / "results.jsonl", "--output", help="JSONL file to append to."
+    ),
+) -> None:
+    record: dict[str, Any] = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "connections": connections,
+            "requests": requests,
+            "latency_ms": latency_ms,
+            "error_rate": error_rate,
+            "seed": seed,
+            "external_server": url is not None,
+        },
+        "micro": None,
+        "load": None,
+    }
+
+    if not skip_micro:
+        record["micro"] = run_micro(repeat)
+        table = Table(title="Microbenchmarks")
+        for column in ("case", "median µs", "best µs", "ops/s"):
+            table.add_column(column, justify="left" if column == "case" else "right")
+        for name, row in record["micro"].items():
+            table.add_row(
+                name, f"{row['median_us']:.2f}", f"{row['best_us']:.2f}", f"{row['ops_per_sec']:,.0f}"
+            )
+        console.print(table)
+
+    if not skip_load:
+        server = None
+        target = url
+        if target is None:
+            server, target = _start_server(latency_ms, error_rate, seed)
+        try:
+            record["load"] = asyncio.run(
+                run_load(target, connections, requests, model, server.pid if server else None)
+            )
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=10)
+        load = record["load"]
+        table = Table(title=f"Load: {connections} connections, {requests} debates")
+        table.add_column("metric")
+        for column in ("p50", "p95", "p99", "max"):
+            table.add_column(f"{column} s", justify="right")
+        for name in ("time_to_first_event", "debate_latency"):
+            table.add_row(name, *(str(load[name][column]) for column in ("p50", "p95", "p99", "max")))
+        console.print(table)
+        console.print(
+            f"ok {load['succeeded']}/{load['requests']}  "
+            f"{load['debates_per_second']} debates/s  {load['events_per_second']} events/s"
+        )
+        if load["server"]:
+            server_usage = load["server"]
+            console.print(
+                f"server cpu {server_usage['cpu_percent']}%  "
+                f"rss {server_usage['rss_mb']} MB (peak {server_usage['peak_rss_mb']} MB)"
+            )
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("a", encoding="utf-8") as sink:
+        sink.write(json.dumps(record, ensure_ascii=False) + "\n")
+    console.print(f"[dim]Results appended to {output}[/dim]")
+
+
+if __name__ == "__main__":
+    app()
@@ -1,21 +1,25 @@
 import { reactive } from 'vue'
 import type { DebateState } from '../types'
 
-function processSSEChunk(
-  rawChunk: string,
-  onEvent: (type: string, data: unknown) => void,
-) {
+type SSEHandler = (type: string, data: unknown, id: string | null) => void
+
+const MAX_RECONNECTS = 5
+
+function processSSEChunk(rawChunk: string, onEvent: SSEHandler) {
   const lines = rawChunk
     .split('\n')
     .map((line) => line.trimEnd())
     .filter((line) => line.length > 0)
 
   let eventType = 'message'
+  let eventId: string | null = null
   const dataLines: string[] = []
 
   for (const line of lines) {
     if (line.startsWith('event:')) {
       eventType = line.slice(6).trim()
+    } else if (line.startsWith('id:')) {
+      eventId = line.slice(3).trim()
     } else if (line.startsWith('data:')) {
       dataLines.push(line.slice(5).trimStart())
     }
@@ -24,16 +28,13 @@ function processSSEChunk(
   if (dataLines.length === 0) return
 
   try {
-    onEvent(eventType, JSON.parse(dataLines.join('\n')))
+    onEvent(eventType, JSON.parse(dataLines.join('\n')), eventId)
   } catch {
     // ignore malformed events and continue streaming
   }
 }
 
-async function readSSE(
-  response: Response,
-  onEvent: (type: string, data: unknown) => void,
-) {
+async function readSSE(response: Response, onEvent: SSEHandler) {
   const reader = response.body!.getReader()
   const decoder = new TextDecoder()
   let buffer = ''
@@ -71,6 +72,8 @@ export function useDebate() {
     conArgs: [],
     verdict: null,
     error: null,
+    queuePosition: null,
+    judgeProgress: null,
   })
 
   function reset() {
@@ -82,6 +85,8 @@ export function useDebate() {
     state.conArgs = []
     state.verdict = null
     state.error = null
+    state.queuePosition = null
+    state.judgeProgress = null
   }
 
   async function startDebate(
@@ -93,39 +98,73 @@ export function useDebate() {
     reset()
     state.phase = 'debating'
 
-    try {
-      const response = await fetch('/debate/stream', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ decision, context, model, language }),
-      })
-
-      if (!response.ok || !response.body) {
-        throw new Error(`HTTP ${response.status}`)
+    // Id of the last event received; a reconnect sends it so the server
+    // replays what was missed and continues the same debate.
+    let lastEventId: string | null = null
+    let finished = false
+
+    const onEvent: SSEHandler = (type, data: any, id) => {
+      if (id) lastEventId = id
+      if (type === 'progress' && data.agent === 'queue') {
+        state.queuePosition = data.status === 'queued' ? data.position : null
+      } else if (type === 'progress') {
+        // A resumed stage starts over, so drop its partial arguments.
+        if (data.agent === 'pro') { state.proStatus = 'thinking'; state.proArgs = [] }
+        else if (data.agent === 'con') { state.conStatus = 'thinking'; state.conArgs = [] }
+        else if (data.agent === 'judge') state.judgeStatus = 'thinking'
+      } else if (type === 'judge') {
+        state.judgeProgress = { completed: data.completed, judges: data.judges }
+      } else if (type === 'argument') {
+        // Streamed one by one; the final `result` event replaces the list.
+        if (data.agent === 'pro') state.proArgs = [...state.proArgs, data.data]
+        else if (data.agent === 'con') state.conArgs = [...state.conArgs, data.data]
+      } else if (type === 'result') {
+        if (data.agent === 'pro') { state.proArgs = data.data; state.proStatus = 'done' }
+        else if (data.agent === 'con') { state.conArgs = data.data; state.conStatus = 'done' }
+        else if (data.agent === 'judge') { state.verdict = data.data; state.judgeStatus = 'done' }
+      } else if (type === 'done') {
+        finished = true
+        state.phase = 'done'
+      } else if (type === 'error') {
+        finished = true
+        state.error = data.message
+        state.phase = 'error'
       }
+    }
 
-      await readSSE(response, (type, data: any) => {
-        if (type === 'progress') {
-          if (data.agent === 'pro') state.proStatus = 'thinking'
-          else if (data.agent === 'con') state.conStatus = 'thinking'
-          else if (data.agent === 'judge') state.judgeStatus = 'thinking'
-        } else if (type === 'result') {
-          if (data.agent === 'pro') { state.proArgs = data.data; state.proStatus = 'done' }
-          else if (data.agent === 'con') { state.conArgs = data.data; state.conStatus = 'done' }
-          else if (data.agent === 'judge') { state.verdict = data.data; state.judgeStatus = 'done' }
-        } else if (type === 'done') {
-          state.phase = 'done'
-        } else if (type === 'error') {
-          state.error = data.message
-          state.phase = 'error'
+    for (let attempt = 0; ; attempt++) {
+      try {
+        const headers: Record<string, string> = { 'Content-Type': 'application/json' }
+        if (lastEventId) headers['Last-Event-ID'] = lastEventId
+        const response = await fetch('/debate/stream', {
+          method: 'POST',
+          headers,
+          body: JSON.stringify({ decision, context, model, language }),
+        })
+
+        if (response.status === 429) {
+          const detail = await response.json().catch(() => null)
+          throw new Error(detail?.detail ?? 'HTTP 429')
+        }
+        if (!response.ok || !response.body) {
+          throw new Error(`HTTP ${response.status}`)
         }
-      })
 
-      if (state.error === null) state.phase = 'done'
-    } catch (err) {
-      state.error = err instanceof Error ? err.message : String(err)
-      state.phase = 'error'
+        await readSSE(response, onEvent)
+        if (finished || !lastEventId) break
+      } catch (err) {
+        // Only a dropped connection mid-debate is worth resuming.
+        if (!lastEventId || attempt >= MAX_RECONNECTS) {
+          state.error = err instanceof Error ? err.message : String(err)
+          state.phase = 'error'
+          return
+        }
+      }
+      if (attempt >= MAX_RECONNECTS) break
+      await new Promise((resolve) => setTimeout(resolve, 500 * 2 ** attempt))
     }
+
+    if (state.error === null) state.phase = 'done'
   }
 
   return { state, startDebate, reset }
@@ -127,6 +127,8 @@ const messages: Record<Locale, Messages> = {
       eyebrow: 'Execution Pipeline',
       title: 'Live agent progress',
       streamBadge: 'Streaming updates from backend',
+      queueBadge: 'Waiting in queue: #{position}',
+      judgesBadge: 'Judges done: {completed}/{judges}',
       agents: {
         pro: { label: 'PRO', title: 'Build upside case' },
         con: { label: 'CON', title: 'Stress downside' },
@@ -324,6 +326,8 @@ const messages: Record<Locale, Messages> = {
       eyebrow: 'Пайплайн выполнения',
       title: 'Прогресс агентов',
       streamBadge: 'Потоковые обновления с бэкенда',
+      queueBadge: 'Ожидание в очереди: №{position}',
+      judgesBadge: 'Судей закончили: {completed}/{judges}',
       agents: {
         pro: { label: 'ЗА', title: 'Собрать аргументы в пользу' },
         con: { label: 'ПРОТИВ', title: 'Проверить риски и минусы' },
@@ -25,6 +25,45 @@ export interface Verdict {
   next_48h_actions: string[]
   needs_more_info: boolean
   clarifying_questions: string[]
+  pro_total?: number | null
+  con_total?: number | null
+  // Present when several judges were aggregated into this verdict.
+  agreement?: EnsembleAgreement | null
+}
+
+export interface JudgeVote {
+  model: string
+  temperature: number
+  decision: Verdict['decision']
+  winner: Verdict['winner']
+  confidence: number
+  pro_total?: number | null
+  con_total?: number | null
+}
+
+export interface CriterionAgreement {
+  criterion: string
+  pro_mean: number
+  pro_median: number
+  pro_std: number
+  con_mean: number
+  con_median: number
+  con_std: number
+}
+
+export interface EnsembleAgreement {
+  judges: number
+  completed: number
+  failed: number
+  cancelled: number
+  quorum: number
+  quorum_decision: Verdict['decision'] | null
+  agreement: number
+  votes: Record<string, number>
+  pro_total_std: number
+  con_total_std: number
+  criteria: CriterionAgreement[]
+  members: JudgeVote[]
 }
 
 export type AgentStatus = 'idle' | 'thinking' | 'done'
@@ -39,4 +78,8 @@ export interface DebateState {
   conArgs: Argument[]
   verdict: Verdict | null
   error: string | null
+  // Place in the server's admission queue while waiting for a slot.
+  queuePosition: number | null
+  // Ensemble judging: judges finished so far out of those started.
+  judgeProgress: { completed: number; judges: number } | null
 }
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from agent_debate.admission import AdmissionController, AdmissionRejected
+
+
+def test_admits_up_to_max_active_then_queues() -> None:
+    controller = AdmissionController(max_active=2, max_queued=4)
+    first, second, third = (controller.enqueue("a") for _ in range(3))
+    assert first.admitted and second.admitted
+    assert not third.admitted and third.position() == 1
+    first.release(completed=True)
+    assert third.admitted
+    assert controller.active == 2
+
+
+def test_round_robin_across_clients() -> None:
+    controller = AdmissionController(max_active=1, max_queued=10, max_queued_per_client=10)
+    running = controller.enqueue("a")
+    burst = [controller.enqueue("a") for _ in range(3)]
+    other = controller.enqueue("b")
+    # b's single request is second in line despite arriving after a's burst.
+    assert [t.position() for t in burst] == [1, 3, 4]
+    assert other.position() == 2
+
+    order = []
+    current = running
+    for _ in range(4):
+        current.release(completed=True)
+        current = next(t for t in [*burst, other] if t.admitted and not t.released)
+        order.append(current)
+    assert order == [burst[0], other, burst[1], burst[2]]
+
+
+def test_rejects_when_queue_or_client_share_is_full() -> None:
+    controller = AdmissionController(max_active=1, max_queued=3, max_queued_per_client=2)
+    controller.enqueue("a")
+    controller.enqueue("a")
+    controller.enqueue("a")
+    with pytest.raises(AdmissionRejected) as client_full:
+        controller.enqueue("a")
+    assert client_full.value.reason == "client_queue_full"
+    controller.enqueue("b")
+    with pytest.raises(AdmissionRejected) as queue_full:
+        controller.enqueue("c")
+    assert queue_full.value.reason == "queue_full"
+    assert controller.rejected == 2
+    # Resumed debates skip the bounds.
+    assert not controller.enqueue("a", bounded=False).admitted
+
+
+def test_retry_after_scales_with_queue_and_duration() -> None:
+    controller = AdmissionController(max_active=2, max_queued=10)
+    assert controller.retry_after() == 30
+    for _ in range(5):
+        controller.enqueue("a", bounded=False)
+    # Three queued plus the caller make two rounds of two slots.
+    assert controller.retry_after() == 60
+
+
+def test_only_completed_runs_update_debate_duration() -> None:
+    controller = AdmissionController(max_active=2)
+    controller.enqueue("a").release()
+    assert controller.snapshot()["avg_debate_seconds"] == 30.0
+    controller.enqueue("a").release(completed=True)
+    assert controller.snapshot()["avg_debate_seconds"] < 30.0
+
+
+def test_leaving_the_queue_counts_as_abandoned() -> None:
+    controller = AdmissionController(max_active=1)
+    running = controller.enqueue("a")
+    waiting = controller.enqueue("b")
+    waiting.release()
+    waiting.release()
+    assert controller.abandoned == 1 and controller.queued == 0
+    running.release()
+    assert controller.active == 0
+
+
+def test_wait_reports_positions_until_admitted() -> None:
+    async def scenario() -> list[int]:
+        controller = AdmissionController(max_active=1)
+        running = controller.enqueue("a")
+        ahead = controller.enqueue("b")
+        ticket = controller.enqueue("c")
+        seen: list[int] = []
+
+        async def follow() -> None:
+            async for position in ticket.wait():
+                seen.append(position)
+
+        task = asyncio.ensure_future(follow())
+        await asyncio.sleep(0)
+        ahead.release()
+        await asyncio.sleep(0)
+        running.release()
+        await asyncio.wait_for(task, 1)
+        assert ticket.admitted
+        return seen
+
+    assert asyncio.run(scenario()) == [2, 1]
+
+
+def test_run_cancelled_before_it_starts_releases_its_ticket() -> None:
+    pytest.importorskip("fastapi")
+    from agent_debate import api
+
+    controller = AdmissionController(max_active=1)
+
+    async def scenario() -> None:
+        ticket = controller.enqueue("a")
+
+        async def source(token):
+            yield {"event": "done", "data": "{}"}
+
+        run = api._join("test:cancelled-early", "cancelled-early", source, lambda: ticket)
+        run.task.cancel()
+        await asyncio.wait({run.task})
+
+    asyncio.run(scenario())
+    assert controller.active == 0
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from agent_debate.batch import BatchItem, completed_ids, run_offline_batch
+from agent_debate.batch_jobs import BatchResult
+from agent_debate.budget import arguments_instruction, get_budget_planner
+from agent_debate.fake import FakeBatchBackend
+
+ITEMS = [BatchItem("a", "Adopt Rust for ingestion"), BatchItem("b", "Move to a four-day week")]
+
+
+def _keys(backend: FakeBatchBackend) -> list[list[str]]:
+    return [[request.key for request in requests] for _, requests in backend.submitted]
+
+
+def test_rerun_waits_on_submitted_jobs(tmp_path: Path) -> None:
+    output = tmp_path / "out.jsonl"
+    backend = FakeBatchBackend(polls_until_done=3)
+    with pytest.raises(TimeoutError):
+        run_offline_batch(ITEMS, output, model="m", backend=backend, poll_interval=0, timeout=0)
+    assert len(backend.submitted) == 1
+
+    summary = run_offline_batch(ITEMS, output, model="m", backend=backend, poll_interval=0)
+    assert summary.succeeded == 2
+    # Only the judge stage was submitted by the rerun.
+    assert _keys(backend)[1] == ["a:judge", "b:judge"]
+    assert completed_ids(output) == {"a", "b"}
+    assert not (tmp_path / "out.jsonl.batch.json").exists()
+
+
+def test_rerun_keeps_stage_one_results_when_jobs_are_gone(tmp_path: Path) -> None:
+    output = tmp_path / "out.jsonl"
+
+    class Interrupted(FakeBatchBackend):
+        def submit(self, model, requests):
+            job = super().submit(model, requests)
+            if requests[0].key.endswith(":judge"):
+                raise KeyboardInterrupt
+            return job
+
+    with pytest.raises(KeyboardInterrupt):
+        run_offline_batch(ITEMS, output, model="m", backend=Interrupted(), poll_interval=0)
+
+    # A fresh backend knows none of the old jobs.
+    backend = FakeBatchBackend()
+    summary = run_offline_batch(ITEMS, output, model="m", backend=backend, poll_interval=0)
+    assert summary.succeeded == 2
+    assert _keys(backend) == [["a:judge", "b:judge"]]
+
+
+def test_requests_use_the_budget_planner(tmp_path: Path) -> None:
+    backend = FakeBatchBackend()
+    run_offline_batch(ITEMS[:1], tmp_path / "out.jsonl", model="m", backend=backend, poll_interval=0)
+    planner = get_budget_planner()
+    advocate = planner.advocate(ITEMS[0].decision, ITEMS[0].context)
+    (_, stage_one), (_, stage_two) = backend.submitted
+    assert {request.max_output_tokens for request in stage_one} == {advocate.max_output_tokens}
+    assert all(
+        request.user.endswith(arguments_instruction(advocate.arguments)) for request in stage_one
+    )
+    assert stage_two[0].max_output_tokens == planner.judge().max_output_tokens
+
+
+def test_failed_judges_keep_their_positions_for_the_rerun(tmp_path: Path) -> None:
+    output = tmp_path / "out.jsonl"
+
+    class FailingJudge(FakeBatchBackend):
+        def results(self, job):
+            return [
+                BatchResult(key=result.key, error="quota")
+                if result.key == "b:judge"
+                else result
+                for result in super().results(job)
+            ]
+
+    summary = run_offline_batch(ITEMS, output, model="m", backend=FailingJudge(), poll_interval=0)
+    assert (summary.succeeded, summary.failed) == (1, 1)
+    assert (tmp_path / "out.jsonl.batch.json").exists()
+
+    backend = FakeBatchBackend()
+    summary = run_offline_batch(ITEMS, output, model="m", backend=backend, poll_interval=0)
+    assert summary.succeeded == 1
+    assert _keys(backend) == [["b:judge"]]
+    assert not (tmp_path / "out.jsonl.batch.json").exists()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from agent_debate.budget import (
+    FIXED_JUDGE_TOKENS,
+    MAX_ARGUMENTS,
+    MIN_ARGUMENTS,
+    MIN_SAMPLES,
+    BudgetPlanner,
+    argument_count,
+    arguments_instruction,
+)
+from agent_debate.cache import cache_key
+from agent_debate.schemas import DebatePosition
+from agent_debate.telemetry import CallTelemetry
+
+
+def _call(output_tokens: int) -> CallTelemetry:
+    return CallTelemetry(requested_model="m", attempts=1, output_tokens=output_tokens)
+
+
+def test_argument_count_stays_within_the_schema() -> None:
+    limit = DebatePosition.model_fields["arguments"].metadata
+    schema_max = next(rule.max_length for rule in limit if hasattr(rule, "max_length"))
+    counts = [argument_count("word " * words, "") for words in (1, 40, 150, 400, 5000)]
+    assert counts == sorted(counts)
+    assert counts[0] == MIN_ARGUMENTS
+    assert counts[-1] == MAX_ARGUMENTS <= schema_max
+
+
+def test_learned_budget_keeps_the_argument_count() -> None:
+    planner = BudgetPlanner()
+    before = planner.advocate("Adopt X?", "", "en")
+    for _ in range(MIN_SAMPLES):
+        planner.observe("argument", "en", _call(900))
+    after = planner.advocate("Adopt X?", "", "en")
+    assert after.max_output_tokens > before.max_output_tokens
+    assert after.arguments == before.arguments
+
+
+def test_judge_prior_is_not_below_the_fixed_budget() -> None:
+    planner = BudgetPlanner()
+    for language in ("en", "ru"):
+        assert planner.judge(language).max_output_tokens >= FIXED_JUDGE_TOKENS
+    # Observed usage still takes over once there is enough of it.
+    for _ in range(MIN_SAMPLES):
+        planner.observe("judge", "en", _call(1000))
+    assert planner.judge("en").max_output_tokens == 1300
+
+
+def test_cache_key_is_stable_per_input() -> None:
+    user = "Decision: Adopt X?" + arguments_instruction(argument_count("Adopt X?", ""))
+    key = cache_key(
+        model="m", system="s", user=user, schema=DebatePosition, temperature=0.2
+    )
+    again = cache_key(
+        model="m", system="s", user=f"  {user}\n", schema=DebatePosition, temperature=0.2
+    )
+    other = cache_key(
+        model="m", system="s", user=user, schema=DebatePosition, temperature=0.7
+    )
+    assert key == again
+    assert key != other
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from agent_debate.ensemble import (
+    MAX_TEMPERATURE,
+    MIN_TEMPERATURE,
+    JudgeSpec,
+    aggregate_verdicts,
+    judge_specs,
+    majority,
+    run_ensemble,
+)
+from agent_debate.schemas import DEFAULT_RUBRIC, JudgeAssessment
+from agent_debate.scoring import build_verdict
+
+N = len(DEFAULT_RUBRIC.names)
+
+
+def _verdict(pro: list[float], con: list[float], summary: str = "s") -> dict[str, Any]:
+    assessment = JudgeAssessment(
+        confidence=0.8,
+        summary=summary,
+        scorecard=[
+            {"criterion": name, "pro_score": p, "con_score": c, "rationale": f"{summary}:{name}"}
+            for name, p, c in zip(DEFAULT_RUBRIC.names, pro, con)
+        ],
+        key_risks=["r1", "r2"],
+        assumptions_to_verify=["a1"],
+        next_48h_actions=["n1", "n2"],
+        needs_more_info=False,
+        clarifying_questions=[],
+    )
+    return build_verdict(assessment).model_dump()
+
+
+def _judge(panel: dict[str, tuple[float, dict[str, Any] | Exception]]):
+    """Judge callable answering per model name after a delay, or raising."""
+
+    async def judge(spec: JudgeSpec) -> dict[str, Any]:
+        delay, result = panel[spec.model]
+        await asyncio.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return judge
+
+
+def _run(panel: dict[str, tuple[float, Any]], quorum: int):
+    specs = [JudgeSpec(model) for model in panel]
+    return asyncio.run(run_ensemble(specs, _judge(panel), quorum))
+
+
+def test_judge_specs_spread_temperatures_over_models() -> None:
+    specs = judge_specs(3, "m", ["a", "b"])
+    assert [spec.model for spec in specs] == ["a", "b", "a"]
+    assert [spec.temperature for spec in specs] == [MIN_TEMPERATURE, 0.6, MAX_TEMPERATURE]
+    assert judge_specs(1, "m") == [JudgeSpec("m")]
+    assert [majority(judges) for judges in (1, 2, 3, 5, 7)] == [1, 2, 2, 3, 4]
+
+
+def test_aggregate_takes_per_criterion_medians() -> None:
+    run = _run(
+        {
+            "a": (0.0, _verdict([6.0] * N, [5.0] * N)),
+            "b": (0.0, _verdict([9.0] * N, [4.0] * N)),
+            "c": (0.0, _verdict([8.0] * N, [2.0] * N)),
+        },
+        quorum=3,
+    )
+    verdict = aggregate_verdicts(run)
+    assert [row.pro_score for row in verdict.scorecard] == [8.0] * N
+    assert [row.con_score for row in verdict.scorecard] == [4.0] * N
+    assert (verdict.pro_total, verdict.con_total) == (8.0, 4.0)
+    assert (verdict.winner, verdict.decision) == ("pro", "go")
+    agreement = verdict.agreement
+    assert agreement.completed == 3
+    assert agreement.votes == {"go": 3}
+    assert agreement.agreement == 1.0
+    assert agreement.criteria[0].pro_median == 8.0
+    assert agreement.criteria[0].pro_mean == pytest.approx(7.6667)
+
+
+def test_quorum_cancels_the_remaining_judges() -> None:
+    go = _verdict([8.0] * N, [5.0] * N)
+    run = _run(
+        {"a": (0.0, go), "b": (0.01, go), "c": (5.0, _verdict([2.0] * N, [8.0] * N))},
+        quorum=2,
+    )
+    assert run.quorum_decision == "go"
+    assert (len(run.outcomes), run.cancelled) == (2, 1)
+    assert aggregate_verdicts(run).decision == "go"
+
+
+def test_quorum_waits_until_the_median_agrees() -> None:
+    # b and c vote go on disjoint criteria; with a's no_go the per-criterion
+    # median is a tie, so two go votes alone must not stop the ensemble.
+    first = [9.0] * 4 + [5.0] * (N - 4)
+    second = [5.0] * 4 + [9.0] * (N - 4)
+    run = _run(
+        {
+            "a": (0.0, _verdict([3.0] * N, [7.0] * N)),
+            "b": (0.01, _verdict(first, [5.0] * N)),
+            "c": (0.02, _verdict(second, [5.0] * N)),
+            "d": (0.05, _verdict([9.0] * N, [5.0] * N)),
+        },
+        quorum=2,
+    )
+    assert run.cancelled == 0
+    assert len(run.outcomes) == 4
+    assert run.quorum_decision == aggregate_verdicts(run).decision == "go"
+
+
+def test_representative_is_the_closest_agreeing_judge() -> None:
+    run = _run(
+        {
+            "a": (0.0, _verdict([9.0] * N, [3.0] * N, "far")),
+            "b": (0.0, _verdict([8.0] * N, [4.0] * N, "near")),
+            "c": (0.0, _verdict([4.0] * N, [6.0] * N, "dissent")),
+        },
+        quorum=3,
+    )
+    verdict = aggregate_verdicts(run)
+    assert verdict.decision == "go"
+    assert verdict.summary == "near"
+    assert verdict.scorecard[0].rationale.startswith("near:")
+    assert verdict.confidence == pytest.approx(0.8 * 2 / 3, abs=1e-4)
+
+
+def test_failed_judges_are_skipped() -> None:
+    run = _run(
+        {
+            "a": (0.0, RuntimeError("boom")),
+            "b": (0.0, _verdict([8.0] * N, [5.0] * N)),
+            "c": (0.0, _verdict([7.0] * N, [5.0] * N)),
+        },
+        quorum=3,
+    )
+    assert (run.failed, len(run.outcomes)) == (1, 2)
+    assert aggregate_verdicts(run).agreement.failed == 1
+
+
+def test_all_judges_failing_raises() -> None:
+    with pytest.raises(RuntimeError, match="boom"):
+        _run({"a": (0.0, RuntimeError("boom")), "b": (0.01, ValueError("late"))}, quorum=1)
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import pytest
+
+from agent_debate import llm
+from agent_debate.fake import FakeLLMBackend, FakeProfile
+from agent_debate.graph import build_graph, initial_state
+
+
+@pytest.fixture(autouse=True)
+def fast_fake(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(llm, "_fake_backend", FakeLLMBackend(FakeProfile(latency_ms=0)))
+
+
+def _steps(parallel: bool, rounds: int) -> tuple[list[str], dict]:
+    graph = build_graph(parallel=parallel)
+    state = initial_state("Adopt X?", "", "m", backend="fake", rounds=rounds, cache="bypass")
+    steps = [node for update in graph.stream(state, stream_mode="updates") for node in update]
+    return steps, graph.invoke(state)
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_single_round_goes_straight_to_the_judge(parallel: bool) -> None:
+    steps, result = _steps(parallel, rounds=1)
+    assert sorted(steps[:2]) == ["con", "pro"]
+    assert steps[2:] == ["judge"]
+    assert result["verdict"] and result["rounds_history"] == []
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_rebuttal_rounds_close_with_the_round_node(parallel: bool) -> None:
+    steps, result = _steps(parallel, rounds=2)
+    assert steps.count("round") == 2
+    assert steps.count("judge") == 1 and steps[-1] == "judge"
+    assert steps.count("pro") == steps.count("con") == 2
+    assert len(result["rounds_history"]) == 2
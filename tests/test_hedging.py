@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+
+import pytest
+
+from agent_debate.fake import FakeLLMBackend, FakeProfile
+from agent_debate.llm import GeminiLLM, HedgePolicy
+from agent_debate.resilience import get_circuit_breaker, get_rate_limiter
+from agent_debate.schemas import DebatePosition
+
+PRIMARY = "hedge-primary"
+SECONDARY = "gemini-2.5-flash"  # the first fallback model, which hedges take
+_names = itertools.count()
+
+
+class _SlowModels(FakeLLMBackend):
+    """Fake backend with a fixed latency per model, recording starts and cancellations."""
+
+    def __init__(self, latencies: dict[str, float]) -> None:
+        super().__init__(FakeProfile(latency_ms=0))
+        # A fresh name per test keeps breakers and limiters (`<name>:<model>`) apart.
+        self.name = f"hedge{next(_names)}"
+        self.latencies = latencies
+        self.started: dict[str, float] = {}
+        self.cancelled: list[str] = []
+
+    async def agenerate(self, model, contents, config):
+        self.started[model] = time.monotonic()
+        try:
+            await asyncio.sleep(self.latencies[model])
+        except asyncio.CancelledError:
+            self.cancelled.append(model)
+            raise
+        return await super().agenerate(model, contents, config)
+
+
+def _run(backend: _SlowModels, delay: float) -> tuple[GeminiLLM, float]:
+    hedge = HedgePolicy(after_seconds=delay)
+    client = GeminiLLM(model=PRIMARY, backend=backend, hedge=hedge)
+
+    async def scenario() -> float:
+        started = time.monotonic()
+        await client.agenerate_structured("system", "user", DebatePosition)
+        return started
+
+    return client, asyncio.run(scenario())
+
+
+def test_fast_primary_is_not_hedged() -> None:
+    backend = _SlowModels({PRIMARY: 0.01, SECONDARY: 0.01})
+    client, _ = _run(backend, delay=0.2)
+    assert list(backend.started) == [PRIMARY]
+    assert (client.hedge.fired, client.hedge.won) == (0, 0)
+    assert client.last_call.model == PRIMARY
+
+
+def test_hedge_fires_after_the_delay_and_cancels_the_loser() -> None:
+    backend = _SlowModels({PRIMARY: 5.0, SECONDARY: 0.01})
+    client, started = _run(backend, delay=0.1)
+    assert backend.started[SECONDARY] - started >= 0.1
+    assert backend.cancelled == [PRIMARY]
+    assert (client.hedge.fired, client.hedge.won) == (1, 1)
+    call = client.last_call
+    assert (call.model, call.attempts) == (SECONDARY, 2)
+
+
+def test_losing_primary_is_not_a_breaker_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DEBATE_RPM", "60")
+    backend = _SlowModels({PRIMARY: 5.0, SECONDARY: 0.01})
+    _run(backend, delay=0.05)
+    for model in (PRIMARY, SECONDARY):
+        breaker = get_circuit_breaker(f"{backend.name}:{model}")
+        assert (breaker.state, breaker.failures) == ("closed", 0)
+        # One request taken from each model's budget, not two.
+        requests = get_rate_limiter(f"{backend.name}:{model}").snapshot()["requests"]
+        assert 59 <= requests["available"] < 59.5
+
+
+def test_cancelled_hedge_releases_its_probe() -> None:
+    backend = _SlowModels({PRIMARY: 0.3, SECONDARY: 5.0})
+    secondary = get_circuit_breaker(f"{backend.name}:{SECONDARY}")
+    secondary.reset_seconds = 0
+    for _ in range(secondary.failure_threshold):
+        secondary.record_failure()
+    client, _ = _run(backend, delay=0.05)
+    assert backend.cancelled == [SECONDARY]
+    assert (client.hedge.fired, client.hedge.won) == (1, 0)
+    assert client.last_call.model == PRIMARY
+    # The cancelled probe is no longer in flight: the next caller may probe again.
+    assert secondary.state == "half_open"
+    assert secondary.allow()
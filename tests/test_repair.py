@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from typing import Any
+
+import pytest
+
+from agent_debate import fake, llm
+from agent_debate.fake import FakeLLMBackend, sample_output
+from agent_debate.llm import GeminiLLM
+from agent_debate.repair import repair_locally
+from agent_debate.schemas import DEFAULT_RUBRIC, DebatePosition, JudgeAssessment
+
+
+def _assessment() -> dict[str, Any]:
+    return sample_output(JudgeAssessment, random.Random(0))
+
+
+def test_long_lists_are_truncated_to_the_schema() -> None:
+    position = sample_output(DebatePosition, random.Random(0), arguments=8)
+    position["arguments"] *= 2
+    fixed = repair_locally(position, DebatePosition)
+    assert fixed is not None and len(fixed.arguments) == 8
+
+    assessment = _assessment()
+    assessment["key_risks"] = [f"Risk {i}" for i in range(12)]
+    fixed = repair_locally(assessment, JudgeAssessment)
+    assert fixed is not None and fixed.key_risks == [f"Risk {i}" for i in range(8)]
+
+
+def test_needs_more_info_follows_the_questions() -> None:
+    assessment = {**_assessment(), "needs_more_info": True, "clarifying_questions": []}
+    fixed = repair_locally(assessment, JudgeAssessment)
+    assert fixed is not None and fixed.needs_more_info is False
+
+
+def test_criterion_names_snap_to_the_rubric() -> None:
+    assessment = _assessment()
+    rows = assessment["scorecard"]
+    rows[1]["criterion"] = "cost / time"
+    rows[2]["criterion"] = " RISK/UNCERTAINTY "
+    rows.append({**rows[0], "criterion": "Feasability"})  # duplicate of row 0
+    rows.append({**rows[0], "criterion": "Team morale"})  # not in the rubric
+    fixed = repair_locally(assessment, JudgeAssessment)
+    assert fixed is not None
+    assert [row.criterion for row in fixed.scorecard] == DEFAULT_RUBRIC.names
+    assert fixed.scorecard[0] == JudgeAssessment.model_validate(_assessment()).scorecard[0]
+
+
+def test_unfixable_data_is_left_to_the_model() -> None:
+    assessment = _assessment()
+    assessment["scorecard"].pop()
+    assert repair_locally(assessment, JudgeAssessment) is None
+    assert repair_locally(["not", "an", "object"], JudgeAssessment) is None
+
+
+@pytest.fixture
+def broken(monkeypatch: pytest.MonkeyPatch):
+    """Fake backend whose first `n` answers break the schema in a chosen way."""
+    monkeypatch.setenv("DEBATE_FAKE_INVALID_RATE", "1")
+    monkeypatch.setenv("DEBATE_FAKE_LATENCY_MS", "0")
+    monkeypatch.setattr(llm, "_backoff_delay", lambda attempt: 0.0)
+
+    def make(mistake: str, n: int) -> FakeLLMBackend:
+        remaining = [n]
+
+        def invalidate(payload: dict[str, Any], rng: random.Random) -> dict[str, Any]:
+            if remaining[0] <= 0:
+                return payload
+            remaining[0] -= 1
+            if mistake == "long_list":
+                payload["key_risks"] = [f"Risk {i}" for i in range(12)]
+            else:
+                payload["scorecard"].pop()
+            return payload
+
+        monkeypatch.setattr(fake, "invalidate_output", invalidate)
+        return FakeLLMBackend.from_env()
+
+    return make
+
+
+def _judge(backend: FakeLLMBackend, model: str, *, run_async: bool = False) -> GeminiLLM:
+    client = GeminiLLM(model=model, backend=backend, stage="judge")
+    if run_async:
+        asyncio.run(client.agenerate_structured("system", "user", JudgeAssessment))
+    else:
+        client.generate_structured("system", "user", JudgeAssessment)
+    return client
+
+
+@pytest.mark.parametrize("run_async", [False, True])
+def test_local_repair_needs_no_second_call(broken, run_async: bool) -> None:
+    backend = broken("long_list", 1)
+    call = _judge(backend, f"repair-local-{run_async}", run_async=run_async).last_call
+    assert backend.calls == 1
+    assert (call.attempts, call.local_repairs, call.prompt_repairs) == (1, 1, 0)
+
+
+@pytest.mark.parametrize("run_async", [False, True])
+def test_model_repair_sends_only_the_errors(broken, run_async: bool) -> None:
+    backend = broken("missing_row", 1)
+    call = _judge(backend, f"repair-model-{run_async}", run_async=run_async).last_call
+    assert backend.calls == 2
+    assert (call.attempts, call.local_repairs, call.prompt_repairs) == (2, 0, 1)
+
+
+@pytest.mark.parametrize("run_async", [False, True])
+def test_failed_repair_falls_back_to_regeneration(broken, run_async: bool) -> None:
+    # The first answer and its repair are both broken; the regeneration is not.
+    backend = broken("missing_row", 2)
+    call = _judge(backend, f"repair-regen-{run_async}", run_async=run_async).last_call
+    assert backend.calls == 3
+    assert (call.attempts, call.prompt_repairs) == (3, 0)
+    assert call.validation_failures >= 1
+
+
+def test_repair_off_regenerates(broken, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DEBATE_REPAIR", "off")
+    backend = broken("long_list", 1)
+    call = _judge(backend, "repair-off").last_call
+    assert backend.calls == 2
+    assert (call.attempts, call.local_repairs, call.prompt_repairs) == (2, 0, 0)
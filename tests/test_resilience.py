@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from agent_debate.llm import GeminiLLM
+from agent_debate.resilience import (
+    CircuitBreaker,
+    ModelRateLimiter,
+    TokenBucket,
+    get_circuit_breaker,
+)
+from agent_debate.schemas import DebatePosition
+
+
+def _tripped(**kwargs: float) -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=2, **kwargs)
+    breaker.record_failure()
+    breaker.record_failure()
+    return breaker
+
+
+def test_unlimited_bucket_never_waits() -> None:
+    bucket = TokenBucket(0)
+    assert all(bucket.reserve(1000) == 0.0 for _ in range(10))
+
+
+def test_bucket_waits_for_refill_in_arrival_order() -> None:
+    bucket = TokenBucket(60)  # one unit per second
+    assert bucket.reserve(60) == 0.0
+    first = bucket.reserve(1)
+    second = bucket.reserve(1)
+    assert first == pytest.approx(1.0, abs=0.05)
+    assert second == pytest.approx(2.0, abs=0.05)
+
+
+def test_limiter_takes_the_longer_wait_and_counts_throttling() -> None:
+    limiter = ModelRateLimiter(requests_per_minute=600, tokens_per_minute=60)
+    assert limiter.reserve(60) == 0.0
+    assert limiter.reserve(30) == pytest.approx(30.0, abs=0.05)
+    assert limiter.throttled == 1
+
+
+def test_breaker_opens_after_consecutive_failures() -> None:
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.snapshot()["rejected"] == 1
+
+
+def test_half_open_lets_one_probe_through() -> None:
+    breaker = _tripped(reset_seconds=0)
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow() and breaker.allow()
+
+
+def test_failed_probe_reopens() -> None:
+    breaker = _tripped(reset_seconds=0.05)
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.times_opened == 2
+    assert not breaker.allow()
+
+
+def test_released_probe_can_be_retaken() -> None:
+    breaker = _tripped(reset_seconds=0)
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_stale_probe_expires() -> None:
+    breaker = _tripped(reset_seconds=0, probe_timeout_seconds=0.05)
+    assert breaker.allow()
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()
+
+
+class _HangingBackend:
+    name = "hanging"
+
+    def __init__(self) -> None:
+        self.entered = asyncio.Event()
+
+    async def agenerate(self, model, contents, config):
+        self.entered.set()
+        await asyncio.Event().wait()
+
+
+def test_cancelled_probe_is_released() -> None:
+    model = "probe-cancel-test"
+    breaker = get_circuit_breaker(f"hanging:{model}")
+    breaker.reset_seconds = 0
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    async def scenario() -> None:
+        backend = _HangingBackend()
+        llm = GeminiLLM(model=model, backend=backend)
+        task = asyncio.ensure_future(
+            llm.agenerate_structured("system", "user", DebatePosition)
+        )
+        await backend.entered.wait()
+        assert not breaker.allow()  # the cancelled call holds the probe
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    assert breaker.state == "half_open"
+    assert breaker.allow()
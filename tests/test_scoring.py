@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from agent_debate.schemas import DEFAULT_RUBRIC, JudgeAssessment
+from agent_debate.scoring import (
+    DECISIONS,
+    WINNERS,
+    build_verdict,
+    outcome_codes,
+    score_matrix,
+    weighted_totals,
+)
+
+
+def _names(pro_total: float, con_total: float, tie: float = 0.1, go: float = 0.75):
+    winner, decision = outcome_codes(pro_total, con_total, tie, go)
+    return str(WINNERS[int(winner) + 1]), str(DECISIONS[int(decision) + 1])
+
+
+@pytest.mark.parametrize(
+    ("pro", "con", "expected"),
+    [
+        (6.0, 6.0, ("tie", "conditional_go")),
+        (6.09, 6.0, ("tie", "conditional_go")),
+        (6.15, 6.0, ("pro", "conditional_go")),
+        (6.74, 6.0, ("pro", "conditional_go")),
+        (6.75, 6.0, ("pro", "go")),
+        (6.0, 6.75, ("con", "no_go")),
+        (6.0, 6.5, ("con", "conditional_go")),
+    ],
+)
+def test_outcome_margins(pro: float, con: float, expected: tuple[str, str]) -> None:
+    assert _names(pro, con) == expected
+
+
+def test_outcome_codes_are_vectorised() -> None:
+    winner, decision = outcome_codes(
+        np.array([7.0, 5.0, 5.0]), np.array([5.0, 7.0, 5.05]), 0.1, 0.75
+    )
+    assert winner.tolist() == [1, -1, 0]
+    assert decision.tolist() == [1, -1, 0]
+
+
+def test_weighted_totals_for_one_and_many_weight_vectors() -> None:
+    pro, con = np.array([10.0, 0.0]), np.array([0.0, 10.0])
+    assert [float(t) for t in weighted_totals(np.array([0.7, 0.3]), pro, con)] == [7.0, 3.0]
+    pro_totals, con_totals = weighted_totals(np.array([[1.0, 0.0], [0.5, 0.5]]), pro, con)
+    assert pro_totals.tolist() == [10.0, 5.0]
+    assert con_totals.tolist() == [0.0, 5.0]
+
+
+def _assessment(pro: list[float], con: list[float]) -> JudgeAssessment:
+    names = DEFAULT_RUBRIC.names
+    return JudgeAssessment(
+        confidence=0.7,
+        summary="s",
+        # Reversed and recased: rows are matched by name, not position.
+        scorecard=[
+            {"criterion": name.upper(), "pro_score": p, "con_score": c, "rationale": name}
+            for name, p, c in reversed(list(zip(names, pro, con)))
+        ],
+        key_risks=["r1", "r2"],
+        assumptions_to_verify=["a1"],
+        next_48h_actions=["n1", "n2"],
+        needs_more_info=False,
+        clarifying_questions=[],
+    )
+
+
+def test_score_matrix_aligns_to_rubric_order() -> None:
+    scores = [float(i) for i in range(len(DEFAULT_RUBRIC.names))]
+    pro, con = score_matrix(_assessment(scores, scores[::-1]).scorecard)
+    assert pro.tolist() == scores
+    assert con.tolist() == scores[::-1]
+
+
+def test_build_verdict_recomputes_totals_and_decision() -> None:
+    n = len(DEFAULT_RUBRIC.names)
+    verdict = build_verdict(_assessment([8.0] * n, [6.0] * n))
+    assert (verdict.pro_total, verdict.con_total) == (8.0, 6.0)
+    assert (verdict.winner, verdict.decision) == ("pro", "go")
+    assert [row.criterion for row in verdict.scorecard] == DEFAULT_RUBRIC.names
+    assert [row.weight for row in verdict.scorecard] == DEFAULT_RUBRIC.weights
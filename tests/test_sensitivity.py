@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from agent_debate.schemas import DEFAULT_RUBRIC, JudgeAssessment, Rubric
+from agent_debate.scoring import build_verdict
+from agent_debate.sensitivity import grid_units, grid_weights, one_at_a_time, run_sensitivity
+
+
+@pytest.mark.parametrize(("criteria", "step"), [(2, 0.5), (3, 0.1), (7, 0.1)])
+def test_grid_covers_the_simplex(criteria: int, step: float) -> None:
+    weights = grid_weights(criteria, step)
+    units = round(1 / step)
+    assert len(weights) == math.comb(units + criteria - 1, criteria - 1)
+    assert np.allclose(weights.sum(axis=1), 1.0)
+    assert weights.min() >= 0.0
+    assert len(np.unique(weights, axis=0)) == len(weights)
+
+
+@pytest.mark.parametrize("step", [0.3, 0.15, 0.07])
+def test_grid_rejects_steps_that_do_not_divide_one(step: float) -> None:
+    with pytest.raises(ValueError, match="divide 1"):
+        grid_weights(3, step)
+
+
+def test_grid_units_for_valid_steps() -> None:
+    assert [grid_units(step) for step in (0.05, 0.1, 0.125, 0.25, 0.5)] == [20, 10, 8, 4, 2]
+
+
+def test_one_at_a_time_boundaries_sit_on_the_margins() -> None:
+    base = np.array([0.5, 0.3, 0.2])
+    pro = np.array([9.0, 4.0, 5.0])
+    con = np.array([4.0, 8.0, 6.0])
+    rubric = Rubric(
+        criteria=[{"name": name, "weight": float(w)} for name, w in zip("abc", base)],
+        tie_margin=0.1,
+        go_margin=0.75,
+    )
+    report = one_at_a_time(base, pro, con, rubric)
+    assert any(entry["decision_boundaries"] for entry in report)
+    levels = {"winner": 0.1, "decision": 0.75}
+    for i, entry in enumerate(report):
+        for kind, level in levels.items():
+            for t in entry[f"{kind}_boundaries"]:
+                weights = base * (1 - t) / (1 - base[i])
+                weights[i] = t
+                margin = weights @ (pro - con)
+                assert abs(abs(margin) - level) < 1e-3
+
+
+def _verdict(pro: list[float], con: list[float]):
+    return build_verdict(
+        JudgeAssessment(
+            confidence=0.7,
+            summary="s",
+            scorecard=[
+                {"criterion": name, "pro_score": p, "con_score": c, "rationale": name}
+                for name, p, c in zip(DEFAULT_RUBRIC.names, pro, con)
+            ],
+            key_risks=["r1", "r2"],
+            assumptions_to_verify=["a1"],
+            next_48h_actions=["n1", "n2"],
+            needs_more_info=False,
+            clarifying_questions=[],
+        )
+    )
+
+
+def test_uniform_lead_never_flips() -> None:
+    n = len(DEFAULT_RUBRIC.names)
+    report = run_sensitivity(_verdict([8.0] * n, [5.0] * n), samples=500)
+    assert report["base"]["decision"] == "go"
+    for sweep in ("grid", "dirichlet"):
+        assert report[sweep]["decision_flip_rate"] == 0.0
+        assert report[sweep]["nearest_decision_flip"] is None
+
+
+def test_close_call_reports_nearest_flip() -> None:
+    pro = [9.0, 3.0, 6.0, 6.0, 6.0, 6.0, 6.0]
+    con = [3.0, 9.0, 6.0, 6.0, 6.0, 6.0, 6.0]
+    report = run_sensitivity(_verdict(pro, con), samples=500, seed=1)
+    grid = report["grid"]
+    assert 0.0 < grid["decision_flip_rate"] < 1.0
+    assert sum(grid["decisions"].values()) == grid["samples"]
+    nearest = grid["nearest_decision_flip"]
+    assert nearest is not None and nearest["decision"] != report["base"]["decision"]
+    again = run_sensitivity(_verdict(pro, con), samples=500, seed=1)
+    assert again["dirichlet"] == report["dirichlet"]
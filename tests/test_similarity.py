@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import math
+import time
+
+import pytest
+
+from agent_debate.similarity import SimilarityIndex, features
+
+
+@pytest.fixture
+def index() -> SimilarityIndex:
+    index = SimilarityIndex()
+    now = time.time()
+    index.add("k8s", "Should we migrate our services to Kubernetes?", created_at=now - 60)
+    index.add("pg", "Should we move the billing database to PostgreSQL?", "Oracle licence", "en")
+    index.add("ru", "Стоит ли переносить сервисы в Kubernetes?", language="ru", verdict="go")
+    index.add("old", "Should we migrate our services to Kubernetes?", created_at=now - 90 * 86400)
+    index.add("hiring", "Should we hire a second designer this quarter?")
+    return index
+
+
+def test_features_index_prefixes_and_weight_context() -> None:
+    terms = features("Migration plan", "migration")
+    assert terms["migration"] == pytest.approx(1.0 + math.log(1.5))
+    assert "migra~" in terms
+    assert "plan" in terms and "plan~" not in terms
+
+
+def test_paraphrase_ranks_above_unrelated(index: SimilarityIndex) -> None:
+    matches = index.search("Migrating services onto Kubernetes", k=3, language="en")
+    assert [match.debate_id for match in matches][:2] == ["k8s", "old"]
+    assert matches[0].score > 0.3
+    assert all(match.debate_id not in {"hiring", "ru"} for match in matches)
+
+
+def test_equal_scores_prefer_the_recent_debate(index: SimilarityIndex) -> None:
+    first, second = index.search("Should we migrate our services to Kubernetes?", k=2)
+    assert first.score == second.score == 1.0
+    assert (first.debate_id, second.debate_id) == ("k8s", "old")
+
+
+def test_min_score_drops_weak_matches(index: SimilarityIndex) -> None:
+    loose = index.search("Kubernetes database", k=5)
+    strict = index.search("Kubernetes database", k=5, min_score=0.35)
+    assert {match.debate_id for match in loose} >= {"k8s", "pg"}
+    assert all(match.score >= 0.35 for match in strict)
+    assert len(strict) < len(loose)
+
+
+def test_language_filter(index: SimilarityIndex) -> None:
+    matches = index.search("сервисы Kubernetes", language="ru")
+    assert [match.debate_id for match in matches] == ["ru"]
+    assert (matches[0].language, matches[0].verdict) == ("ru", "go")
+    assert "ru" not in {match.debate_id for match in index.search("Kubernetes", language="en")}
+
+
+def test_exclude_and_max_age(index: SimilarityIndex) -> None:
+    query = "Should we migrate our services to Kubernetes?"
+    assert "k8s" not in {match.debate_id for match in index.search(query, exclude="k8s")}
+    assert "old" not in {match.debate_id for match in index.search(query, max_age_days=30)}
+
+
+def test_empty_index_and_query() -> None:
+    empty = SimilarityIndex()
+    assert empty.search("anything") == []
+    empty.add("blank", "  ")
+    assert len(empty) == 0
+    empty.add("a", "Adopt X?")
+    assert empty.search("?!") == []
+    assert empty.search("Something else entirely") == []
+
+
+def test_bulk_load_matches_incremental_adds(index: SimilarityIndex) -> None:
+    bulk = SimilarityIndex()
+    bulk.add_many(
+        [
+            {
+                "id": f"d{i}",
+                "decision": decision,
+                "context": "",
+                "language": "en",
+                "verdict": None,
+                "created_at": None,
+            }
+            for i, decision in enumerate(["Adopt Rust", "Adopt Go", "Hire a designer"])
+        ]
+    )
+    incremental = SimilarityIndex()
+    for i, decision in enumerate(["Adopt Rust", "Adopt Go", "Hire a designer"]):
+        incremental.add(f"d{i}", decision)
+    incremental._renormalise()
+    query = "Should we adopt Rust?"
+    assert [(m.debate_id, m.score) for m in bulk.search(query)] == [
+        (m.debate_id, m.score) for m in incremental.search(query)
+    ]
+    assert bulk.snapshot()["indexed"] == 3
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from agent_debate.store import DebateStore, StoreWriter
+
+
+def test_writer_batches_writes_and_flush_waits_for_them() -> None:
+    store = DebateStore(":memory:")
+    writer = StoreWriter(store)
+    indexed: list[str] = []
+
+    async def scenario() -> None:
+        writer.submit("create", "d1", {"decision": "x"})
+        for seq in range(1, 6):
+            writer.submit("append_event", "d1", seq, "progress", "{}")
+        writer.submit("save_stage", "d1", "pro", {"arguments": []})
+        writer.submit("set_status", "d1", "done")
+        writer.call(indexed.append, "d1")
+        await writer.flush()
+
+    asyncio.run(scenario())
+    record = store.get("d1")
+    assert record is not None
+    assert record["status"] == "done"
+    assert record["stages"] == {"pro": {"arguments": []}}
+    assert record["last_seq"] == 5
+    assert indexed == ["d1"]
+    assert writer.writes == 8
+
+
+def test_bad_write_does_not_drop_its_batch() -> None:
+    store = DebateStore(":memory:")
+    writer = StoreWriter(store)
+
+    async def scenario() -> None:
+        writer.submit("create", "d1", {"decision": "x"})
+        writer.submit("save_stage", "d1", "nope", {})
+        writer.submit("append_event", "d1", 1, "done", "{}")
+        await writer.flush()
+
+    asyncio.run(scenario())
+    assert writer.failed == 1
+    assert [event["event"] for event in store.events("d1")] == ["done"]
+
+
+def test_api_reads_the_store_off_the_event_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("fastapi")
+    from agent_debate import api
+
+    store = DebateStore(":memory:")
+    store.create("d1", {"decision": "x"})
+    threads: list[threading.Thread] = []
+    read = store.get
+
+    def get(debate_id: str):
+        threads.append(threading.current_thread())
+        return read(debate_id)
+
+    monkeypatch.setattr(store, "get", get)
+    monkeypatch.setattr(api, "get_store", lambda: store)
+    record = asyncio.run(api.get_debate("d1"))
+    assert record["debate_id"] == "d1"
+    assert threads and threading.main_thread() not in threads
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from agent_debate.fake import FakeLLMBackend, FakeProfile
+from agent_debate.llm import GeminiLLM, _StreamingItemParser
+from agent_debate.schemas import Argument, DebatePosition
+
+PAYLOAD = {
+    "arguments": [
+        {"claim": 'Say "}" twice', "risk": "ends with a backslash \\", "n": [1, {"x": 2}]},
+        {"claim": "{not a brace}", "risk": "[not a bracket]"},
+        {"claim": "third"},
+    ]
+}
+
+
+def _feed(parser: _StreamingItemParser, text: str, size: int) -> list[list[dict]]:
+    return [parser.feed(text[i : i + size]) for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 10_000])
+def test_items_split_across_chunks(size: int) -> None:
+    text = json.dumps(PAYLOAD)
+    batches = _feed(_StreamingItemParser(), text, size)
+    assert [item for batch in batches for item in batch] == PAYLOAD["arguments"]
+
+
+def test_each_item_arrives_with_its_closing_brace() -> None:
+    text = json.dumps(PAYLOAD)
+    parser = _StreamingItemParser()
+    first_end = text.index("}]}") + 3  # closes the nested object, the list and item 1
+    assert parser.feed(text[: first_end - 1]) == []
+    assert parser.feed(text[first_end - 1 : first_end]) == [PAYLOAD["arguments"][0]]
+
+
+def test_escaped_quotes_and_braces_inside_strings() -> None:
+    text = r'{"arguments": [{"claim": "a \"}\" b", "evidence": "\\"}, {"claim": "}{][\\\""}]}'
+    items = _StreamingItemParser().feed(text)
+    assert items == json.loads(text)["arguments"]
+
+
+def test_truncated_tail_keeps_finished_items() -> None:
+    text = json.dumps(PAYLOAD)
+    cut = text.index('{"claim": "third"') + 8
+    parser = _StreamingItemParser()
+    assert parser.feed(text[:cut]) == PAYLOAD["arguments"][:2]
+    # The rest of a continued answer completes the open item.
+    assert parser.feed(text[cut:]) == PAYLOAD["arguments"][2:]
+    assert parser.text == text
+
+
+def test_only_direct_array_elements_are_items() -> None:
+    text = '{"meta": {"a": 1}, "arguments": [{"claim": "x", "nested": [{"y": 1}]}]}'
+    assert _StreamingItemParser().feed(text) == [{"claim": "x", "nested": [{"y": 1}]}]
+
+
+def _stream(profile: FakeProfile, model: str, max_output_tokens: int = 1400):
+    seen: list[Argument] = []
+    client = GeminiLLM(model=model, backend=FakeLLMBackend(profile), stage="pro")
+    result = asyncio.run(
+        client.agenerate_streaming(
+            "system",
+            "user\nGive exactly 4 arguments.",
+            DebatePosition,
+            Argument,
+            seen.append,
+            max_output_tokens=max_output_tokens,
+        )
+    )
+    return result, seen, client.last_call
+
+
+def test_streamed_items_match_the_final_result() -> None:
+    result, seen, call = _stream(FakeProfile(latency_ms=0, stream_chunk_chars=5), "stream-ok")
+    assert len(result.arguments) == 4
+    assert seen == result.arguments
+    assert call.streamed and call.attempts == 1
+
+
+def test_truncated_stream_is_continued() -> None:
+    profile = FakeProfile(latency_ms=0, stream_chunk_chars=11)
+    result, seen, call = _stream(profile, "stream-truncated", max_output_tokens=150)
+    assert call.truncations >= 1
+    assert seen == result.arguments